@@ -0,0 +1,49 @@
+# Benchmark of the DataSet creation with 500 grids sharing the same eqn parametrisation: the time to compile the
+# expression for every grid versus the DataSet loading with the process-wide compile cache.
+
+import time
+import numpy as np
+from innate import DataSet
+from innate.regression.methods import compile_expression, normalize_expression
+
+n_grids = 500
+rng = np.random.default_rng(0)
+
+cfg = {'parameter': 'emissivity', 'approximation': ('eqn',), 'axes': ('temp', 'den'),
+       'temp_range': (9000, 20000, 51), 'den_range': (1, 600, 21),
+       'eqn': 'a + b / (temp/10000.0) + c * np.log10(den/10000)'}
+labels = [f'line_{i}' for i in range(n_grids)]
+array_dict = {label: np.zeros((51, 21)) for label in labels}
+common_cfg = {label: cfg for label in labels}
+local_cfg = {label: {'eqn_coeffs': rng.uniform(-1, 1, 3)} for label in labels}
+
+
+def clear_cache():
+    compile_expression.cache_clear()
+    normalize_expression.cache_clear()
+
+
+def load_time(cls, repeats=3):
+    times = []
+    for i in range(repeats):
+        clear_cache()
+        start = time.perf_counter()
+        cls(array_dict, common_cfg, local_cfg, tensor_library='numpy')
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# Time to compile the expression per grid
+start = time.perf_counter()
+for label in labels:
+    clear_cache()
+    compile_expression(normalize_expression(cfg['eqn']), ('temp', 'den'), ('a', 'b', 'c'))
+compile_time = time.perf_counter() - start
+
+time_cached = load_time(DataSet)
+print(f'{n_grids} grids with the same expression')
+print(f'Expression compilation per grid: {compile_time / n_grids * 1e6:8.1f} us')
+print(f'DataSet with cache:              {time_cached * 1e3:8.1f} ms ({compile_expression.cache_info().currsize} '
+      f'compiled expression)')
+print(f'Compilation time saved:          {compile_time * 1e3:8.1f} ms ({compile_time / (time_cached + compile_time):.0%} of '
+      f'the uncached loading)')
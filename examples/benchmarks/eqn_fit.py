@@ -0,0 +1,50 @@
+# Benchmark of the eqn coefficients fitting on emissivity-like grids: the linear fast path for expressions linear in
+# the coefficients and the Levenberg-Marquardt fit with the analytic Jacobian otherwise.
+
+import time
+import numpy as np
+from innate import Grid
+
+temp_range, den_range = np.linspace(9000, 20000, 251), np.linspace(1, 600, 101)
+temp_mesh, den_mesh = np.meshgrid(temp_range, den_range, indexing='ij')
+cfg = {'parameter': 'emissivity', 'approximation': ('rgi',), 'axes': ('temp', 'den'),
+       'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101)}
+
+expressions = {'linear': 'a + b / (temp/10000.0) + c * np.log10(den/10000)',
+               'power law': 'a * (temp/10000.0)**b * np.exp(c * den/1000)'}
+
+n_lines = 100
+rng = np.random.default_rng(1)
+
+for label, expression in expressions.items():
+
+    # Random line parametrisations plus noise
+    grids = []
+    for i in range(n_lines):
+        a, b, c = rng.uniform(0.5, 2.0), rng.uniform(-1.0, -0.2), rng.uniform(-0.1, 0.1)
+        if label == 'linear':
+            data = a + b / (temp_mesh / 10000.0) + c * np.log10(den_mesh / 10000)
+        else:
+            data = a * (temp_mesh / 10000.0) ** b * np.exp(c * den_mesh / 1000)
+        data *= 1 + rng.normal(0, 1e-4, data.shape)
+        grids.append(Grid(f'line_{i}', data, cfg, tensor_library='numpy'))
+
+    start = time.perf_counter()
+    fit_list = [grid.approx.reg.fit(expression) for grid in grids]
+    run_time = time.perf_counter() - start
+
+    print(f'{label} ({expression}): {n_lines} lines of {temp_mesh.size} points in {run_time:.2f} s, '
+          f'mean iterations {np.mean([info["n_iter"] for info in fit_list]):.1f}, '
+          f'max relative rms {max(info["rms"] / np.abs(grid.data).mean() for info, grid in zip(fit_list, grids)):.1e}')
+
+# Batch fitting of the dataset grids in a process pool
+from innate import DataSet
+
+array_dict = {grid.label: grid.data for grid in grids}
+dataset = DataSet(array_dict, {label: cfg for label in array_dict}, {label: {} for label in array_dict},
+                  tensor_library='numpy')
+for n_jobs in (1, -1):
+    start = time.perf_counter()
+    fit_dict = dataset.fit('eqn', expressions['power law'], n_jobs=n_jobs)
+    print(f'DataSet.fit n_jobs={n_jobs}: {time.perf_counter() - start:.2f} s, '
+          f'fit time per grid {np.mean([info["time"] for info in fit_dict.values()]) * 1e3:.1f} ms')
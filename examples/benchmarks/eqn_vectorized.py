@@ -0,0 +1,46 @@
+# Benchmark of the eqn regression evaluation on a full emissivity grid: the previous element-wise np.frompyfunc
+# function, which evaluates the expression string per element, versus the compiled vectorized function.
+
+import time
+import numpy as np
+from innate.regression.methods import generate_specific_function
+
+
+def frompyfunc_function(expression, coefficients, variable_names):
+
+    # Previous implementation: one eval call per element with an object array output
+    def specific_function(*variable_values):
+        local_vars = coefficients.copy()
+        local_vars.update(dict(zip(variable_names, variable_values)))
+        local_vars['np'] = np
+        return eval(expression, {}, local_vars)
+
+    return np.frompyfunc(specific_function, len(variable_names), 1)
+
+
+def run_time(func, *args, repeats=3):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+expression = 'a + b / (temp/10000.0) + c * np.log10(den/10000)'
+coefficients = {'a': 1.2, 'b': 0.4, 'c': -0.03}
+variable_names = ['temp', 'den']
+
+temp_mesh, den_mesh = np.meshgrid(np.linspace(9000, 20000, 251), np.linspace(1, 600, 101), indexing='ij')
+
+eqn_frompyfunc = frompyfunc_function(expression, coefficients, variable_names)
+eqn_compiled = generate_specific_function(expression, coefficients, variable_names)
+
+np.testing.assert_allclose(eqn_compiled(temp_mesh, den_mesh), eqn_frompyfunc(temp_mesh, den_mesh).astype(float))
+
+time_frompyfunc = run_time(eqn_frompyfunc, temp_mesh, den_mesh)
+time_compiled = run_time(eqn_compiled, temp_mesh, den_mesh, repeats=100)
+print(f'{temp_mesh.size} grid points ({temp_mesh.shape[0]}x{temp_mesh.shape[1]})')
+print(f'np.frompyfunc: {time_frompyfunc * 1e3:10.3f} ms')
+print(f'Compiled:      {time_compiled * 1e3:10.3f} ms')
+print(f'Speed-up:      {time_frompyfunc / time_compiled:10.0f}x')
@@ -0,0 +1,49 @@
+# Accuracy, memory and run time report of the single precision (float32) grids and interpolations compared to the
+# double precision (float64) ones. The grids mimic the emissivity tables: smooth functions of the temperature and
+# density whose source accuracy is around 1e-4.
+
+import time
+import numpy as np
+from innate import DataSet
+
+
+def run_time(func, *args, repeats=3):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# Emissivity-like grids
+temp_range, den_range = (9000, 20000, 251), (1, 600, 101)
+temp, den = np.meshgrid(np.linspace(*temp_range), np.linspace(*den_range), indexing='ij')
+grid_dict, cfg_dict, local_dict = {}, {}, {}
+for i, (alpha, beta) in enumerate([(-0.8, 0.05), (-1.2, -0.10), (0.4, 0.02), (-2.1, 0.30)]):
+    label = f'line_{i}'
+    grid_dict[label] = 1e-25 * (temp / 1e4) ** alpha * (1 + beta * np.log10(den))
+    cfg_dict[label] = {'parameter': 'emissivity', 'axes': ('temp', 'den'), 'temp_range': temp_range,
+                       'den_range': den_range}
+    local_dict[label] = {'approximation': ('rgi', 'spline', 'simplex')}
+
+n_points = 1_000_000
+rng = np.random.default_rng(2)
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+
+# Double and single precision datasets
+datasets = {dtype: DataSet(grid_dict, cfg_dict, local_dict, tensor_library='numpy', dtype=dtype)
+            for dtype in ('float64', 'float32')}
+
+nbytes = {dtype: sum(grid.data.nbytes for grid in dataset.values()) for dtype, dataset in datasets.items()}
+print(f'Grids memory: float64 {nbytes["float64"] / 1e6:.2f} MB, float32 {nbytes["float32"] / 1e6:.2f} MB\n')
+print(f'{n_points} coordinates')
+print(f'{"technique":>10} {"max rel. error":>15} {"float64 time":>13} {"float32 time":>13}')
+
+for technique in ('rgi', 'spline', 'simplex'):
+    interp_64 = datasets['float64'].stack_approximation(technique)
+    interp_32 = datasets['float32'].stack_approximation(technique)
+    flux_64, flux_32 = interp_64.eval(coords), interp_32.eval(coords)
+    rel_error = np.max(np.abs(flux_32 / flux_64 - 1))
+    print(f'{technique:>10} {rel_error:15.2e} {run_time(interp_64.eval, coords):12.3f}s '
+          f'{run_time(interp_32.eval, coords):12.3f}s')
@@ -0,0 +1,47 @@
+# Benchmark of the nn regression inference: batched NumPy forward pass (and torch, if it is installed) for a
+# SirenNet with the tutorial architecture (4 layers of 512 neurons) versus the rgi interpolation of the grid.
+
+import time
+import numpy as np
+from innate import Grid
+from innate.regression.methods import SirenNetwork, torch_library
+
+
+def run_time(func, *args, repeats=3):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+rng = np.random.default_rng(0)
+dim_hidden, num_layers = 512, 4
+state = {}
+for i in range(num_layers):
+    state[f'layers.{i}.weight'] = rng.uniform(-0.1, 0.1, (dim_hidden, 2 if i == 0 else dim_hidden)).astype(np.float32)
+    state[f'layers.{i}.bias'] = rng.uniform(-0.1, 0.1, dim_hidden).astype(np.float32)
+state['last_layer.weight'] = rng.uniform(-0.1, 0.1, (1, dim_hidden)).astype(np.float32)
+state['last_layer.bias'] = np.zeros(1, dtype=np.float32)
+state.update(input_offset=np.array([14500.0, 300.0]), input_scale=np.array([5500.0, 300.0]))
+
+data = rng.uniform(size=(251, 101))
+cfg = {'parameter': 'emissivity', 'approximation': ('rgi', 'nn'), 'axes': ('temp', 'den'),
+       'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101), 'nn_coeffs': state}
+grid = Grid('line', data, cfg, tensor_library='numpy')
+
+n_points = 100_000
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+n_params = sum(array.size for key, array in state.items() if key.endswith(('weight', 'bias')))
+print(f'{n_points} points, network with {n_params} parameters ({n_params * 4 / 1e6:.1f} MB) versus a '
+      f'{data.nbytes / 1e6:.1f} MB grid')
+
+for library in ('numpy', 'torch'):
+    if library == 'torch' and torch_library() is None:
+        continue
+    for batch_size in (1024, 8192, 65536):
+        nn = SirenNetwork(state, library=library, batch_size=batch_size)
+        print(f'nn {library:5s} batch {batch_size:6d}: {run_time(nn.eval, coords) * 1e3:8.1f} ms')
+
+print(f'rgi:                     {run_time(grid.approx.interp.rgi.eval, coords) * 1e3:8.1f} ms')
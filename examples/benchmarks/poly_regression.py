@@ -0,0 +1,51 @@
+# Benchmark of the poly regression technique: evaluation time versus the eqn regression and the rgi interpolation,
+# and the batched fit of a dataset versus fitting the grids one by one.
+
+import time
+import numpy as np
+from innate import DataSet
+from innate.regression.methods import Polynomial
+
+
+def run_time(func, *args, repeats=5):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+temp_range, den_range = np.linspace(9000, 20000, 251), np.linspace(1, 600, 101)
+temp_mesh, den_mesh = np.meshgrid(temp_range, den_range, indexing='ij')
+
+n_grids = 200
+rng = np.random.default_rng(2)
+labels = [f'line_{i}' for i in range(n_grids)]
+array_dict = {label: rng.uniform(0.5, 2) + rng.uniform(-1, 1) / (temp_mesh / 1e4) + 0.03 * np.log10(den_mesh / 1e4)
+              for label in labels}
+cfg = {'parameter': 'emissivity', 'approximation': ('rgi', 'eqn', 'poly'), 'axes': ('temp', 'den'),
+       'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101), 'poly_degree': (4, 3),
+       'eqn': 'a + b / (temp/10000.0) + c * np.log10(den/10000)', 'eqn_coeffs': (1.0, 1.0, 1.0)}
+dataset = DataSet(array_dict, {label: cfg for label in labels}, {label: {} for label in labels},
+                  tensor_library='numpy')
+grid = dataset[labels[0]]
+
+# Evaluation
+n_points = 1_000_000
+temp, den = rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)
+coords = np.column_stack((temp, den))
+print(f'Evaluation of {n_points} points')
+print(f'poly (4, 3): {run_time(grid.approx.reg.poly, temp, den) * 1e3:8.1f} ms')
+print(f'eqn:         {run_time(grid.approx.reg.eqn, temp, den) * 1e3:8.1f} ms')
+print(f'rgi:         {run_time(grid.approx.interp.rgi.eval, coords) * 1e3:8.1f} ms')
+
+# Fitting
+polynomial = Polynomial([temp_range, den_range], (4, 3))
+time_loop = run_time(lambda: [polynomial.solve(dataset[label].data) for label in labels], repeats=3)
+time_batch = run_time(dataset.fit, 'poly', None, None, None, 1, 100, 1e-10, (4, 3), repeats=3)
+time_eqn = run_time(dataset.fit, 'eqn', repeats=1)
+print(f'\nFitting of {n_grids} grids')
+print(f'poly one by one:  {time_loop * 1e3:8.1f} ms')
+print(f'poly batched:     {time_batch * 1e3:8.1f} ms')
+print(f'eqn:              {time_eqn * 1e3:8.1f} ms')
@@ -0,0 +1,38 @@
+# Benchmark of the peak memory and run time of the NumPy rgi evaluation with and without a memory budget. The
+# coordinates are streamed in blocks into a preallocated output array.
+
+import time
+import tracemalloc
+import numpy as np
+from innate.interpolation.numpy import RegularGridInterpolator
+
+
+def peak_memory(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    run_time = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, run_time
+
+
+# Grid with the emissivity tables axes
+temp_range = np.linspace(9000, 20000, 251)
+den_range = np.linspace(1, 600, 101)
+values = np.random.default_rng(0).random((temp_range.size, den_range.size, 1))
+rgi = RegularGridInterpolator([temp_range, den_range], values)
+
+# Random coordinates within the grid
+n_points = 10_000_000
+rng = np.random.default_rng(1)
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+out = np.empty((n_points, 1))
+
+print(f'{n_points} coordinates ({coords.nbytes / 1e6:.0f} MB), output array {out.nbytes / 1e6:.0f} MB\n')
+peak, run_time = peak_memory(rgi.evaluate, coords)
+print(f'Single block: peak memory {peak / 1e6:8.1f} MB, time {run_time:.2f} s')
+
+for max_memory in (1e9, 1e8, 1e7):
+    peak, run_time = peak_memory(rgi.evaluate, coords, out=out, max_memory=max_memory)
+    print(f'Budget {max_memory / 1e6:6.0f} MB: peak memory {peak / 1e6:8.1f} MB, time {run_time:.2f} s')
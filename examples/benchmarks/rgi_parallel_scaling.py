@@ -0,0 +1,40 @@
+# Benchmark of the NumPy rgi evaluation scaling with the number of threads. The coordinates are split into blocks
+# which are evaluated in a thread pool sharing the (read-only) stacked grids.
+
+import os
+import time
+import numpy as np
+from innate.interpolation.numpy import RegularGridInterpolator
+
+
+def run_time(func, *args, repeats=3, **kwargs):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# Grid with the emissivity tables axes and 10 stacked lines
+temp_range = np.linspace(9000, 20000, 251)
+den_range = np.linspace(1, 600, 101)
+values = np.random.default_rng(0).random((temp_range.size, den_range.size, 10))
+rgi = RegularGridInterpolator([temp_range, den_range], values, max_memory=2e8)
+
+# Random coordinates within the grid
+n_points = 5_000_000
+rng = np.random.default_rng(1)
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+out = np.empty((n_points, values.shape[-1]))
+
+n_cpus = os.cpu_count()
+print(f'{n_points} coordinates, {values.shape[-1]} grids, {n_cpus} CPUs\n')
+
+time_serial = run_time(rgi.evaluate, coords, out=out, n_jobs=1)
+for n_jobs in (1, 2, 4, 8, 16, 32):
+    if n_jobs > n_cpus:
+        break
+    time_jobs = run_time(rgi.evaluate, coords, out=out, n_jobs=n_jobs)
+    print(f'n_jobs = {n_jobs:2d}: {time_jobs:6.2f} s, speed-up {time_serial / time_jobs:5.2f}, '
+          f'{n_points / time_jobs / 1e6:6.1f} Mpoints/s')
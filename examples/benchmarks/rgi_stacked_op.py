@@ -0,0 +1,50 @@
+# Benchmark of the compilation time and the value and gradient throughput for the joint interpolation of several
+# emission lines in a PyTensor model. The symbolic graph of one interpolation per line is compared to a single
+# RegularGridInterpOp node for the stacked grids (with its C implementation).
+
+import time
+import numpy as np
+import pytensor
+import pytensor.tensor as tt
+from pytensor.compile.mode import Mode
+from innate.interpolation.pytensor import RegularGridInterpolator
+
+# Emissivity-like grids
+temp_range, den_range = np.linspace(9000, 20000, 251), np.linspace(1, 600, 101)
+rng = np.random.default_rng(0)
+mode = Mode(linker='cvm', optimizer='fast_run')
+
+n_points = 1000
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+
+print(f'{"lines":>5} {"graph compile":>14} {"op compile":>11} {"graph eval":>11} {"op eval":>9}')
+for n_lines in (1, 10, 40):
+    values = rng.random((temp_range.size, den_range.size, n_lines))
+    c = tt.matrix('c')
+
+    # One interpolation graph per line
+    start = time.perf_counter()
+    lines_flux = [RegularGridInterpolator([temp_range, den_range], values[..., i:i + 1])(c) for i in range(n_lines)]
+    logp = sum(tt.sum(flux) for flux in lines_flux)
+    graph_function = pytensor.function([c], [logp, pytensor.grad(logp, c)], mode=mode)
+    graph_compile = time.perf_counter() - start
+
+    # Single node for the stacked grids
+    start = time.perf_counter()
+    stacked = RegularGridInterpolator([temp_range, den_range], values, op=True)
+    logp = tt.sum(stacked(c))
+    op_function = pytensor.function([c], [logp, pytensor.grad(logp, c)], mode=mode)
+    op_compile = time.perf_counter() - start
+
+    for output, expected in zip(op_function(coords), graph_function(coords)):
+        np.testing.assert_allclose(output, expected, rtol=1e-8, atol=1e-12)
+
+    eval_times = []
+    for function in (graph_function, op_function):
+        start = time.perf_counter()
+        for i in range(100):
+            function(coords)
+        eval_times.append((time.perf_counter() - start) / 100)
+
+    print(f'{n_lines:5d} {graph_compile:13.2f}s {op_compile:10.2f}s {eval_times[0] * 1e3:9.2f}ms '
+          f'{eval_times[1] * 1e3:7.2f}ms')
@@ -0,0 +1,40 @@
+# Benchmark of the rgi cell lookup for uniform axes (affine arithmetic) versus irregular axes (binary search) on a
+# 251x101 emissivity-like grid.
+
+import time
+import numpy as np
+from innate.interpolation import numpy as np_interp, pytensor as pt_interp
+
+
+def best_time(func, *args, repeats=5):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# Grid with the emissivity tables axes
+temp_range = np.linspace(9000, 20000, 251)
+den_range = np.linspace(1, 600, 101)
+values = np.random.default_rng(0).random((temp_range.size, den_range.size, 1))
+
+# Random coordinates within the grid
+n_points = 1_000_000
+rng = np.random.default_rng(1)
+coords = np.column_stack((rng.uniform(9000, 20000, n_points), rng.uniform(1, 600, n_points)))
+
+print(f'Grid shape {values.shape[:-1]}, {n_points} coordinates\n')
+for label, module in (('NumPy', np_interp), ('PyTensor', pt_interp)):
+
+    search = module.RegularGridInterpolator([temp_range, den_range], values, uniform=[False, False])
+    uniform = module.RegularGridInterpolator([temp_range, den_range], values)
+
+    # Confirm both approaches provide the same output (and compile the functions)
+    np.testing.assert_allclose(search.eval(coords), uniform.eval(coords), rtol=1e-10)
+
+    t_search, t_uniform = best_time(search.eval, coords), best_time(uniform.eval, coords)
+    print(f'{label:>8} searchsorted: {t_search * 1e3:8.2f} ms ({n_points / t_search:.3e} points/s)')
+    print(f'{label:>8}  uniform axes: {t_uniform * 1e3:8.2f} ms ({n_points / t_uniform:.3e} points/s)')
+    print(f'{label:>8}       speed-up: {t_search / t_uniform:.2f}x\n')
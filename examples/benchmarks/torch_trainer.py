@@ -0,0 +1,52 @@
+# Benchmark of the SIREN training throughput on CPU: the previous TensorDataset + DataLoader minibatching versus the
+# Trainer, which shuffles with a single randperm per epoch and slices the tensors directly.
+
+import time
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from innate.torch.siren import SirenNet
+from innate.torch.trainer import Trainer
+
+torch.manual_seed(0)
+n_points, num_epoch = 25351, 3
+coords = torch.rand(n_points, 2) * 2 - 1
+values = torch.sin(3 * coords[:, :1]) * torch.cos(2 * coords[:, 1:])
+
+
+def dataloader_epoch(model, optimizer, dataloader, lossfunc):
+
+    for inputs, targets in dataloader:
+        optimizer.zero_grad()
+        loss = lossfunc(model(inputs), targets)
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(model.parameters(), 1.0)
+        optimizer.step()
+        loss.item()
+
+
+def samples_per_second(train_epoch):
+
+    # One warm-up epoch and the wall time of the following epochs
+    train_epoch()
+    start = time.perf_counter()
+    for epoch in range(num_epoch):
+        train_epoch()
+
+    return num_epoch * n_points / (time.perf_counter() - start)
+
+
+for dim_hidden, batch_size in ((32, 64), (32, 1024), (256, 1024)):
+
+    model = SirenNet(dim_in=2, dim_hidden=dim_hidden, dim_out=1, num_layers=3)
+    optimizer = torch.optim.AdamW(model.parameters(), lr=1e-4, weight_decay=1e-5)
+    dataloader = DataLoader(TensorDataset(coords, values), batch_size=batch_size, shuffle=True)
+    lossfunc = torch.nn.MSELoss(reduction='mean')
+    rate_loader = samples_per_second(lambda: dataloader_epoch(model, optimizer, dataloader, lossfunc))
+
+    model = SirenNet(dim_in=2, dim_hidden=dim_hidden, dim_out=1, num_layers=3)
+    trainer = Trainer(model, batch_size=batch_size, verbose=False)
+    rate_trainer = samples_per_second(lambda: trainer.train_epoch(coords, values))
+
+    print(f'hidden {dim_hidden:4d} batch {batch_size:5d}: DataLoader {rate_loader:10.0f} samples/s, '
+          f'Trainer {rate_trainer:10.0f} samples/s ({rate_trainer / rate_loader:.1f}x)')
@@ -34,9 +34,9 @@ for i, line_name in enumerate(lines_db.index):
     emiss_dict[line_name] = grid_i/norm_emiss
 
 # Data attributes
-data_conf = {'parameter': 'emissivity', 'approximation': ('rgi', 'eqn'), 'axes': ('temp', 'den'),
-             'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101)}
-trans_conf = {'H1_6563A': {'eqn': 'y~2.3x + 4.3x**2 + 6.3x**3'}}
+data_conf = {'parameter': 'emissivity', 'approximation': ('rgi', 'eqn', 'poly'), 'axes': ('temp', 'den'),
+             'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101), 'poly_degree': (3, 2)}
+trans_conf = {'H1_6563A': {'eqn': 'y~2.3x + 4.3x**2 + 6.3x**3', 'poly_degree': (4, 3)}}
 
 # Save the data into a dictionary
 output_file = f'../data/emissivity_grids.nc'
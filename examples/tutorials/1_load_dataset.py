@@ -6,7 +6,7 @@ data_file = '../data/emissivity_grids.nc'
 emissivities = innate.DataSet.from_file(data_file)
 
 temp, den = 12250, 122
-print('Interpolation', emissivities['O3_5007A'].approx.interp.rgi((temp, den)).eval())
+print('Interpolation', emissivities['O3_5007A'].approx.interp.rgi.eval((temp, den)))
 
 # Compare with the original data
 O3, H1 = pn.Atom('O', 3), pn.RecAtom('H', 1)
@@ -9,14 +9,14 @@ _logger = logging.getLogger('Innate')
 
 class Approximator:
 
-    def __init__(self, grid, technique_list, data_cfg=None):
+    def __init__(self, grid, technique_list, data_cfg=None, tensor_library='pytensor'):
 
         if technique_list is None:
             _logger.critical(f'The data set "{grid.label}" does not include the approximation to include the "approximation"'
                              f'key in the configurations variable or file')
 
         # Methodology approaches
-        self.interp = Interpolator(grid, technique_list, data_cfg=data_cfg)
+        self.interp = Interpolator(grid, technique_list, tensor_library=tensor_library, data_cfg=data_cfg)
         self.reg = Regressor(grid, technique_list, data_cfg=data_cfg)
 
         return
\ No newline at end of file
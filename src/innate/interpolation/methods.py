@@ -1,18 +1,178 @@
 import logging
+import numpy as np
 
-from .pytensor import interpolation_coordinates
 from .. import _setup_cfg
+from ..io import InnateError
+from .numpy import LocalRBFInterpolator
+from .spatial import NearestInterpolator, IDWInterpolator, SCATTERED_INTERPOLATORS
 
 _logger = logging.getLogger('Innate')
 
 
+def interpolation_library(tensor_library):
+
+    # The modules are imported on request to avoid the PyTensor import if it is not used
+    match tensor_library:
+
+        case 'pytensor':
+            from . import pytensor as library
+
+        case 'numpy':
+            from . import numpy as library
+
+        case _:
+            raise InnateError(f'The tensor library "{tensor_library}" is not recognized, please use "pytensor" '
+                              f'or "numpy"')
+
+    return library
+
+
+def interpolation_coordinates(data_grid, axes_range_list, z_range=None, interp_type='point', technique='rgi',
+                              tensor_library='pytensor', **kwargs):
+
+    """
+    Build an interpolator for a data grid with an arbitrary number of axes.
+
+    The interpolators evaluate ``(m1, ..., mn, ..., nout)`` arrays. The trailing output dimensions are added as views
+    of the input data, hence the grid is not copied.
+
+    Parameters
+    ----------
+    data_grid : numpy.ndarray
+        The grid data. For the ``'point'`` type it has the shape ``(m1, ..., mn)``, for the ``'axis'`` type the values
+        beyond the ``n`` axes are flattened into a single output dimension and for the ``'cube'`` type the array is
+        used as it is.
+    axes_range_list : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    interp_type : str, optional
+        The interpolation type: 'point', 'axis' or 'cube'. Default is 'point'.
+    technique : str, optional
+        The interpolation technique. Default is 'rgi'.
+    tensor_library : str, optional
+        The tensor library, whose ``INTERPOLATORS`` table provides the interpolator class: 'pytensor' or 'numpy'.
+        Default is 'pytensor'.
+
+    Returns
+    -------
+    interpolator : object
+        The interpolator for the requested technique.
+
+    """
+
+    # Interpolation technique
+    interpolators = interpolation_library(tensor_library).INTERPOLATORS
+    if technique not in interpolators:
+        raise InnateError(f'The interpolation technique ({technique}) is not recognized, please use: '
+                          f'{", ".join(interpolators.keys())}')
+    interp_class = interpolators[technique]
+
+    data_grid = np.asarray(data_grid)
+    axes_shape = tuple(np.size(axis) for axis in axes_range_list)
+    if data_grid.shape[:len(axes_shape)] != axes_shape:
+        raise InnateError(f'The data grid shape {data_grid.shape} does not match the axes shape {axes_shape}')
+
+    # Point interpolation with a single output
+    if interp_type == 'point':
+        if data_grid.ndim != len(axes_shape):
+            raise InnateError(f'The data grid shape {data_grid.shape} must have {len(axes_shape)} dimensions for '
+                              f'the "point" interpolation')
+        interp_i = interp_class(axes_range_list, data_grid[..., None], nout=1, **kwargs)
+
+    # Line interpolation
+    elif interp_type == 'axis':
+        interp_i = interp_class(axes_range_list, data_grid.reshape(axes_shape + (-1,)), **kwargs)
+
+    # Multiple outputs
+    elif interp_type == 'cube':
+        interp_i = interp_class(axes_range_list, data_grid, **kwargs)
+
+    else:
+        raise InnateError(f'The interpolation type ({interp_type}) is not recognized,'
+                          f' please use "point", "axis" or "cube"')
+
+    return interp_i
+
+
+def stack_interpolator(grid_list, technique='rgi', tensor_library='pytensor', **kwargs):
+
+    """
+    Build a single interpolator for a set of grids which share the same axes.
+
+    The grids data arrays are packed along a trailing dimension into a ``(m1, ..., mn, n_grids)`` array. Consequently,
+    the cells location and weights are computed once per coordinate for all the grids.
+
+    Parameters
+    ----------
+    grid_list : list of innate.Grid
+        The grids to stack. The interpolation output columns follow this order.
+    technique : str, optional
+        The interpolation technique. Default is 'rgi'.
+    tensor_library : str, optional
+        The tensor library for the interpolation: 'pytensor' or 'numpy'. Default is 'pytensor'.
+    **kwargs
+        Additional arguments for the interpolator, for example, ``n_jobs`` for the NumPy interpolators.
+
+    Returns
+    -------
+    interpolator : object
+        The interpolator returning ``(n_points, n_grids)`` arrays for ``(n_points, ndim)`` coordinates. The 'near'
+        technique for grids with missing (non-finite) nodes and the 'idw' technique use the NumPy KD-tree
+        interpolators of the finite nodes (see ``innate.interpolation.spatial``).
+
+    Raises
+    ------
+    InnateError
+        If the technique is not recognized or the grids do not share the same axes.
+
+    """
+
+    if len(grid_list) == 0:
+        raise InnateError(f'The input grid list for the stacked interpolation is empty')
+
+    # Confirm all the grids share the same axes
+    grid_0 = grid_list[0]
+    for grid in grid_list[1:]:
+        same_axes = list(grid.axes) == list(grid_0.axes)
+        if same_axes:
+            same_axes = all(np.array_equal(grid.axes_range[dim], grid_0.axes_range[dim]) for dim in grid_0.axes)
+        if not same_axes:
+            raise InnateError(f'The grid "{grid.label}" axes are different from the grid "{grid_0.label}" axes, '
+                              f'only grids with the same axes can be stacked')
+
+    # Pack the grids along the trailing output dimension
+    values = np.stack([grid.data for grid in grid_list], axis=-1)
+    axes_range_list = list(grid_0.axes_range.values())
+
+    library = interpolation_library(tensor_library)
+    if (technique not in library.INTERPOLATORS) and (technique not in SCATTERED_INTERPOLATORS):
+        raise InnateError(f'The interpolation technique "{technique}" cannot be stacked, please use: '
+                          f'{", ".join(library.INTERPOLATORS.keys() | SCATTERED_INTERPOLATORS.keys())}')
+
+    kwargs.setdefault('dtype', grid_0.dtype)
+
+    # Scattered nodes interpolation (NumPy) excluding the nodes with missing values in any of the grids
+    if technique in SCATTERED_INTERPOLATORS:
+        if (technique not in library.INTERPOLATORS) or not np.all(np.isfinite(values)):
+            return SCATTERED_INTERPOLATORS[technique].from_grid(axes_range_list, values, finite=True, **kwargs)
+
+    return library.INTERPOLATORS[technique](axes_range_list, values, **kwargs)
+
+
 class Interpolator:
 
     def __init__(self, grid, technique_list, tensor_library='pytensor', data_cfg=None):
 
+        data_cfg = {} if data_cfg is None else data_cfg
+
         # Attributes
         self.rgi = None
+        self.near = None
+        self.idw = None
+        self.rdb = None
+        self.spline = None
+        self.simplex = None
         self.techniques = []
+        self.tensor_library = tensor_library
 
         # Confirm the data is available
         if grid.data is None:
@@ -24,6 +184,43 @@ class Interpolator:
         # Regular grid Interpolation
         if 'rgi' in algorithms:
             self.techniques.append('rgi')
-            self.rgi = interpolation_coordinates(grid.data, list(grid.axes_range.values()), interp_type='point')
+            self.rgi = interpolation_coordinates(grid.data, list(grid.axes_range.values()), interp_type='point',
+                                                 tensor_library=tensor_library, dtype=grid.dtype)
+
+        # Nearest-neighbour interpolation (KD-tree on the finite nodes for grids with missing values)
+        if 'near' in algorithms:
+            self.techniques.append('near')
+            if np.all(np.isfinite(grid.data)):
+                self.near = interpolation_coordinates(grid.data, list(grid.axes_range.values()), interp_type='point',
+                                                      technique='near', tensor_library=tensor_library,
+                                                      dtype=grid.dtype)
+            else:
+                self.near = NearestInterpolator.from_grid(list(grid.axes_range.values()), grid.data[..., None],
+                                                          finite=True, dtype=grid.dtype)
+
+        # Inverse distance weighting (NumPy evaluation independently of the tensor library)
+        if 'idw' in algorithms:
+            self.techniques.append('idw')
+            self.idw = IDWInterpolator.from_grid(list(grid.axes_range.values()), grid.data[..., None], finite=True,
+                                                 dtype=grid.dtype)
+
+        # Local radial basis function (NumPy evaluation independently of the tensor library)
+        if 'rdb' in algorithms:
+            self.techniques.append('rdb')
+            self.rdb = LocalRBFInterpolator(list(grid.axes_range.values()), grid.data[..., None], dtype=grid.dtype)
+
+        # Cubic spline interpolation (coefficients from the configuration if available)
+        if 'spline' in algorithms:
+            self.techniques.append('spline')
+            self.spline = interpolation_coordinates(grid.data, list(grid.axes_range.values()), interp_type='point',
+                                                    technique='spline', tensor_library=tensor_library,
+                                                    coeffs=data_cfg.get('spline_coeffs'), dtype=grid.dtype)
+
+        # Simplex interpolation
+        if 'simplex' in algorithms:
+            self.techniques.append('simplex')
+            self.simplex = interpolation_coordinates(grid.data, list(grid.axes_range.values()), interp_type='point',
+                                                     technique='simplex', tensor_library=tensor_library,
+                                                     dtype=grid.dtype)
 
         return
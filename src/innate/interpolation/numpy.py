@@ -0,0 +1,1102 @@
+import functools
+import itertools
+import logging
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from ..io import InnateError
+
+_logger = logging.getLogger('Innate')
+
+
+def uniform_axes(points, rtol=1e-9):
+
+    """
+    Check which grid axes have a constant spacing.
+
+    The steps are compared with the mean step within the ``rtol`` tolerance plus the rounding error of the axis
+    floating point type, hence the ``float32`` axes from ``np.linspace`` are uniform too.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    rtol : float, optional
+        Relative tolerance between the axis steps and the mean step. Default is 1e-9.
+
+    Returns
+    -------
+    uniform : list of bool
+        True for the axes with a uniform spacing (for example, the ``np.linspace`` axes of the ``{dim}_range``
+        configuration entries).
+
+    """
+
+    uniform = []
+    for grid in points:
+        grid = np.asarray(grid)
+        if (grid.ndim != 1) or (grid.size < 2):
+            uniform.append(False)
+        else:
+            step = (grid[-1] - grid[0]) / (grid.size - 1)
+            atol = 4 * np.finfo(float_dtype(grid.dtype)).eps * max(abs(grid[0]), abs(grid[-1]))
+            uniform.append(bool(step > 0) and np.allclose(np.diff(grid), step, rtol=rtol, atol=atol))
+
+    return uniform
+
+
+def float_dtype(dtype):
+
+    """
+    Floating point type for the interpolation of an array data type.
+
+    Floating point arrays keep their precision (for example, ``float32`` grids are interpolated in single
+    precision), while other types are interpolated in ``float64``.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype or str
+        The data type of the array.
+
+    Returns
+    -------
+    dtype : numpy.dtype
+        The interpolation floating point type.
+
+    """
+
+    dtype = np.dtype(dtype)
+
+    return dtype if np.issubdtype(dtype, np.floating) else np.dtype('float64')
+
+
+def grid_cells(points, coords, uniform=None):
+
+    """
+    Locate the grid cells of a set of coordinates.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    coords : array-like
+        The coordinates with shape ``(..., ndim)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. The cells on these axes are located by direct arithmetic instead of a binary
+        search. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    indices : list of numpy.ndarray
+        The lower edge index of the cells on each axis. Coordinates outside the grid are assigned to the edge cells.
+    norm_distances : list of numpy.ndarray
+        The fractional distance of the coordinates from the lower edge of the cells on each axis.
+    out_of_bounds : numpy.ndarray
+        Boolean array with the coordinates outside the grid.
+
+    """
+
+    uniform = [False] * len(points) if uniform is None else uniform
+
+    indices = []
+    norm_distances = []
+    out_of_bounds = np.zeros(coords.shape[:-1], dtype=bool)
+    for n, grid in enumerate(points):
+        x = coords[..., n]
+
+        # Constant step: cell from the affine transformation of the coordinates
+        if uniform[n]:
+            u = (x - grid[0]) * ((grid.shape[0] - 1) / (grid[-1] - grid[0]))
+            finite = np.isfinite(u)
+
+            # Non-finite coordinates in the first cell with a NaN distance (out of bounds like the binary search)
+            cell = np.clip(np.floor(np.where(finite, u, 0)), 0, grid.shape[0] - 2)
+            out_of_bounds |= ~((x >= grid[0]) & (x <= grid[-1]))
+            indices.append(cell.astype(np.intp))
+            norm_distances.append(np.where(finite, u - cell, np.nan))
+
+        # Irregular step: binary search
+        else:
+            i = np.searchsorted(grid, x) - 1
+            out_of_bounds |= (i < 0) | (i >= grid.shape[0] - 1)
+            i = np.clip(i, 0, grid.shape[0] - 2)
+            indices.append(i)
+            norm_distances.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+
+    return indices, norm_distances, out_of_bounds
+
+
+def regular_grid_interp(points, values, coords, *, fill_value=None, uniform=None):
+
+    """
+    Linear interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    This function reproduces the ``innate.interpolation.pytensor.regular_grid_interp`` algorithm vectorized over the
+    input coordinates. The data must be defined on a filled regular grid, but the spacing may be uneven in any of the
+    dimensions.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coords : array-like
+        The coordinates where the interpolation should be evaluated. This must have the shape ``(..., ndim)``.
+    fill_value : float, optional
+        Value for the coordinates outside the grid. If None, the values are extrapolated. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. The cells on these axes are located by direct arithmetic instead of a binary
+        search. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    points = [np.asarray(p) for p in points]
+    ndim = len(points)
+    values = np.asarray(values)
+    coords = np.asarray(coords, dtype=float_dtype(values.dtype))
+
+    # Find where the points should be inserted
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform)
+
+    # Shape to broadcast the weights against the trailing output dimensions
+    weight_shape = coords.shape[:-1] + (1,) * (values.ndim - ndim)
+
+    result = np.zeros(coords.shape[:-1] + values.shape[ndim:], dtype=coords.dtype)
+    for edges in itertools.product((0, 1), repeat=ndim):
+        weight = np.ones(coords.shape[:-1], dtype=coords.dtype)
+        for edge, yi in zip(edges, norm_distances):
+            weight *= yi if edge else 1 - yi
+        edge_indices = tuple(i + edge for edge, i in zip(edges, indices))
+        result += values[edge_indices] * weight.reshape(weight_shape)
+
+    if fill_value is not None:
+        result[out_of_bounds] = fill_value
+
+    return result
+
+
+def regular_grid_value_grad(points, values, coords, *, fill_value=None, uniform=None):
+
+    """
+    Linear interpolation on a regular grid and its partial derivatives with respect to the coordinates.
+
+    The values and the derivatives are computed from the same cells lookup and corner weights: the derivative with
+    respect to an axis replaces the corner weight factor of that axis by the (signed) inverse of the cell step.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coords : array-like
+        The coordinates where the interpolation should be evaluated. This must have the shape ``(..., ndim)``.
+    fill_value : float, optional
+        Value for the coordinates outside the grid, where the derivatives are null. If None, the values are
+        extrapolated. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points with shape ``(..., nout)``.
+    gradient : numpy.ndarray
+        Partial derivatives of the interpolation with shape ``(..., ndim, nout)``.
+
+    """
+
+    points = [np.asarray(p) for p in points]
+    ndim = len(points)
+    values = np.asarray(values)
+    coords = np.asarray(coords, dtype=float_dtype(values.dtype))
+
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform)
+    inv_steps = [1 / (grid[i + 1] - grid[i]) for grid, i in zip(points, indices)]
+
+    weight_shape = coords.shape[:-1] + (1,) * (values.ndim - ndim)
+    result = np.zeros(coords.shape[:-1] + values.shape[ndim:], dtype=coords.dtype)
+    gradient = [np.zeros_like(result) for n in range(ndim)]
+
+    for edges in itertools.product((0, 1), repeat=ndim):
+        factors = [yi if edge else 1 - yi for edge, yi in zip(edges, norm_distances)]
+        edge_indices = tuple(i + edge for edge, i in zip(edges, indices))
+        corner = values[edge_indices]
+
+        result += corner * np.prod(factors, axis=0).reshape(weight_shape)
+        for d in range(ndim):
+            partial = inv_steps[d] if edges[d] else -inv_steps[d]
+            for n in range(ndim):
+                if n != d:
+                    partial = partial * factors[n]
+            gradient[d] += corner * partial.reshape(weight_shape)
+
+    gradient = np.stack(gradient, axis=coords.ndim - 1)
+
+    if fill_value is not None:
+        result[out_of_bounds] = fill_value
+        gradient[out_of_bounds] = 0
+
+    return result, gradient
+
+
+def simplex_grid_interp(points, values, coords, *, fill_value=None, uniform=None):
+
+    """
+    Simplex (Kuhn triangulation) linear interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    Each grid cell is split into the ``ndim!`` simplices of the Kuhn triangulation. The simplex of a coordinate is
+    given by the descending order of its fractional distances within the cell, hence the interpolation only uses
+    ``ndim + 1`` vertices instead of the ``2**ndim`` cell corners of the multilinear interpolation.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coords : array-like
+        The coordinates where the interpolation should be evaluated. This must have the shape ``(..., ndim)``.
+    fill_value : float, optional
+        Value for the coordinates outside the grid. If None, the values are extrapolated. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    points = [np.asarray(p) for p in points]
+    ndim = len(points)
+    values = np.asarray(values)
+    coords = np.asarray(coords, dtype=float_dtype(values.dtype))
+
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform)
+
+    # Descending fractional distances and the rank of each axis in that order
+    y = np.stack(norm_distances, axis=-1)
+    order = np.argsort(-y, axis=-1, kind='stable')
+    rank = np.argsort(order, axis=-1, kind='stable')
+    y_sorted = np.take_along_axis(y, order, axis=-1)
+
+    # Barycentric weights of the simplex vertices
+    edges = np.ones(y.shape[:-1] + (1,), dtype=y.dtype)
+    bounds = np.concatenate((edges, y_sorted, 0 * edges), axis=-1)
+    weights = bounds[..., :-1] - bounds[..., 1:]
+
+    weight_shape = coords.shape[:-1] + (1,) * (values.ndim - ndim)
+    result = np.zeros(coords.shape[:-1] + values.shape[ndim:], dtype=coords.dtype)
+    for k in range(ndim + 1):
+        vertex = tuple(i + (rank[..., n] < k) for n, i in enumerate(indices))
+        result += values[vertex] * weights[..., k].reshape(weight_shape)
+
+    if fill_value is not None:
+        result[out_of_bounds] = fill_value
+
+    return result
+
+
+def nearest_grid_interp(points, values, coords, *, fill_value=None, uniform=None):
+
+    """
+    Nearest-neighbour interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    The nearest node on each axis is found by rounding the affine transformation of the coordinates on uniform axes
+    and by a binary search on irregular axes.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coords : array-like
+        The coordinates where the interpolation should be evaluated. This must have the shape ``(..., ndim)``.
+    fill_value : float, optional
+        Value for the coordinates outside the grid. If None, the closest edge node value is returned. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Value of the nearest grid node at the requested points.
+
+    """
+
+    uniform = [False] * len(points) if uniform is None else uniform
+    points = [np.asarray(p) for p in points]
+    values = np.asarray(values)
+    coords = np.asarray(coords, dtype=float_dtype(values.dtype))
+
+    indices = []
+    out_of_bounds = np.zeros(coords.shape[:-1], dtype=bool)
+    for n, grid in enumerate(points):
+        x = coords[..., n]
+
+        # Constant step: round the affine transformation of the coordinates
+        if uniform[n]:
+            u = (x - grid[0]) * ((grid.shape[0] - 1) / (grid[-1] - grid[0]))
+            i = np.floor(u + 0.5).astype(np.intp)
+            indices.append(np.clip(i, 0, grid.shape[0] - 1))
+
+        # Irregular step: binary search and closest of the two cell edges
+        else:
+            i = np.clip(np.searchsorted(grid, x), 1, grid.shape[0] - 1)
+            indices.append(np.where(x - grid[i - 1] < grid[i] - x, i - 1, i))
+
+        out_of_bounds |= (x < grid[0]) | (x > grid[-1])
+
+    result = values[tuple(indices)]
+
+    if fill_value is not None:
+        result = result.astype(np.result_type(result, fill_value))
+        result[out_of_bounds] = fill_value
+
+    return result
+
+
+def spline_slopes_operator(grid):
+
+    """
+    Compute the natural cubic spline first derivatives operator of an axis.
+
+    Parameters
+    ----------
+    grid : array-like
+        The ``(m,)`` axis nodes.
+
+    Returns
+    -------
+    operator : numpy.ndarray
+        The ``(m, m)`` matrix which multiplied by the nodes values returns the spline first derivatives at the nodes.
+
+    """
+
+    grid = np.asarray(grid, dtype=float)
+    m, h = grid.size, np.diff(grid)
+
+    # Second derivatives operator from the continuity conditions (natural spline: null at the edges)
+    A, B = np.zeros((m, m)), np.zeros((m, m))
+    A[0, 0] = A[-1, -1] = 1
+    idcs = np.arange(1, m - 1)
+    A[idcs, idcs - 1], A[idcs, idcs], A[idcs, idcs + 1] = h[:-1] / 6, (h[:-1] + h[1:]) / 3, h[1:] / 6
+    B[idcs, idcs - 1], B[idcs, idcs], B[idcs, idcs + 1] = 1 / h[:-1], -1 / h[:-1] - 1 / h[1:], 1 / h[1:]
+    M = np.linalg.solve(A, B)
+
+    # First derivatives from the lower edge of each cell and the upper edge of the last cell
+    operator = np.zeros((m, m))
+    idcs = np.arange(m - 1)
+    operator[idcs, idcs], operator[idcs, idcs + 1] = -1 / h, 1 / h
+    operator[:-1] -= h[:, None] * (2 * M[:-1] + M[1:]) / 6
+    operator[-1, -2], operator[-1, -1] = -1 / h[-1], 1 / h[-1]
+    operator[-1] += h[-1] * (M[-2] + 2 * M[-1]) / 6
+
+    return operator
+
+
+def spline_coefficients(points, values):
+
+    """
+    Compute the tensor-product cubic spline coefficients of a regular grid.
+
+    The coefficients are the values and the mixed partial derivatives of the natural cubic spline at the grid nodes.
+    For each subset of axes (in ``itertools.product((0, 1), repeat=ndim)`` order), the derivative is computed by
+    applying the spline first derivatives operator of these axes to the data.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+
+    Returns
+    -------
+    coeffs : numpy.ndarray
+        The ``(2**ndim, m1, ... mn, ..., nout)`` spline coefficients.
+
+    """
+
+    ndim = len(points)
+    values = np.asarray(values, dtype=float)
+
+    for n, grid in enumerate(points):
+        if np.size(grid) < 2:
+            raise InnateError(f'The spline interpolation requires at least 2 nodes per axis, axis {n} has '
+                              f'{np.size(grid)}')
+
+    operators = [spline_slopes_operator(grid) for grid in points]
+
+    coeffs = np.empty((2 ** ndim,) + values.shape)
+    for k, derivatives in enumerate(itertools.product((0, 1), repeat=ndim)):
+        coeffs_k = values
+        for n, derivative in enumerate(derivatives):
+            if derivative:
+                coeffs_k = np.moveaxis(np.tensordot(operators[n], coeffs_k, axes=(1, n)), 0, n)
+        coeffs[k] = coeffs_k
+
+    return coeffs
+
+
+def load_spline_coefficients(points, values, coeffs=None):
+
+    # Use the input coefficients if they match the grid
+    if coeffs is not None:
+        coeffs = np.asarray(coeffs)
+        expected_shape = (2 ** len(points),) + values.shape
+        if coeffs.shape == expected_shape:
+            return coeffs
+        _logger.warning(f'The input spline coefficients shape {coeffs.shape} is different from the expected '
+                        f'{expected_shape} shape. The coefficients will be recomputed')
+
+    return spline_coefficients(points, values)
+
+
+def spline_grid_interp(points, coeffs, coords, *, fill_value=None, uniform=None):
+
+    """
+    Tensor-product cubic spline interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    Each cell is evaluated as a cubic Hermite polynomial from the values and derivatives at its corners, as computed
+    by ``spline_coefficients``, hence each coordinate requires ``4**ndim`` products.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    coeffs : array-like
+        The ``(2**ndim, m1, ... mn, ..., nout)`` spline coefficients.
+    coords : array-like
+        The coordinates where the interpolation should be evaluated. This must have the shape ``(..., ndim)``.
+    fill_value : float, optional
+        Value for the coordinates outside the grid. If None, the values are extrapolated. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, all the axes are searched. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    points = [np.asarray(p) for p in points]
+    ndim = len(points)
+    coeffs = np.asarray(coeffs)
+    coords = np.asarray(coords, dtype=float_dtype(coeffs.dtype))
+
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform)
+
+    # Hermite basis per axis: (lower edge value, upper edge value, lower edge slope, upper edge slope)
+    basis = []
+    for grid, i, t in zip(points, indices, norm_distances):
+        h = grid[i + 1] - grid[i]
+        t2, t3 = t * t, t * t * t
+        basis.append(((2 * t3 - 3 * t2 + 1, -2 * t3 + 3 * t2), (h * (t3 - 2 * t2 + t), h * (t3 - t2))))
+
+    weight_shape = coords.shape[:-1] + (1,) * (coeffs.ndim - 1 - ndim)
+
+    result = np.zeros(coords.shape[:-1] + coeffs.shape[ndim + 1:], dtype=coords.dtype)
+    for k, derivatives in enumerate(itertools.product((0, 1), repeat=ndim)):
+        for edges in itertools.product((0, 1), repeat=ndim):
+            weight = np.ones(coords.shape[:-1], dtype=coords.dtype)
+            for n, (edge, derivative) in enumerate(zip(edges, derivatives)):
+                weight *= basis[n][derivative][edge]
+            edge_indices = tuple(i + edge for edge, i in zip(edges, indices))
+            result += coeffs[k][edge_indices] * weight.reshape(weight_shape)
+
+    if fill_value is not None:
+        result[out_of_bounds] = fill_value
+
+    return result
+
+
+def chunk_size_from_memory(max_memory, ndim, nout=1, itemsize=8):
+
+    """
+    Estimate the number of coordinates per block for a linear interpolation within a memory budget.
+
+    Each coordinate requires its cells indices and fractional distances per axis, the corner weights, the gathered
+    corner values and the output. The estimation is conservative by a factor two.
+
+    Parameters
+    ----------
+    max_memory : float
+        Memory budget for the temporary arrays in bytes.
+    ndim : int
+        Number of grid dimensions.
+    nout : int, optional
+        Number of output values per coordinate. Default is 1.
+    itemsize : int, optional
+        Bytes per array element. Default is 8.
+
+    Returns
+    -------
+    chunk_size : int
+        Number of coordinates per evaluation block.
+
+    """
+
+    bytes_per_point = 2 * itemsize * (4 * ndim + 3 * nout + 4)
+
+    return max(1, int(max_memory // bytes_per_point))
+
+
+def parallel_jobs(n_jobs):
+
+    """
+    Number of threads for the parallel evaluation.
+
+    Parameters
+    ----------
+    n_jobs : int or None
+        Number of threads. Negative values are counted from the number of CPUs, for example, -1 uses all of them
+        and -2 all but one. If None, the evaluation is sequential.
+
+    Returns
+    -------
+    n_jobs : int
+        The number of threads, greater or equal to one.
+
+    """
+
+    if n_jobs is None:
+        return 1
+
+    n_jobs = int(n_jobs)
+    if n_jobs == 0:
+        raise InnateError(f'The number of parallel jobs cannot be zero')
+
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+    return n_jobs
+
+
+def evaluate_in_chunks(function, coords, ndim, out_tail, dtype, chunk_size=None, out=None, n_jobs=1):
+
+    """
+    Evaluate an interpolation function by blocks of coordinates into a preallocated array.
+
+    The blocks can be evaluated in a pool of threads. The NumPy operations on the interpolation release the GIL,
+    while the grid arrays are shared (read-only) by all the threads and each block writes into its own section of
+    the output array.
+
+    Parameters
+    ----------
+    function : callable
+        Interpolation function for a ``(n_points, ndim)`` block of coordinates.
+    coords : array-like
+        The coordinates with shape ``(..., ndim)``.
+    ndim : int
+        Number of grid dimensions.
+    out_tail : tuple
+        The trailing output dimensions of each coordinate.
+    dtype : numpy.dtype
+        The output data type.
+    chunk_size : int, optional
+        Number of coordinates per block. If None, the coordinates are split evenly between the jobs. Default is None.
+    out : numpy.ndarray, optional
+        C-contiguous array with shape ``(...,) + out_tail`` to store the output. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation of the blocks (see ``parallel_jobs``). Default is 1.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        The interpolation output.
+
+    """
+
+    coords = np.asarray(coords)
+    coords_flat = coords.reshape((-1, ndim))
+    out_shape = coords.shape[:-1] + tuple(out_tail)
+
+    # Preallocate or check the output array
+    if out is None:
+        out = np.empty(out_shape, dtype=dtype)
+    elif out.shape != out_shape:
+        raise InnateError(f'The output array shape {out.shape} is different from the expected {out_shape} shape')
+    elif not out.flags.c_contiguous:
+        raise InnateError(f'The output array must be C-contiguous')
+
+    n_points = coords_flat.shape[0]
+    out_flat = out.reshape((n_points,) + tuple(out_tail))
+    n_jobs = min(parallel_jobs(n_jobs), max(n_points, 1))
+    chunk_size = max(-(-n_points // n_jobs), 1) if chunk_size is None else chunk_size
+
+    def evaluate_chunk(i):
+        out_flat[i:i + chunk_size] = function(coords_flat[i:i + chunk_size])
+
+    if n_jobs == 1:
+        for i in range(0, n_points, chunk_size):
+            evaluate_chunk(i)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(evaluate_chunk, range(0, n_points, chunk_size)))
+
+    return out
+
+
+class ArrayInterpolator:
+
+    """
+
+    Base class for the NumPy interpolators.
+
+    Calling the instance, ``evaluate`` and ``eval`` return the interpolation as a NumPy array. The latter method is
+    provided for compatibility with the PyTensor interpolators.
+
+    The grid interpolators define the interpolation of a ``(n_points, ndim)`` block of coordinates in the
+    ``_evaluate_block`` method, while ``_evaluate_blocks`` distributes the coordinates into blocks, for a bounded
+    memory use or a parallel evaluation with ``n_jobs`` threads.
+
+    """
+
+    n_jobs = 1
+
+    def __call__(self, t, **kwargs):
+        return self.evaluate(t, **kwargs)
+
+    def _evaluate_block(self, coords):
+        raise NotImplementedError
+
+    def _evaluate_blocks(self, t, out=None, chunk_size=None, n_jobs=None, dtype=None):
+
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if (out is None) and (chunk_size is None) and (parallel_jobs(n_jobs) == 1):
+            return self._evaluate_block(t)
+
+        t = np.asarray(t, dtype=self.dtype)
+        dtype = t.dtype if dtype is None else dtype
+
+        return evaluate_in_chunks(self._evaluate_block, t, self.ndim, self.values.shape[self.ndim:], dtype,
+                                  chunk_size, out, n_jobs)
+
+    def evaluate(self, t, **kwargs):
+        raise NotImplementedError
+
+    def eval(self, t, **kwargs):
+        """Interpolate the data. This method is provided for compatibility with the PyTensor interpolator."""
+        return self.evaluate(t, **kwargs)
+
+
+class RegularGridInterpolator(ArrayInterpolator):
+
+    """
+
+    Linear interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    This class has the same interface as ``innate.interpolation.pytensor.RegularGridInterpolator`` but it evaluates
+    the coordinates numerically, without the PyTensor graph construction and compilation.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    max_memory : float, optional
+        Memory budget in bytes for the evaluation temporary arrays. The coordinates are evaluated by blocks within
+        this budget. If None, the coordinates are evaluated at once. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation. Negative values are counted from the number of CPUs. Default is 1.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the grid and the interpolation, for example, 'float32'. If None, the ``values`` type
+        is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, uniform=None, max_memory=None, n_jobs=1, dtype=None,
+                 **kwargs):
+
+        self.ndim = len(points)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.max_memory = max_memory
+        self.n_jobs = n_jobs
+
+    def _evaluate_block(self, coords):
+        return regular_grid_interp(self.points, self.values, coords, fill_value=self.fill_value,
+                                   uniform=self.uniform)
+
+    def evaluate(self, t, out=None, max_memory=None, n_jobs=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+            max_memory: Memory budget in bytes for the temporary arrays,
+                which overwrites the interpolator ``max_memory``. The
+                budget is shared by the threads.
+            n_jobs: Number of threads, which overwrites the interpolator
+                ``n_jobs``.
+        """
+        max_memory = self.max_memory if max_memory is None else max_memory
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+
+        chunk_size = None
+        if max_memory is not None:
+            nout = int(np.prod(self.values.shape[self.ndim:]))
+            itemsize = self.dtype.itemsize
+            chunk_size = chunk_size_from_memory(max_memory / parallel_jobs(n_jobs), self.ndim, nout, itemsize)
+
+        return self._evaluate_blocks(t, out, chunk_size, n_jobs)
+
+    def value_and_grad(self, t):
+        """Interpolate the data and compute its partial derivatives with respect to the coordinates
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+        """
+        return regular_grid_value_grad(self.points, self.values, t, fill_value=self.fill_value, uniform=self.uniform)
+
+
+class NearestGridInterpolator(ArrayInterpolator):
+
+    """
+
+    Nearest-neighbour interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation. Negative values are counted from the number of CPUs. Default is 1.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the grid and the interpolation, for example, 'float32'. If None, the ``values`` type
+        is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Value of the nearest grid node at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, uniform=None, n_jobs=1, dtype=None, **kwargs):
+
+        self.ndim = len(points)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.n_jobs = n_jobs
+
+    def _evaluate_block(self, coords):
+        return nearest_grid_interp(self.points, self.values, coords, fill_value=self.fill_value, uniform=self.uniform)
+
+    def evaluate(self, t, out=None, n_jobs=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+            n_jobs: Number of threads, which overwrites the interpolator
+                ``n_jobs``.
+        """
+        return self._evaluate_blocks(t, out, n_jobs=n_jobs, dtype=self.values.dtype)
+
+
+class LocalRBFInterpolator(ArrayInterpolator):
+
+    """
+
+    Local radial basis function interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    Each grid node has a neighbourhood of ``window`` nodes per axis, which is interpolated with a polyharmonic cubic
+    kernel (:math:`\\phi(r) = r^3`) plus a linear polynomial. The distances are measured in the grid index space,
+    hence the neighbourhood system matrix is the same for every node and it is inverted once. The neighbourhoods
+    coefficients are solved lazily, on the first query, and they are stored in a least recently used cache.
+
+    The interpolation in a cell is the blend of the neighbourhoods of its ``2**ndim`` vertices with smoothstep weights,
+    which are a partition of unity. At a grid node the weight of its own neighbourhood is one, so the interpolation
+    and its first derivatives are continuous across the cells edges.
+
+    The evaluation cost scales with the number of queries and the neighbourhood size instead of the grid size.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    window : int, optional
+        Number of nodes per axis in the cells neighbourhood. Default is 4.
+    cache_size : int, optional
+        Maximum number of neighbourhoods coefficients in the cache. Default is 4096.
+    chunk_size : int, optional
+        Number of coordinates per evaluation block. Default is 100000.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation of the blocks. Negative values are counted from the number of CPUs.
+        Default is 1.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the grid and the interpolation, for example, 'float32'. If None, the ``values`` type
+        is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, window=4, cache_size=4096, chunk_size=100_000,
+                 uniform=None, n_jobs=1, dtype=None, **kwargs):
+
+        self.ndim = len(points)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+        # Neighbourhood nodes in index space relative to the window origin
+        self.window = np.array([min(window, grid.size) for grid in self.points])
+        self.centres = np.indices(self.window).reshape(self.ndim, -1).T.astype(self.dtype)
+
+        # Neighbourhood system: kernel matrix with a linear polynomial tail
+        n_nodes, n_poly = self.centres.shape[0], self.ndim + 1
+        system = np.zeros((n_nodes + n_poly, n_nodes + n_poly))
+        system[:n_nodes, :n_nodes] = self.kernel(self.centres[:, None, :] - self.centres[None, :, :])
+        system[:n_nodes, n_nodes:] = self.polynomial(self.centres)
+        system[n_nodes:, :n_nodes] = system[:n_nodes, n_nodes:].T
+        self._system_inv = np.linalg.inv(system).astype(self.dtype)
+
+        # Values flattened along the output dimensions
+        self._values_2d = self.values.reshape(self.values.shape[:self.ndim] + (-1,))
+
+        # Least recently used cache for the cells coefficients
+        self.cell_coefficients = functools.lru_cache(maxsize=cache_size)(self._solve_cell)
+
+    @staticmethod
+    def kernel(delta):
+        return np.linalg.norm(delta, axis=-1) ** 3
+
+    @staticmethod
+    def polynomial(coords):
+        return np.concatenate((np.ones(coords.shape[:-1] + (1,), dtype=coords.dtype), coords), axis=-1)
+
+    def _solve_cell(self, origin):
+
+        window_slice = tuple(slice(o, o + w) for o, w in zip(origin, self.window))
+        node_values = self._values_2d[window_slice].reshape(-1, self._values_2d.shape[-1])
+        rhs = np.concatenate((node_values, np.zeros((self.ndim + 1, node_values.shape[1]), dtype=self.dtype)))
+
+        return self._system_inv @ rhs
+
+    def _evaluate_window(self, origin, position):
+
+        # Solve (or recover) the coefficients of the distinct windows
+        cells, inverse = np.unique(origin, axis=0, return_inverse=True)
+        coefficients = np.stack([self.cell_coefficients(tuple(int(o) for o in cell)) for cell in cells])
+
+        # Evaluate the kernel and polynomial basis for each coordinate relative to its window
+        local = position - origin
+        basis = np.concatenate((self.kernel(local[:, None, :] - self.centres[None, :, :]),
+                                self.polynomial(local)), axis=1)
+
+        return np.einsum('nk,nko->no', basis, coefficients[inverse.ravel()])
+
+    def _evaluate_chunk(self, coords):
+
+        # Cell indices and index space coordinates
+        indices, norm_distances, out_of_bounds = grid_cells(self.points, coords, self.uniform)
+        position = np.column_stack([i + yi for i, yi in zip(indices, norm_distances)]).astype(self.dtype)
+
+        # Partition of unity: blend of the windows of the cell vertices with smoothstep weights
+        smooth = [np.clip(yi, 0, 1) ** 2 * (3 - 2 * np.clip(yi, 0, 1)) for yi in norm_distances]
+        result = 0
+        for vertex in itertools.product((0, 1), repeat=self.ndim):
+
+            weight = functools.reduce(np.multiply, [s if v else 1 - s for s, v in zip(smooth, vertex)])
+            origin = np.column_stack([np.clip(i + v - (w - 1) // 2, 0, grid.size - w)
+                                      for i, v, w, grid in zip(indices, vertex, self.window, self.points)])
+            result = result + weight[:, None] * self._evaluate_window(origin, position)
+
+        if self.fill_value is not None:
+            result[out_of_bounds] = self.fill_value
+
+        return result
+
+    def _evaluate_block(self, coords):
+        return self._evaluate_chunk(coords).reshape((coords.shape[0],) + self.values.shape[self.ndim:])
+
+    def evaluate(self, t, out=None, n_jobs=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+            n_jobs: Number of threads, which overwrites the interpolator
+                ``n_jobs``.
+        """
+        return self._evaluate_blocks(t, out, self.chunk_size, n_jobs)
+
+
+class SplineGridInterpolator(ArrayInterpolator):
+
+    """
+
+    Tensor-product cubic spline interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    The spline coefficients are computed once on the initialization (or provided by the user, for example, from
+    the dataset file) and they are available in the ``coeffs`` attribute.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coeffs : array-like, optional
+        The ``(2**ndim, m1, ... mn, ..., nout)`` precomputed spline coefficients. If None, these are computed from
+        the ``values``. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation. Negative values are counted from the number of CPUs. Default is 1.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the grid and the interpolation, for example, 'float32'. If None, the ``values`` type
+        is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, coeffs=None, uniform=None, n_jobs=1, dtype=None,
+                 **kwargs):
+
+        self.ndim = len(points)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.n_jobs = n_jobs
+        self.coeffs = load_spline_coefficients(self.points, self.values, coeffs).astype(self.dtype, copy=False)
+
+    def _evaluate_block(self, coords):
+        return spline_grid_interp(self.points, self.coeffs, coords, fill_value=self.fill_value, uniform=self.uniform)
+
+    def evaluate(self, t, out=None, n_jobs=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+            n_jobs: Number of threads, which overwrites the interpolator
+                ``n_jobs``.
+        """
+        return self._evaluate_blocks(t, out, n_jobs=n_jobs)
+
+
+class SimplexGridInterpolator(ArrayInterpolator):
+
+    """
+
+    Simplex (Kuhn triangulation) linear interpolation on a regular grid in arbitrary dimensions using NumPy.
+
+    The evaluation cost grows linearly with the number of dimensions (``ndim + 1`` vertices per coordinate).
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    n_jobs : int, optional
+        Number of threads for the evaluation. Negative values are counted from the number of CPUs. Default is 1.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the grid and the interpolation, for example, 'float32'. If None, the ``values`` type
+        is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, uniform=None, n_jobs=1, dtype=None, **kwargs):
+
+        self.ndim = len(points)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.n_jobs = n_jobs
+
+    def _evaluate_block(self, coords):
+        return simplex_grid_interp(self.points, self.values, coords, fill_value=self.fill_value, uniform=self.uniform)
+
+    def evaluate(self, t, out=None, n_jobs=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+            n_jobs: Number of threads, which overwrites the interpolator
+                ``n_jobs``.
+        """
+        return self._evaluate_blocks(t, out, n_jobs=n_jobs)
+
+
+INTERPOLATORS = {'rgi': RegularGridInterpolator,
+                 'near': NearestGridInterpolator,
+                 'rdb': LocalRBFInterpolator,
+                 'spline': SplineGridInterpolator,
+                 'simplex': SimplexGridInterpolator}
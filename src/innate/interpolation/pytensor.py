@@ -1,14 +1,22 @@
 import itertools
 import logging
+import numpy as np
 from ..io import InnateError
+from .numpy import uniform_axes, float_dtype, load_spline_coefficients, regular_grid_value_grad
 
 _logger = logging.getLogger('Innate')
 
 
 try:
+    import pytensor
     import pytensor.tensor as tt
+    from pytensor.graph.basic import Apply
+    from pytensor.compile.mode import Mode
+    from pytensor.link.c.op import COp
+    from pytensor.gradient import DisconnectedType, grad_not_implemented
     pytensor_check = True
 except ImportError:
+    COp = object
     pytensor_check = False
 
 
@@ -21,23 +29,13 @@ def as_tensor_variable(x, dtype="float64", **kwargs):
 
 def interpolation_selection(grid_dict, x_range, y_range, z_range=None, interp_type='point'):
 
+    # Axes of the grids, the third one is optional for the point and line interpolations
+    axes_range_list = [x_range, y_range] if z_range is None else [x_range, y_range, z_range]
+
     # Container for interpolators
     interp_dict = {}
-
     for line, data_grid in grid_dict.items():
-
-        # 2D Point interpolation
-        if interp_type == 'point':
-            interp_i = RegularGridInterpolator([x_range, y_range], data_grid[:, :, None], nout=1)
-
-        # Line interpolation
-        elif interp_type == 'axis':
-            data_grid_reshape = data_grid.reshape((x_range.size, y_range.size, -1))
-            interp_i = RegularGridInterpolator([x_range, y_range], data_grid_reshape)
-
-        # 3D point
-        elif interp_type == 'cube':
-            interp_i = RegularGridInterpolator([x_range, y_range, z_range], data_grid)
+        interp_i = interpolation_coordinates(data_grid, axes_range_list, interp_type=interp_type)
 
         # Evaluate and store it
         interp_dict[line] = interp_i.evaluate
@@ -45,29 +43,94 @@ def interpolation_selection(grid_dict, x_range, y_range, z_range=None, interp_ty
     return interp_dict
 
 
-def interpolation_coordinates(data_grid, axes_range_list, z_range=None, interp_type='point'):
+def interpolation_coordinates(data_grid, axes_range_list, z_range=None, interp_type='point', technique='rgi',
+                              **kwargs):
+
+    """PyTensor interpolator for a data grid (see ``innate.interpolation.methods.interpolation_coordinates``)."""
+
+    from .methods import interpolation_coordinates as grid_interpolator
+
+    return grid_interpolator(data_grid, axes_range_list, z_range, interp_type, technique, tensor_library='pytensor',
+                             **kwargs)
+
+
+def uniform_limits(points, uniform, dtype='float64'):
+
+    # Lower edge, upper edge, inverse step and size of the uniform axes. The limits are cast to the interpolation
+    # type to avoid the upcast of the single precision graphs by Python float constants
+    limits = []
+    for n, p in enumerate(points):
+        if uniform[n]:
+            x_0, x_f, m = float(p[0]), float(p[-1]), len(p)
+            scale = (m - 1) / (x_f - x_0)
+            limits.append(tuple(np.asarray(v, dtype=dtype) for v in (x_0, x_f, scale)) + (m,))
+        else:
+            limits.append(None)
+
+    return limits
+
+
+def grid_cells(points, coords, uniform=None, dtype='float64'):
+
+    """
+    Locate the grid cells of a set of coordinates.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    coords : array-like
+        The coordinates tensor with shape ``(..., ndim)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. The cells on these axes are located by direct arithmetic instead of a binary
+        search, this requires numerical ``points``. If None, all the axes are searched. Default is None.
+    dtype : str, optional
+        Floating point type of the interpolation. Default is 'float64'.
+
+    Returns
+    -------
+    indices : list of array-like
+        The lower edge index of the cells on each axis. Coordinates outside the grid are assigned to the edge cells.
+    norm_distances : list of array-like
+        The fractional distance of the coordinates from the lower edge of the cells on each axis.
+    out_of_bounds : array-like
+        Boolean tensor with the coordinates outside the grid.
+
+    """
 
-    # 2D Point interpolation
-    if interp_type == 'point':
-        interp_i = RegularGridInterpolator(axes_range_list, data_grid[:, :, None], nout=1)
+    uniform = [False] * len(points) if uniform is None else uniform
+    limits = uniform_limits(points, uniform, dtype)
 
-    # Line interpolation
-    elif interp_type == 'axis':
-        data_grid_reshape = data_grid.reshape((axes_range_list[0].size, axes_range_list[1].size, -1))
-        interp_i = RegularGridInterpolator(axes_range_list, data_grid_reshape)
+    points = [as_tensor_variable(p, dtype) for p in points]
+    coords = as_tensor_variable(coords, dtype)
 
-    # 3D point
-    elif interp_type == 'cube':
-        interp_i = RegularGridInterpolator(axes_range_list, data_grid)
+    indices = []
+    norm_distances = []
+    out_of_bounds = tt.zeros(coords.shape[:-1], dtype=bool)
+    for n, grid in enumerate(points):
+        x = coords[..., n]
 
-    else:
-        raise InnateError(f'The interpolation type ({interp_type}) is not recognized,'
-                          f' please use "point", "axis" or "cube"')
+        # Constant step: cell from the affine transformation of the coordinates
+        if uniform[n]:
+            x_0, x_f, scale, m = limits[n]
+            u = (x - x_0) * scale
+            cell = tt.clip(tt.floor(u), 0, m - 2)
+            out_of_bounds |= ~((x >= x_0) & (x <= x_f))
+            indices.append(tt.cast(cell, 'int64'))
+            norm_distances.append(u - cell)
 
-    return interp_i.evaluate
+        # Irregular step: binary search
+        else:
+            i = tt.extra_ops.searchsorted(grid, x) - 1
+            out_of_bounds |= (i < 0) | (i >= grid.shape[0] - 1)
+            i = tt.clip(i, 0, grid.shape[0] - 2)
+            indices.append(i)
+            norm_distances.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+
+    return indices, norm_distances, out_of_bounds
 
 
-def regular_grid_interp(points, values, coords, *, fill_value=None):
+def regular_grid_interp(points, values, coords, *, fill_value=None, uniform=None, dtype='float64'):
 
     """
     Linear interpolation on a regular grid in arbitrary dimensions.
@@ -81,6 +144,11 @@ def regular_grid_interp(points, values, coords, *, fill_value=None):
         A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
     values : array-like
         A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. The cells on these axes are located by direct arithmetic instead of a binary
+        search, this requires numerical ``points``. If None, all the axes are searched. Default is None.
+    dtype : str, optional
+        Floating point type of the interpolation graph. Default is 'float64'.
 
     Returns
     -------
@@ -89,37 +157,596 @@ def regular_grid_interp(points, values, coords, *, fill_value=None):
 
     """
 
-    points = [as_tensor_variable(p) for p in points]
     ndim = len(points)
-    values = as_tensor_variable(values)
-    coords = as_tensor_variable(coords)
+    values = as_tensor_variable(values, dtype)
+    coords = as_tensor_variable(coords, dtype)
 
     # Find where the points should be inserted
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform, dtype)
+
+    # Pad the weights to broadcast against the trailing output dimensions
+    nout_dims = values.ndim - ndim
+
+    result = tt.zeros(tuple(coords.shape[:-1]) + tuple(values.shape[ndim:]), dtype=dtype)
+    for edge_indices in itertools.product(*((i, i + 1) for i in indices)):
+        weight = tt.ones(coords.shape[:-1], dtype=dtype)
+        for ei, i, yi in zip(edge_indices, indices, norm_distances):
+            weight *= tt.where(tt.eq(ei, i), 1 - yi, yi)
+        result += values[edge_indices] * tt.shape_padright(weight, nout_dims)
+
+    if fill_value is not None:
+        result = tt.switch(tt.shape_padright(out_of_bounds, nout_dims), tt.cast(fill_value, dtype), result)
+
+    return result
+
+
+def simplex_grid_interp(points, values, coords, *, fill_value=None, uniform=None, dtype='float64'):
+
+    """
+    Simplex (Kuhn triangulation) linear interpolation on a regular grid in arbitrary dimensions.
+
+    Each grid cell is split into the ``ndim!`` simplices of the Kuhn triangulation. The simplex of a coordinate is
+    given by the descending order of its fractional distances within the cell, hence the interpolation only uses
+    ``ndim + 1`` vertices instead of the ``2**ndim`` cell corners of the multilinear interpolation.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing, this requires numerical ``points``. If None, all the axes are searched. Default
+        is None.
+    dtype : str, optional
+        Floating point type of the interpolation graph. Default is 'float64'.
+
+    Returns
+    -------
+    result : array-like
+        Interpolated values at the requested points.
+
+    """
+
+    ndim = len(points)
+    values = as_tensor_variable(values, dtype)
+    coords = as_tensor_variable(coords, dtype)
+
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform, dtype)
+
+    # Descending fractional distances and the rank of each axis in that order
+    y = tt.stack(norm_distances, axis=-1)
+    rank = tt.argsort(tt.argsort(-y, axis=-1), axis=-1)
+    y_sorted = -tt.sort(-y, axis=-1)
+
+    # Barycentric weights of the simplex vertices
+    bounds = [1] + [y_sorted[..., n] for n in range(ndim)] + [0]
+    nout_dims = values.ndim - ndim
+
+    result = tt.zeros(tuple(coords.shape[:-1]) + tuple(values.shape[ndim:]), dtype=dtype)
+    for k in range(ndim + 1):
+        vertex = tuple(i + tt.cast(rank[..., n] < k, 'int64') for n, i in enumerate(indices))
+        result += values[vertex] * tt.shape_padright(bounds[k] - bounds[k + 1], nout_dims)
+
+    if fill_value is not None:
+        result = tt.switch(tt.shape_padright(out_of_bounds, nout_dims), tt.cast(fill_value, dtype), result)
+
+    return result
+
+
+def nearest_grid_interp(points, values, coords, *, fill_value=None, uniform=None, dtype='float64'):
+
+    """
+    Nearest-neighbour interpolation on a regular grid in arbitrary dimensions.
+
+    The nearest node on each axis is found by rounding the affine transformation of the coordinates on uniform axes
+    and by a binary search on irregular axes.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing, this requires numerical ``points``. If None, all the axes are searched. Default
+        is None.
+    dtype : str, optional
+        Floating point type of the interpolation graph. Default is 'float64'.
+
+    Returns
+    -------
+    result : array-like
+        Value of the nearest grid node at the requested points.
+
+    """
+
+    uniform = [False] * len(points) if uniform is None else uniform
+    limits = uniform_limits(points, uniform, dtype)
+
+    points = [as_tensor_variable(p, dtype) for p in points]
+    ndim = len(points)
+    values = as_tensor_variable(values, dtype)
+    coords = as_tensor_variable(coords, dtype)
+
     indices = []
-    norm_distances = []
     out_of_bounds = tt.zeros(coords.shape[:-1], dtype=bool)
     for n, grid in enumerate(points):
         x = coords[..., n]
-        i = tt.extra_ops.searchsorted(grid, x) - 1
-        out_of_bounds |= (i < 0) | (i >= grid.shape[0] - 1)
-        i = tt.clip(i, 0, grid.shape[0] - 2)
-        indices.append(i)
-        norm_distances.append((x - grid[i]) / (grid[i + 1] - grid[i]))
 
-    result = tt.zeros(tuple(coords.shape[:-1]) + tuple(values.shape[ndim:]))
-    for edge_indices in itertools.product(*((i, i + 1) for i in indices)):
-        weight = tt.ones(coords.shape[:-1])
-        for ei, i, yi in zip(edge_indices, indices, norm_distances):
-            weight *= tt.where(tt.eq(ei, i), 1 - yi, yi)
-        result += values[edge_indices] * weight
+        # Constant step: round the affine transformation of the coordinates
+        if uniform[n]:
+            x_0, x_f, scale, m = limits[n]
+            i = tt.cast(tt.floor((x - x_0) * scale + 0.5), 'int64')
+            out_of_bounds |= (x < x_0) | (x > x_f)
+            indices.append(tt.clip(i, 0, m - 1))
+
+        # Irregular step: binary search and closest of the two cell edges
+        else:
+            i = tt.clip(tt.extra_ops.searchsorted(grid, x), 1, grid.shape[0] - 1)
+            out_of_bounds |= (x < grid[0]) | (x > grid[-1])
+            indices.append(tt.switch(x - grid[i - 1] < grid[i] - x, i - 1, i))
+
+    result = values[tuple(indices)]
+
+    if fill_value is not None:
+        result = tt.switch(tt.shape_padright(out_of_bounds, values.ndim - ndim), tt.cast(fill_value, dtype), result)
+
+    return result
+
+
+def spline_grid_interp(points, coeffs, coords, *, fill_value=None, uniform=None, dtype='float64'):
+
+    """
+    Tensor-product cubic spline interpolation on a regular grid in arbitrary dimensions.
+
+    Each cell is evaluated as a cubic Hermite polynomial from the values and derivatives at its corners, as computed
+    by ``innate.interpolation.numpy.spline_coefficients``.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    coeffs : array-like
+        The ``(2**ndim, m1, ... mn, ..., nout)`` spline coefficients.
+    uniform : list of bool, optional
+        Axes with a uniform spacing, this requires numerical ``points``. If None, all the axes are searched. Default
+        is None.
+    dtype : str, optional
+        Floating point type of the interpolation graph. Default is 'float64'.
+
+    Returns
+    -------
+    result : array-like
+        Interpolated values at the requested points.
+
+    """
+
+    ndim = len(points)
+    coeffs = as_tensor_variable(coeffs, dtype)
+    coords = as_tensor_variable(coords, dtype)
+
+    indices, norm_distances, out_of_bounds = grid_cells(points, coords, uniform, dtype)
+
+    # Hermite basis per axis: (lower edge value, upper edge value, lower edge slope, upper edge slope)
+    basis = []
+    for grid, i, t in zip(points, indices, norm_distances):
+        grid = as_tensor_variable(grid, dtype)
+        h = grid[i + 1] - grid[i]
+        t2, t3 = t * t, t * t * t
+        basis.append(((2 * t3 - 3 * t2 + 1, -2 * t3 + 3 * t2), (h * (t3 - 2 * t2 + t), h * (t3 - t2))))
+
+    nout_dims = coeffs.ndim - 1 - ndim
+
+    result = tt.zeros(tuple(coords.shape[:-1]) + tuple(coeffs.shape[ndim + 1:]), dtype=dtype)
+    for k, derivatives in enumerate(itertools.product((0, 1), repeat=ndim)):
+        for edges in itertools.product((0, 1), repeat=ndim):
+            weight = tt.ones(coords.shape[:-1], dtype=dtype)
+            for n, (edge, derivative) in enumerate(zip(edges, derivatives)):
+                weight *= basis[n][derivative][edge]
+            edge_indices = tuple(i + edge for edge, i in zip(edges, indices))
+            result += coeffs[k][edge_indices] * tt.shape_padright(weight, nout_dims)
 
     if fill_value is not None:
-        result = tt.switch(out_of_bounds, fill_value, result)
+        result = tt.switch(tt.shape_padright(out_of_bounds, nout_dims), tt.cast(fill_value, dtype), result)
 
     return result
 
 
-class RegularGridInterpolator:
+def c_mode(optimizer='fast_run'):
+
+    """
+    PyTensor mode with the C virtual machine linker, which runs the C implementation of the Ops.
+
+    Parameters
+    ----------
+    optimizer : str, optional
+        Graph optimizer of the mode. Default is 'fast_run'.
+
+    Returns
+    -------
+    mode : pytensor.compile.mode.Mode or None
+        The C mode. If PyTensor does not have a C++ compiler, None (the PyTensor default mode).
+
+    """
+
+    if not pytensor.config.cxx:
+        _logger.warning(f'PyTensor does not have a C++ compiler, the interpolation C implementation is not used')
+        return None
+
+    return Mode(linker='cvm', optimizer=optimizer)
+
+
+class RegularGridInterpOp(COp):
+
+    """
+
+    PyTensor Op for the linear interpolation on a regular grid with analytic gradients.
+
+    The Op has two outputs: the interpolated values with shape ``(..., nout)`` and their partial derivatives with
+    respect to the coordinates with shape ``(..., ndim, nout)``. Both are computed in the same evaluation, with a C
+    implementation for the C backends and the NumPy ``innate.interpolation.numpy.regular_grid_value_grad`` function
+    otherwise. The gradient of the values is the product of the output gradient and the second output from the same
+    node, hence the differentiation does not require an autodiff graph of the interpolation.
+
+    The C implementation is only used by the PyTensor modes with a C linker, for example, ``c_mode()``. The default mode
+    of PyTensor 3 compiles the graphs with Numba, which evaluates this Op with the Python ``perform`` method. Hence, the
+    ``mode`` argument of ``pytensor.function`` (or the ``compile_kwargs`` of the PyMC samplers) should be set to use
+    the C kernel in the user graphs.
+
+    The grid axes and values are constant inputs of the node. For a stacked grid (see ``stack_interpolator``) all
+    the outputs are computed by a single node, hence the graph size and the compilation time do not depend on the
+    number of grids.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    dtype : str, optional
+        Floating point type of the grid and the outputs. If None, the ``values`` type is used. Default is None.
+
+    """
+
+    __props__ = ('ndim', 'uniform', 'fill_key', 'nout_dims', 'dtype')
+
+    def __init__(self, points, values, fill_value=None, uniform=None, dtype=None):
+
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = str(float_dtype(self.values.dtype))
+        self.values = self.values.astype(self.dtype, copy=False)
+        self.points = [np.asarray(p, dtype=self.dtype) for p in points]
+        self.ndim = len(self.points)
+        self.fill_value = None if fill_value is None else float(fill_value)
+        self.fill_key = None if fill_value is None else repr(self.fill_value)  # NaN fill values are equal as strings
+        self.uniform = tuple(uniform_axes(points) if uniform is None else uniform)
+        self.nout_dims = self.values.ndim - self.ndim
+
+    def make_node(self, coords):
+
+        coords = tt.cast(tt.as_tensor_variable(coords), self.dtype)
+        values = tt.constant(self.values)
+        points = [tt.constant(p) for p in self.points]
+        out_ndim = coords.ndim - 1 + self.nout_dims
+
+        value = tt.tensor(dtype=self.dtype, shape=(None,) * out_ndim)
+        gradient = tt.tensor(dtype=self.dtype, shape=(None,) * (out_ndim + 1))
+
+        return Apply(self, [coords, values, *points], [value, gradient])
+
+    def perform(self, node, inputs, output_storage):
+
+        coords, values, *points = inputs
+        value, gradient = regular_grid_value_grad(points, values, coords, fill_value=self.fill_value,
+                                                  uniform=self.uniform)
+        output_storage[0][0] = value
+        output_storage[1][0] = gradient
+
+    def infer_shape(self, fgraph, node, input_shapes):
+
+        coords_shape, values_shape = input_shapes[0], input_shapes[1]
+        value_shape = tuple(coords_shape[:-1]) + tuple(values_shape[self.ndim:])
+        gradient_shape = tuple(coords_shape[:-1]) + (self.ndim,) + tuple(values_shape[self.ndim:])
+
+        return [value_shape, gradient_shape]
+
+    def connection_pattern(self, node):
+
+        # Only the coordinates are differentiable
+        return [[True, True]] + [[False, False]] * (len(node.inputs) - 1)
+
+    def pullback(self, inputs, outputs, cotangents):
+
+        coords = inputs[0]
+        g_value, g_gradient = cotangents
+        disconnected = [DisconnectedType()() for i in inputs[1:]]
+
+        # Second derivatives are not available
+        if not isinstance(g_gradient.type, DisconnectedType):
+            return [grad_not_implemented(self, 0, coords, 'The interpolation second derivatives are not available')] \
+                + disconnected
+
+        # Contract the output cotangent with the partial derivatives output
+        coords_grad = tt.shape_padaxis(g_value, coords.ndim - 1) * outputs[1]
+        if self.nout_dims > 0:
+            coords_grad = coords_grad.sum(axis=tuple(range(coords.ndim, coords.ndim + self.nout_dims)))
+
+        return [coords_grad] + disconnected
+
+    def grad(self, inputs, output_grads):
+
+        # PyTensor versions without the pullback interface (the node is recovered after the graph merge)
+        return self.pullback(inputs, self(inputs[0]), output_grads)
+
+    def c_headers(self, **kwargs):
+        return ['<math.h>']
+
+    def c_code_cache_version(self):
+        return (2,)
+
+    def c_code(self, node, name, inputs, outputs, sub):
+
+        coords, values, *points = inputs
+        value, gradient = outputs
+        ndim, fail = self.ndim, sub['fail']
+
+        # Fill value as a C literal
+        has_fill = int(self.fill_value is not None)
+        if not has_fill:
+            fill = '0'
+        elif np.isnan(self.fill_value):
+            fill = 'NPY_NAN'
+        elif np.isinf(self.fill_value):
+            fill = 'NPY_INFINITY' if self.fill_value > 0 else '(-NPY_INFINITY)'
+        else:
+            fill = repr(self.fill_value)
+
+        uniform = ', '.join(str(int(flag)) for flag in self.uniform)
+        points_contiguous = '\n'.join(f'points_c[{d}] = PyArray_GETCONTIGUOUS({p});' for d, p in enumerate(points))
+
+        return f"""
+        {{
+        typedef dtype_{value} real;
+        const int ndim = {ndim};
+        const int uniform[{ndim}] = {{{uniform}}};
+        const int coords_nd = PyArray_NDIM({coords});
+        const int tail_nd = PyArray_NDIM({values}) - ndim;
+
+        if ((coords_nd < 1) || (PyArray_DIMS({coords})[coords_nd - 1] != ndim)) {{
+            PyErr_SetString(PyExc_ValueError, "The coordinates last dimension must match the grid dimensions");
+            {fail};
+        }}
+
+        // Contiguous inputs
+        PyArrayObject* coords_c = PyArray_GETCONTIGUOUS({coords});
+        PyArrayObject* values_c = PyArray_GETCONTIGUOUS({values});
+        PyArrayObject* points_c[{ndim}];
+        {points_contiguous}
+
+        // Output shapes: (..., nout) and (..., ndim, nout)
+        npy_intp value_dims[NPY_MAXDIMS], gradient_dims[NPY_MAXDIMS];
+        npy_intp n_points = 1, nout = 1;
+        for (int k = 0; k < coords_nd - 1; k++) {{
+            value_dims[k] = gradient_dims[k] = PyArray_DIMS(coords_c)[k];
+            n_points *= PyArray_DIMS(coords_c)[k];
+        }}
+        gradient_dims[coords_nd - 1] = ndim;
+        for (int k = 0; k < tail_nd; k++) {{
+            value_dims[coords_nd - 1 + k] = gradient_dims[coords_nd + k] = PyArray_DIMS(values_c)[ndim + k];
+            nout *= PyArray_DIMS(values_c)[ndim + k];
+        }}
+
+        Py_XDECREF({value});
+        Py_XDECREF({gradient});
+        {value} = (PyArrayObject*) PyArray_ZEROS(coords_nd - 1 + tail_nd, value_dims, PyArray_TYPE(values_c), 0);
+        {gradient} = (PyArrayObject*) PyArray_ZEROS(coords_nd + tail_nd, gradient_dims, PyArray_TYPE(values_c), 0);
+
+        if (({value} == NULL) || ({gradient} == NULL)) {{
+            Py_DECREF(coords_c);
+            Py_DECREF(values_c);
+            for (int d = 0; d < ndim; d++) Py_DECREF(points_c[d]);
+            {fail};
+        }}
+
+        // Axes sizes, inverse uniform steps and values strides (in elements)
+        const real* grids[{ndim}];
+        npy_intp sizes[{ndim}], strides[{ndim}];
+        real scales[{ndim}];
+        for (int d = ndim - 1; d >= 0; d--) {{
+            grids[d] = (const real*) PyArray_DATA(points_c[d]);
+            sizes[d] = PyArray_SIZE(points_c[d]);
+            strides[d] = (d == ndim - 1) ? nout : strides[d + 1] * sizes[d + 1];
+            scales[d] = (sizes[d] - 1) / (grids[d][sizes[d] - 1] - grids[d][0]);
+        }}
+
+        const real* X = (const real*) PyArray_DATA(coords_c);
+        const real* V = (const real*) PyArray_DATA(values_c);
+        real* out_value = (real*) PyArray_DATA({value});
+        real* out_gradient = (real*) PyArray_DATA({gradient});
+
+        for (npy_intp i = 0; i < n_points; i++) {{
+
+            npy_intp cells[{ndim}];
+            real t[{ndim}], inv_steps[{ndim}], factors[{ndim}], partials[{ndim}];
+            int out_of_bounds = 0;
+
+            // Locate the cells
+            for (int d = 0; d < ndim; d++) {{
+                const real* grid = grids[d];
+                const npy_intp m = sizes[d];
+                const real x = X[i * ndim + d];
+                npy_intp cell;
+
+                if (uniform[d]) {{
+                    real u = (x - grid[0]) * scales[d];
+                    real lower = floor(u);
+                    if (!(lower >= 0)) lower = 0;
+                    if (lower > m - 2) lower = m - 2;
+                    cell = (npy_intp) lower;
+                    t[d] = u - lower;
+                    out_of_bounds |= !((x >= grid[0]) && (x <= grid[m - 1]));
+                }}
+                else {{
+                    npy_intp lo = 0, hi = m;
+                    while (lo < hi) {{
+                        npy_intp mid = (lo + hi) / 2;
+                        if (grid[mid] < x) lo = mid + 1;
+                        else hi = mid;
+                    }}
+                    cell = lo - 1;
+                    out_of_bounds |= (cell < 0) || (cell >= m - 1);
+                    if (cell < 0) cell = 0;
+                    if (cell > m - 2) cell = m - 2;
+                    t[d] = (x - grid[cell]) / (grid[cell + 1] - grid[cell]);
+                }}
+                cells[d] = cell;
+                inv_steps[d] = 1 / (grid[cell + 1] - grid[cell]);
+            }}
+
+            real* value_i = out_value + i * nout;
+            real* gradient_i = out_gradient + i * ndim * nout;
+
+            if ({has_fill} && out_of_bounds) {{
+                for (npy_intp o = 0; o < nout; o++) value_i[o] = {fill};
+                continue;
+            }}
+
+            // Accumulate the cell corners
+            for (int corner = 0; corner < (1 << ndim); corner++) {{
+                npy_intp offset = 0;
+                real weight = 1;
+                for (int d = 0; d < ndim; d++) {{
+                    int edge = (corner >> (ndim - 1 - d)) & 1;
+                    offset += (cells[d] + edge) * strides[d];
+                    factors[d] = edge ? t[d] : 1 - t[d];
+                    weight *= factors[d];
+                    partials[d] = edge ? inv_steps[d] : -inv_steps[d];
+                }}
+                for (int d = 0; d < ndim; d++)
+                    for (int k = 0; k < ndim; k++)
+                        if (k != d) partials[d] *= factors[k];
+
+                for (npy_intp o = 0; o < nout; o++) {{
+                    const real v = V[offset + o];
+                    value_i[o] += weight * v;
+                    for (int d = 0; d < ndim; d++) gradient_i[d * nout + o] += partials[d] * v;
+                }}
+            }}
+        }}
+
+        Py_DECREF(coords_c);
+        Py_DECREF(values_c);
+        for (int d = 0; d < ndim; d++) Py_DECREF(points_c[d]);
+        }}
+        """
+
+
+class TensorInterpolator:
+
+    """
+
+    Base class for the PyTensor interpolators.
+
+    Calling the instance returns the symbolic PyTensor graph (as ``evaluate``), which can be used inside PyMC models.
+    The ``eval`` method compiles this graph once per coordinates dimensionality and data type, caches the compiled
+    function and returns NumPy arrays. This is the recommended option for repeated numerical queries.
+
+    The graphs are built in the interpolator ``dtype``, for example, 'float32' for single precision grids.
+
+    """
+
+    dtype = 'float64'
+
+    def __init__(self):
+
+        # Check pytensor has been installed
+        if not pytensor_check:
+            _logger.critical(f'PyTensor is not installed, this interpolation cannot be applied.')
+            raise InnateError(f'Need to install PyTensor to use this function')
+
+        self._compiled = {}
+
+    def __call__(self, t):
+        return self.evaluate(t)
+
+    def evaluate(self, t):
+        raise NotImplementedError
+
+    def compile_mode(self):
+        """PyTensor mode of the compiled functions. If None, the PyTensor default mode is used."""
+        return None
+
+    def compile(self, coords_ndim=2, dtype=None):
+
+        """
+        Compile the interpolation graph for a symbolic coordinates input.
+
+        The compiled function is cached in the interpolator by the coordinates dimensionality (which fixes the output
+        shape) and data type, hence the graph is only built and compiled once per input configuration. The function is
+        compiled in the ``compile_mode`` of the interpolator.
+
+        Parameters
+        ----------
+        coords_ndim : int, optional
+            Number of dimensions of the coordinates input: 1 for a single point ``(ndim,)`` and 2 for a set of points
+            ``(ntest, ndim)``. Default is 2.
+        dtype : str, optional
+            Data type of the coordinates input. If None, the interpolator ``dtype`` is used. Default is None.
+
+        Returns
+        -------
+        function : pytensor.compile.function.types.Function
+            The compiled interpolation function.
+
+        """
+
+        dtype = self.dtype if dtype is None else dtype
+        key = (coords_ndim, str(dtype))
+        function = self._compiled.get(key)
+
+        if function is None:
+            coords = tt.tensor(dtype=str(dtype), shape=(None,) * coords_ndim, name='coords')
+            function = pytensor.function([coords], self.evaluate(coords), mode=self.compile_mode())
+
+            # The inputs are converted to the expected type in eval
+            function.trust_input = True
+            self._compiled[key] = function
+
+        return function
+
+    def eval(self, t, dtype=None):
+
+        """
+        Interpolate the data returning a numerical array.
+
+        Parameters
+        ----------
+        t : array-like
+            The coordinates where the interpolation should be evaluated. This must have the shape ``(ndim,)`` or
+            ``(ntest, ndim)``.
+        dtype : str, optional
+            Data type of the coordinates. If None, the interpolator ``dtype`` is used. Default is None.
+
+        Returns
+        -------
+        result : numpy.ndarray
+            Interpolated values at the requested points.
+
+        Examples
+        --------
+        >>> emissivities['O3_5007A'].approx.interp.rgi.eval([[12250, 122], [15000, 300]])
+
+        """
+
+        t = np.asarray(t, dtype=self.dtype if dtype is None else dtype)
+
+        return self.compile(t.ndim, t.dtype)(t)
+
+
+class RegularGridInterpolator(TensorInterpolator):
 
     """
 
@@ -134,6 +761,16 @@ class RegularGridInterpolator:
         A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
     values : array-like
         A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    dtype : str, optional
+        Floating point type of the grid and the interpolation graph, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+    op : bool, optional
+        If True, the interpolation is a single ``RegularGridInterpOp`` node (with a C implementation) instead of the
+        ``regular_grid_interp`` graph. This option is recommended for stacked grids inside PyMC models, since the
+        graph size does not depend on the number of grids. The ``eval`` functions of this option are compiled with the
+        C virtual machine linker (see ``c_mode``) to run the C implementation. Default is False.
 
     Returns
     -------
@@ -142,18 +779,20 @@ class RegularGridInterpolator:
 
     """
 
-    def __init__(self, points, values, fill_value=None, **kwargs):
+    def __init__(self, points, values, fill_value=None, uniform=None, dtype=None, op=False, **kwargs):
 
-        # Check pytensor has been installed
-        if pytensor_check:
-            self.ndim = len(points)
-            self.points = points
-            self.values = values
-            self.fill_value = fill_value
+        super().__init__()
+        self.ndim = len(points)
+        self.points = points
+        self.values = values if dtype is None else np.asarray(values, dtype=dtype)
+        self.dtype = str(float_dtype(self.values.dtype))
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.op = op
+        self._op = None
 
-        else:
-            _logger.critical(f'PyTensor is not installed, this interpolation cannot be applied.')
-            raise InnateError(f'Need to install PyTensor to use this function')
+    def compile_mode(self):
+        return c_mode() if self.op else None
 
     def evaluate(self, t):
         """Interpolate the data
@@ -163,4 +802,181 @@ class RegularGridInterpolator:
                 should be evaluated. This must have the shape
                 ``(ntest, ndim)``.
         """
-        return regular_grid_interp(self.points, self.values, t, fill_value=self.fill_value)
\ No newline at end of file
+        if self.op:
+            return self.value_and_grad(t)[0]
+
+        return regular_grid_interp(self.points, self.values, t, fill_value=self.fill_value, uniform=self.uniform,
+                                   dtype=self.dtype)
+
+    def value_and_grad(self, t):
+        """Interpolate the data and compute its partial derivatives with respect to the coordinates
+
+        The output tensors are computed by a single ``RegularGridInterpOp`` node, whose gradient reuses the partial
+        derivatives instead of differentiating the ``regular_grid_interp`` graph.
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+        """
+        if self._op is None:
+            self._op = RegularGridInterpOp(self.points, self.values, fill_value=self.fill_value,
+                                           uniform=self.uniform, dtype=self.dtype)
+
+        return self._op(t)
+
+
+class NearestGridInterpolator(TensorInterpolator):
+
+    """
+
+    Nearest-neighbour interpolation on a regular grid in arbitrary dimensions.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    dtype : str, optional
+        Floating point type of the grid and the interpolation graph, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+
+    Returns
+    -------
+    result : array-like
+        Value of the nearest grid node at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, uniform=None, dtype=None, **kwargs):
+
+        super().__init__()
+        self.ndim = len(points)
+        self.points = points
+        self.values = values if dtype is None else np.asarray(values, dtype=dtype)
+        self.dtype = str(float_dtype(self.values.dtype))
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+
+    def evaluate(self, t):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+        """
+        return nearest_grid_interp(self.points, self.values, t, fill_value=self.fill_value, uniform=self.uniform,
+                                   dtype=self.dtype)
+
+
+class SplineGridInterpolator(TensorInterpolator):
+
+    """
+
+    Tensor-product cubic spline interpolation on a regular grid in arbitrary dimensions.
+
+    The spline coefficients are computed once on the initialization (or provided by the user, for example, from
+    the dataset file) and they are available in the ``coeffs`` attribute.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    coeffs : array-like, optional
+        The ``(2**ndim, m1, ... mn, ..., nout)`` precomputed spline coefficients. If None, these are computed from
+        the ``values``. Default is None.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    dtype : str, optional
+        Floating point type of the grid and the interpolation graph, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+
+    Returns
+    -------
+    result : array-like
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, coeffs=None, uniform=None, dtype=None, **kwargs):
+
+        super().__init__()
+        self.ndim = len(points)
+        self.points = points
+        self.values = values if dtype is None else np.asarray(values, dtype=dtype)
+        self.dtype = str(float_dtype(self.values.dtype))
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+        self.coeffs = load_spline_coefficients(points, np.asarray(self.values), coeffs).astype(self.dtype, copy=False)
+
+    def evaluate(self, t):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+        """
+        return spline_grid_interp(self.points, self.coeffs, t, fill_value=self.fill_value, uniform=self.uniform,
+                                  dtype=self.dtype)
+
+
+class SimplexGridInterpolator(TensorInterpolator):
+
+    """
+
+    Simplex (Kuhn triangulation) linear interpolation on a regular grid in arbitrary dimensions.
+
+    The evaluation cost grows linearly with the number of dimensions (``ndim + 1`` vertices per coordinate).
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        A tensor defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    uniform : list of bool, optional
+        Axes with a uniform spacing. If None, these are detected from the ``points``. Default is None.
+    dtype : str, optional
+        Floating point type of the grid and the interpolation graph, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+
+    Returns
+    -------
+    result : array-like
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, points, values, fill_value=None, uniform=None, dtype=None, **kwargs):
+
+        super().__init__()
+        self.ndim = len(points)
+        self.points = points
+        self.values = values if dtype is None else np.asarray(values, dtype=dtype)
+        self.dtype = str(float_dtype(self.values.dtype))
+        self.fill_value = fill_value
+        self.uniform = uniform_axes(points) if uniform is None else list(uniform)
+
+    def evaluate(self, t):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+        """
+        return simplex_grid_interp(self.points, self.values, t, fill_value=self.fill_value, uniform=self.uniform,
+                                   dtype=self.dtype)
+
+
+INTERPOLATORS = {'rgi': RegularGridInterpolator,
+                 'near': NearestGridInterpolator,
+                 'spline': SplineGridInterpolator,
+                 'simplex': SimplexGridInterpolator}
@@ -0,0 +1,268 @@
+import logging
+import numpy as np
+from ..io import InnateError
+from .numpy import ArrayInterpolator, evaluate_in_chunks, float_dtype
+
+_logger = logging.getLogger('Innate')
+
+try:
+    from scipy.spatial import cKDTree
+    scipy_check = True
+except ImportError:
+    scipy_check = False
+
+
+def grid_nodes(points, values, finite=False):
+
+    """
+    Convert a regular grid into a set of scattered nodes.
+
+    Parameters
+    ----------
+    points : list of array-like
+        A list of vectors with shapes ``(m1,), ... (mn,)``. These define the grid points in each dimension.
+    values : array-like
+        An array defining the values at each point in the grid defined by ``points``. This must have the shape ``(m1, ... mn, ..., nout)``.
+    finite : bool, optional
+        Exclude the nodes with non-finite values in any of the outputs. Default is False.
+
+    Returns
+    -------
+    nodes : numpy.ndarray
+        The ``(m1 * ... * mn, ndim)`` nodes coordinates.
+    node_values : numpy.ndarray
+        The ``(m1 * ... * mn, ..., nout)`` nodes values.
+
+    """
+
+    ndim = len(points)
+    values = np.asarray(values)
+
+    mesh = np.meshgrid(*points, indexing='ij')
+    nodes = np.column_stack([axis_mesh.ravel() for axis_mesh in mesh])
+    node_values = values.reshape((nodes.shape[0],) + values.shape[ndim:])
+
+    if finite:
+        mask = np.isfinite(node_values).reshape(nodes.shape[0], -1).all(axis=1)
+        nodes, node_values = nodes[mask], node_values[mask]
+
+    return nodes, node_values
+
+
+class SpatialIndex:
+
+    """
+
+    KD-tree over a set of scattered nodes.
+
+    The coordinates are rescaled to the unit hypercube of the nodes bounding box, so axes with different magnitudes
+    (for example, temperature and density) contribute equally to the distances.
+
+    Parameters
+    ----------
+    nodes : array-like
+        The ``(n_nodes, ndim)`` nodes coordinates.
+    rescale : bool, optional
+        Rescale the coordinates to the nodes bounding box. Default is True.
+
+    """
+
+    def __init__(self, nodes, rescale=True):
+
+        if not scipy_check:
+            _logger.critical(f'SciPy is not installed, this interpolation cannot be applied.')
+            raise InnateError(f'Need to install SciPy to use this function')
+
+        nodes = np.asarray(nodes, dtype=float)
+        if nodes.ndim != 2:
+            raise InnateError(f'The input nodes must have the shape (n_nodes, ndim), not {nodes.shape}')
+
+        self.ndim = nodes.shape[1]
+        self.offset = nodes.min(axis=0) if rescale else np.zeros(self.ndim)
+        self.scale = np.ptp(nodes, axis=0) if rescale else np.ones(self.ndim)
+        self.scale[self.scale == 0] = 1
+        self.tree = cKDTree(self.transform(nodes))
+
+    def transform(self, coords):
+        return (np.asarray(coords, dtype=float) - self.offset) / self.scale
+
+    def query(self, coords, k=1, workers=-1):
+
+        """
+        Find the k nearest nodes to the input coordinates.
+
+        Parameters
+        ----------
+        coords : array-like
+            The coordinates with shape ``(..., ndim)``.
+        k : int, optional
+            Number of nearest neighbours. Default is 1.
+        workers : int, optional
+            Number of threads for the query, -1 uses all the CPU threads. Default is -1.
+
+        Returns
+        -------
+        distances : numpy.ndarray
+            Distances (in the rescaled coordinates) to the nearest nodes.
+        indices : numpy.ndarray
+            Indices of the nearest nodes.
+
+        """
+
+        return self.tree.query(self.transform(coords), k=k, workers=workers)
+
+
+class NearestInterpolator(ArrayInterpolator):
+
+    """
+
+    Nearest-neighbour interpolation on scattered nodes using a KD-tree.
+
+    The spatial index is built once on the initialization, hence each query costs O(log n_nodes) per coordinate. The
+    coordinates are evaluated in chunks, hence the memory use of the queries is bounded by ``chunk_size``.
+
+    Parameters
+    ----------
+    nodes : array-like
+        The ``(n_nodes, ndim)`` nodes coordinates.
+    values : array-like
+        The nodes values with shape ``(n_nodes, ..., nout)``.
+    rescale : bool, optional
+        Rescale the coordinates to the nodes bounding box before measuring the distances. Default is True.
+    chunk_size : int, optional
+        Number of coordinates per evaluation block. Default is 100000.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the nodes values and the interpolation, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Value of the nearest node at the requested points.
+
+    """
+
+    def __init__(self, nodes, values, rescale=True, chunk_size=100_000, dtype=None, **kwargs):
+
+        self.index = SpatialIndex(nodes, rescale=rescale)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.chunk_size = chunk_size
+
+        if self.values.shape[0] != self.index.tree.n:
+            raise InnateError(f'The number of values ({self.values.shape[0]}) is different from the number of nodes '
+                              f'({self.index.tree.n})')
+
+    @classmethod
+    def from_grid(cls, points, values, finite=False, **kwargs):
+        return cls(*grid_nodes(points, values, finite=finite), **kwargs)
+
+    def _evaluate_chunk(self, coords):
+        distances, indices = self.index.query(coords, k=1)
+        return self.values[indices]
+
+    def evaluate(self, t, out=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+        """
+        t = np.asarray(t, dtype=float)
+
+        return evaluate_in_chunks(self._evaluate_chunk, t, self.index.ndim, self.values.shape[1:],
+                                  self.values.dtype, self.chunk_size, out)
+
+
+class IDWInterpolator(ArrayInterpolator):
+
+    """
+
+    Inverse distance weighting interpolation on scattered nodes using a KD-tree.
+
+    The spatial index is built once on the initialization. Each coordinate is interpolated from its ``k`` nearest
+    nodes, with weights proportional to the inverse of the distance to the ``power``. The coordinates are evaluated
+    in chunks, hence the memory use is bounded by ``chunk_size * k`` instead of the number of nodes times the number
+    of coordinates.
+
+    Parameters
+    ----------
+    nodes : array-like
+        The ``(n_nodes, ndim)`` nodes coordinates.
+    values : array-like
+        The nodes values with shape ``(n_nodes, ..., nout)``.
+    k : int, optional
+        Number of nearest nodes for each coordinate. Default is 8.
+    power : float, optional
+        Power of the inverse distance weights. Default is 2.
+    rescale : bool, optional
+        Rescale the coordinates to the nodes bounding box before measuring the distances. Default is True.
+    chunk_size : int, optional
+        Number of coordinates per evaluation block. Default is 100000.
+    dtype : str or numpy.dtype, optional
+        Floating point type of the nodes values and the interpolation, for example, 'float32'. If None, the
+        ``values`` type is used. Default is None.
+
+    Returns
+    -------
+    result : numpy.ndarray
+        Interpolated values at the requested points.
+
+    """
+
+    def __init__(self, nodes, values, k=8, power=2, rescale=True, chunk_size=100_000, dtype=None, **kwargs):
+
+        self.index = SpatialIndex(nodes, rescale=rescale)
+        self.values = np.asarray(values, dtype=dtype)
+        self.dtype = float_dtype(self.values.dtype)
+        self.k = min(k, self.index.tree.n)
+        self.power = power
+        self.chunk_size = chunk_size
+
+        if self.values.shape[0] != self.index.tree.n:
+            raise InnateError(f'The number of values ({self.values.shape[0]}) is different from the number of nodes '
+                              f'({self.index.tree.n})')
+
+    @classmethod
+    def from_grid(cls, points, values, finite=False, **kwargs):
+        return cls(*grid_nodes(points, values, finite=finite), **kwargs)
+
+    def _evaluate_chunk(self, coords):
+
+        distances, indices = self.index.query(coords, k=self.k)
+        distances, indices = distances.reshape((coords.shape[0], -1)), indices.reshape((coords.shape[0], -1))
+
+        # Coordinates on top of a node take its value
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / distances ** self.power
+        on_node = distances[:, 0] == 0
+        weights[on_node] = 0
+        weights[on_node, 0] = 1
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        weights = weights.reshape(weights.shape + (1,) * (self.values.ndim - 1)).astype(self.dtype, copy=False)
+
+        return (self.values[indices] * weights).sum(axis=1)
+
+    def evaluate(self, t, out=None):
+        """Interpolate the data
+
+        Args:
+            t: A matrix defining the coordinates where the interpolation
+                should be evaluated. This must have the shape
+                ``(ntest, ndim)``.
+            out: Optional C-contiguous array with shape ``(ntest, nout)``
+                where the output is written.
+        """
+        t = np.asarray(t, dtype=float)
+
+        return evaluate_in_chunks(self._evaluate_chunk, t, self.index.ndim, self.values.shape[1:], self.dtype,
+                                  self.chunk_size, out)
+
+
+# Interpolators of the grids as scattered nodes
+SCATTERED_INTERPOLATORS = {'near': NearestInterpolator,
+                           'idw': IDWInterpolator}
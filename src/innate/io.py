@@ -1,4 +1,6 @@
 import logging
+import numpy as np
+from collections.abc import Mapping
 from pathlib import Path
 from . import _setup_cfg
 
@@ -24,6 +26,59 @@ class InnateError(Exception):
     """InnateError exception function"""
 
 
+class LazyGroup(Mapping):
+
+    """
+    Read-only mapping with the variables and attributes of a NetCDF group, which are read on the first access.
+
+    Parameters
+    ----------
+    fname : str or pathlib.Path
+        The NetCDF file.
+    path : str
+        The group path in the file, for example, ``'/nn/O3_5007A'``.
+    keys : list of str
+        The variables and attributes names.
+    data : dict, optional
+        The group entries if already read. Default is None.
+
+    """
+
+    def __init__(self, fname, path, keys, data=None):
+        self.fname = fname
+        self.path = path
+        self._keys = list(keys)
+        self._data = data
+
+    def load(self):
+
+        """Read all the group entries from the file."""
+
+        if self._data is None:
+            with h5netcdf.File(self.fname, 'r') as f:
+                self._data = read_group(f[self.path])
+
+        return self._data
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f'LazyGroup({str(self.fname)!r}, {self.path!r}, loaded={self._data is not None})'
+
+
+def read_group(group):
+    data = {name: variable[...] for name, variable in group.variables.items()}
+    data.update(group.attrs)
+    return data
+
+
 def load_dataset(fname: str):
     """
         Load the data grids and configuration from a digital file.
@@ -86,7 +141,7 @@ def load_dataset(fname: str):
             return KeyError(f'The extension "{ext}" is not recognized, please use ".nc" or ".fits"')
 
 
-def save_dataset(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict):
+def save_dataset(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict, approx_dict: dict = None):
 
     """
     Save the data grids and configuration to a digital file.
@@ -101,6 +156,13 @@ def save_dataset(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict
         Dictionary containing common configuration parameters.
     custom_cfg : dict
         Dictionary containing custom configuration parameters.
+    approx_dict : dict, optional
+        Dictionary with the precomputed approximation arrays by technique and grid, for example,
+        ``{'spline': {grid_name: coeffs_array}}``. These are loaded as the ``{technique}_coeffs`` entry of the grid
+        local configuration. The grid entry can also be a dictionary, for example, the parameters of a neural network
+        ``{'nn': {grid_name: grid.approx.reg.nn.state}}``, whose arrays are stored as variables and scalars as
+        attributes of a group. These are read from the file on the first access. Only available for '.nc' files.
+        Default is None.
 
     Returns
     -------
@@ -121,6 +183,10 @@ def save_dataset(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict
     --------
     >>> save_dataset('data/output.fits', grid_dict, common_cfg, custom_cfg)
     >>> save_dataset('data/output.nc', grid_dict, common_cfg, custom_cfg)
+    >>> save_dataset('data/output.nc', grid_dict, common_cfg, custom_cfg,
+    ...              approx_dict={'spline': {'O3_5007A': dataset['O3_5007A'].approx.interp.spline.coeffs}})
+    >>> save_dataset('data/output.nc', grid_dict, common_cfg, custom_cfg,
+    ...              approx_dict={'nn': {'O3_5007A': dataset['O3_5007A'].approx.reg.nn.state}})
     """
 
     # Check the file location
@@ -135,10 +201,12 @@ def save_dataset(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict
     match ext:
 
         case '.fits':
+            if approx_dict is not None:
+                _logger.warning(f'The approximation arrays cannot be stored in ".fits" files')
             return fits_file_save(fname, grid_dict, common_cfg, custom_cfg)
 
         case '.nc':
-            return h5netcdf_file_save(fname, grid_dict, common_cfg, custom_cfg)
+            return h5netcdf_file_save(fname, grid_dict, common_cfg, custom_cfg, approx_dict)
 
         case _:
             return KeyError(f'The extension "{ext}" is not recognized, please use ".nc" or ".fits"')
@@ -179,7 +247,7 @@ def fits_file_load(fname: str):
     return grid_dict, cfg_dict
 
 
-def h5netcdf_file_save(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict):
+def h5netcdf_file_save(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg: dict, approx_dict: dict = None):
 
     if h5netcdf_check:
 
@@ -214,12 +282,40 @@ def h5netcdf_file_save(fname: str, grid_dict: dict, common_cfg: dict, custom_cfg
                         for key, value in local_cfg.items():
                             var.attrs[f'{grid_name}_{key}'] = value
 
+            # Approximation arrays in one group per technique
+            if approx_dict is not None:
+                for technique, technique_dict in approx_dict.items():
+                    group = f.create_group(technique)
+                    for grid_name, array in technique_dict.items():
+
+                        # Dictionaries in a group per grid
+                        if isinstance(array, Mapping):
+                            grid_group = group.create_group(grid_name)
+                            for name, value in array.items():
+                                if isinstance(value, np.ndarray):
+                                    write_array(grid_group, name, value)
+                                else:
+                                    grid_group.attrs[name] = value
+
+                        else:
+                            write_array(group, grid_name, array)
+
     else:
         raise InnateError(f'To open ".nc" (h5netcdf) files you need to install the h5netcdf package')
 
     return
 
 
+def write_array(group, name, array):
+
+    dims = tuple(f'{name}_{i}' for i in range(array.ndim))
+    for dim, dim_size in zip(dims, array.shape):
+        group.dimensions[dim] = dim_size
+    group.create_variable(name, dims, data=array)
+
+    return
+
+
 def h5netcdf_file_load(fname: str):
 
     grid_dict, common_cfg, local_cfg = {}, {}, {}
@@ -258,6 +354,21 @@ def h5netcdf_file_load(fname: str):
                 if len(local_cfg[var_name]) == 0:
                     local_cfg[var_name] = None
 
+            # Approximation arrays as local configuration entries
+            for technique, group in f.groups.items():
+                for var_name in group.variables:
+                    if var_name in local_cfg:
+                        local_cfg[var_name] = {} if local_cfg[var_name] is None else local_cfg[var_name]
+                        local_cfg[var_name][f'{technique}_coeffs'] = group.variables[var_name][...]
+
+                # Grid groups are read on the first access (or directly from uploaded files)
+                for var_name, grid_group in group.groups.items():
+                    if var_name in local_cfg:
+                        local_cfg[var_name] = {} if local_cfg[var_name] is None else local_cfg[var_name]
+                        keys = list(grid_group.variables) + list(grid_group.attrs)
+                        data = None if isinstance(fname, (str, Path)) else read_group(grid_group)
+                        local_cfg[var_name][f'{technique}_coeffs'] = LazyGroup(fname, grid_group.name, keys, data)
+
     else:
         raise InnateError(f'To open ".nc" (h5netcdf) files you need to install the h5netcdf package')
 
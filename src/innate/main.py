@@ -1,8 +1,13 @@
 import logging
+import time
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from .io import InnateError, load_dataset
 from .approximation import Approximator
+from .interpolation.methods import stack_interpolator
+from .interpolation.numpy import parallel_jobs
+from .regression.methods import init_fit_worker, fit_eqn_task, Polynomial
 from .plotting import Plotter
 
 _logger = logging.getLogger('Innate')
@@ -18,7 +23,7 @@ def reconstruct_axes_range(data_label, axes, data_cfg, data_shape):
             raise InnateError(
                 f'The input grid "{data_label}" configuration does not include a range for the axis "{dim}"')
 
-        axes_range[dim] = np.linspace(linspace_idcs[0], linspace_idcs[1], linspace_idcs[2])
+        axes_range[dim] = np.linspace(linspace_idcs[0], linspace_idcs[1], int(linspace_idcs[2]))
 
         # Check the sizes are the same
         if axes_range[dim].size != data_shape[i]:
@@ -45,7 +50,11 @@ class Grid:
     data_cfg : dict
        Configuration dictionary for the data, containing the array dimensions information.
     tensor_library : str, optional
-       The tensor library to use (default is 'pytensor').
+       The tensor library to use (default is 'pytensor'). The 'numpy' option evaluates the interpolations numerically
+       without importing PyTensor.
+    dtype : str, optional
+       Floating point type for the data and the approximations, for example, 'float32' to halve the memory of the
+       grids. If None, the data array type is used (default is None).
 
     Attributes
     ----------
@@ -59,6 +68,12 @@ class Grid:
        List of axes for the data.
     shape : tuple
        Shape of the data array.
+    tensor_library : str
+       The tensor library used to compile the approximations.
+    dtype : numpy.dtype
+       Data type of the grid.
+    cfg : dict
+       Configuration of the grid, which is updated by the approximations fitting.
     axes_range : list
        Range of the axes for the data.
     approx : Approximator
@@ -73,7 +88,7 @@ class Grid:
 
     """
 
-    def __init__(self, grid_label, data_array, data_cfg, tensor_library='pytensor'):
+    def __init__(self, grid_label, data_array, data_cfg, tensor_library='pytensor', dtype=None):
 
         # Class attributes
         self.label = None
@@ -81,19 +96,25 @@ class Grid:
         self.data = None
         self.axes = None
         self.shape = None
+        self.tensor_library = None
+        self.dtype = None
+        self.cfg = None
         self.axes_range = None
 
         # Assign attribute values
         self.label = grid_label
         self.description = data_cfg['parameter']
-        self.data = data_array
+        self.data = data_array if dtype is None else np.asarray(data_array, dtype=dtype)
         self.axes = data_cfg['axes']
         self.shape = self.data.shape
+        self.tensor_library = tensor_library
+        self.dtype = self.data.dtype
+        self.cfg = dict(data_cfg)
         self.axes_range = reconstruct_axes_range(grid_label, self.axes, data_cfg, self.shape)
 
         # Declare the function attributes treatments
         approx_techniques = data_cfg.get('approximation')
-        self.approx = Approximator(self, approx_techniques, data_cfg)
+        self.approx = Approximator(self, approx_techniques, self.cfg, tensor_library=tensor_library)
 
         # Plotting function
         self.plot = Plotter(self)
@@ -143,7 +164,7 @@ class DataSet(dict):
         return
 
     @classmethod
-    def from_file(cls, fname, grid_cfg=None):
+    def from_file(cls, fname, grid_cfg=None, tensor_library='pytensor', dtype=None):
 
         """
         Creates a DataSet dictionarly-like object from an input file address.
@@ -155,6 +176,11 @@ class DataSet(dict):
         grid_cfg : dict, optional
             Configuration parameters for the dataset provided by the user. These values will overwrite common entries on
              the fiel configuration parameter. Default is None.
+        tensor_library : str, optional
+            The tensor library for the grids approximations: 'pytensor' or 'numpy'. Default is 'pytensor'.
+        dtype : str, optional
+            Floating point type for all the grids and their approximations, for example, 'float32' for single
+            precision. If None, the file data type is used. Default is None.
 
         Returns
         -------
@@ -170,6 +196,7 @@ class DataSet(dict):
         Examples
         --------
         >>> scientific_data = DataSet.from_file('data/file.txt', grid_cfg={'param': 'value'})
+        >>> single_precision_data = DataSet.from_file('data/file.nc', dtype='float32')
         """
 
         # Load and parse the input data
@@ -177,7 +204,7 @@ class DataSet(dict):
 
         # Update the input configuration with the parameters from the user
 
-        return cls(array_dict, common_cfg, local_cfg)
+        return cls(array_dict, common_cfg, local_cfg, tensor_library=tensor_library, dtype=dtype)
 
     def _compile_grids(self, array_dict, common_cfg, local_cfg, **kwargs):
 
@@ -217,3 +244,195 @@ class DataSet(dict):
 
         return approx_dict
 
+    def stack_approximation(self, technique='rgi', label_list=None, tensor_library=None, **kwargs):
+
+        """
+        Creates a single interpolator for several grids of the dataset.
+
+        The grids are packed into one array with a trailing dimension for the grids. The output from the interpolation
+        of ``(n_points, ndim)`` coordinates is an ``(n_points, n_grids)`` array, where the cells location and weights
+        are computed only once for all the grids.
+
+        Parameters
+        ----------
+        technique : str, optional
+            The interpolation technique. Default is 'rgi'.
+        label_list : list of str, optional
+            The grids to stack, which must share the same axes. The output columns follow this order. Default is
+            the ``data_labels`` order.
+        tensor_library : str, optional
+            The tensor library for the interpolation: 'pytensor' or 'numpy'. Default is the first grid tensor library.
+        **kwargs
+            Additional arguments for the interpolator, for example, ``op=True`` for a single PyTensor node with the
+            stacked grids interpolation.
+
+        Returns
+        -------
+        interpolator : RegularGridInterpolator
+            The interpolator object for the stacked grids.
+
+        Examples
+        --------
+        >>> emissivities = DataSet.from_file('emissivity_grids.nc', tensor_library='numpy')
+        >>> lines_interp = emissivities.stack_approximation('rgi', label_list=['O3_5007A', 'H1_6563A'])
+        >>> lines_interp.eval([[12250, 122], [15000, 300]])
+        >>> lines_op = emissivities.stack_approximation('rgi', tensor_library='pytensor', op=True)
+        """
+
+        label_list = label_list if label_list is not None else list(self.data_labels)
+        grid_list = [self[label] for label in label_list]
+
+        tensor_library = tensor_library if tensor_library is not None else grid_list[0].tensor_library
+
+        return stack_interpolator(grid_list, technique, tensor_library, **kwargs)
+
+    def interpolate(self, coords, technique='rgi', label_list=None, n_jobs=1, out=None):
+
+        """
+        Interpolates several grids of the dataset at a large set of coordinates.
+
+        The grids are stacked into a NumPy interpolator (see ``stack_approximation``) and the coordinates are split
+        into blocks, which are evaluated in ``n_jobs`` threads sharing the (read-only) stacked grid.
+
+        Parameters
+        ----------
+        coords : array-like
+            The ``(n_points, ndim)`` coordinates.
+        technique : str, optional
+            The interpolation technique. Default is 'rgi'.
+        label_list : list of str, optional
+            The grids to interpolate, which must share the same axes. The output columns follow this order. Default
+            is the ``data_labels`` order.
+        n_jobs : int, optional
+            Number of threads for the evaluation. Negative values are counted from the number of CPUs, for example,
+            -1 uses all of them. Default is 1.
+        out : numpy.ndarray, optional
+            C-contiguous ``(n_points, n_grids)`` array to store the output. Default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            The ``(n_points, n_grids)`` interpolated values.
+
+        Examples
+        --------
+        >>> emissivities = DataSet.from_file('emissivity_grids.nc')
+        >>> flux_array = emissivities.interpolate(coords, 'rgi', label_list=['O3_5007A', 'H1_6563A'], n_jobs=-1)
+        """
+
+        label_list = label_list if label_list is not None else list(self.data_labels)
+        interpolator = stack_interpolator([self[label] for label in label_list], technique, 'numpy', n_jobs=n_jobs)
+
+        return interpolator.evaluate(coords, out=out)
+
+    def fit(self, technique='eqn', expression=None, label_list=None, p0=None, n_jobs=1, max_iter=100, tol=1e-10,
+            degree=None):
+
+        """
+        Fits a parametrisation to several grids of the dataset.
+
+        The same expression is fitted to every grid (see ``Regressor.fit``). The grids must share the same axes,
+        whose mesh is computed once and shared with the ``n_jobs`` processes of the pool, which only receive the grid
+        data. The ``eqn`` technique and the ``eqn`` and ``eqn_coeffs`` configuration entries of all the grids are
+        updated at the end.
+
+        For the 'poly' technique, the polynomial coefficients of all the grids with the same degree are fitted in a
+        single least-squares call with the common design matrix (see ``Polynomial``), which updates the
+        ``poly_degree`` and ``poly_coeffs`` configuration entries.
+
+        Parameters
+        ----------
+        technique : str, optional
+            The regression technique: 'eqn' or 'poly'. Default is 'eqn'.
+        expression : str, optional
+            The parametrisation expression. Default is the current ``eqn`` expression of each grid.
+        label_list : list of str, optional
+            The grids to fit. Default is the ``data_labels`` order.
+        p0 : array-like, optional
+            Initial coefficients values in alphabetical order. Default is the current coefficients for the same
+            expression or ones otherwise.
+        n_jobs : int, optional
+            Number of processes. Negative values are counted from the number of CPUs, for example, -1 uses all of
+            them. Default is 1, which fits the grids sequentially in the current process.
+        max_iter : int, optional
+            Maximum number of Levenberg-Marquardt iterations. Default is 100.
+        tol : float, optional
+            Relative tolerance to stop the iterations. Default is 1e-10.
+        degree : int or list of int, optional
+            The polynomial degree for all the axes or for each axis in the 'poly' technique. Default is the
+            ``poly_degree`` of each grid configuration or 3 if it is not available.
+
+        Returns
+        -------
+        dict
+            The fit summary of each grid (see ``Regressor.fit``) with the fitting ``time`` in seconds. For the 'poly'
+            technique, the grids with the same degree share a single least-squares call, whose total time is the
+            ``batch_time`` entry.
+
+        Examples
+        --------
+        >>> emissivities = DataSet.from_file('emissivity_grids.nc')
+        >>> fit_dict = emissivities.fit('eqn', 'a + b / (temp/10000.0) + c * np.log10(den/10000)', n_jobs=-1)
+        >>> {label: info['rms'] for label, info in fit_dict.items()}
+        >>> poly_dict = emissivities.fit('poly', degree=(4, 3))
+        """
+
+        if technique not in ('eqn', 'poly'):
+            raise InnateError(f'The fitting of the "{technique}" technique is not available, please use "eqn" or '
+                              f'"poly"')
+
+        label_list = label_list if label_list is not None else list(self.data_labels)
+        grid_0 = self[label_list[0]]
+        for label in label_list[1:]:
+            grid = self[label]
+            if (tuple(grid.axes) != tuple(grid_0.axes)) or \
+                    any(not np.array_equal(grid.axes_range[axis], grid_0.axes_range[axis]) for axis in grid_0.axes):
+                raise InnateError(f'The grid "{label}" axes are different from the "{label_list[0]}" grid axes')
+
+        # Polynomials of all the grids with the same degree in one least-squares call
+        if technique == 'poly':
+            axes_range = [grid_0.axes_range[axis] for axis in grid_0.axes]
+            degree_groups = {}
+            for label in label_list:
+                grid_degree = self[label].cfg.get('poly_degree', 3) if degree is None else degree
+                degree_groups.setdefault(Polynomial(axes_range, grid_degree).degree, []).append(label)
+
+            fit_dict = {}
+            for group_degree, group_labels in degree_groups.items():
+                start = time.perf_counter()
+                polynomial = Polynomial(axes_range, group_degree)
+                coeffs, residual = polynomial.solve(np.stack([self[label].data for label in group_labels], axis=-1))
+                batch_time = time.perf_counter() - start
+
+                for i, label in enumerate(group_labels):
+                    info = {'rms': float(np.sqrt(np.mean(residual[:, i] ** 2))),
+                            'max_residual': float(np.max(np.abs(residual[:, i]))), 'batch_time': batch_time}
+                    fit_dict[label] = self[label].approx.reg.update_poly(coeffs[i], info)
+
+            return {label: fit_dict[label] for label in label_list}
+
+        # Common mesh and the fitting inputs of each grid
+        mesh = np.meshgrid(*[grid_0.axes_range[axis] for axis in grid_0.axes], indexing='ij')
+        inputs = {label: self[label].approx.reg.fit_inputs(expression, p0) for label in label_list}
+        task_kwargs = dict(variable_names=grid_0.axes, max_iter=max_iter, tol=tol)
+
+        start = time.perf_counter()
+        n_jobs = min(parallel_jobs(n_jobs), len(label_list))
+        if n_jobs == 1:
+            results = [fit_eqn_task(self[label].data, *inputs[label], mesh=mesh, **task_kwargs)
+                       for label in label_list]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=init_fit_worker, initargs=(mesh,)) as pool:
+                futures = [pool.submit(fit_eqn_task, self[label].data, *inputs[label], **task_kwargs)
+                           for label in label_list]
+                results = [future.result() for future in futures]
+
+        # Update the grids
+        fit_dict = {}
+        for label, (coeffs, info) in zip(label_list, results):
+            fit_dict[label] = self[label].approx.reg.update_eqn(inputs[label][0], coeffs, info)
+
+        _logger.info(f'Fitted {len(label_list)} grids in {time.perf_counter() - start:.2f} s ({n_jobs} processes), '
+                     f'maximum residual rms {max(info["rms"] for info in fit_dict.values()):.3e}')
+
+        return fit_dict
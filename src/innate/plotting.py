@@ -244,9 +244,9 @@ class Plotter:
         idcmeshX, idcsmeshY = np.meshgrid(idcsX, idcsY)
 
         # Compute discrepancy
-        emis_mesh = np.column_stack((y_range[idcsY], x_range[idcsX]))
-        emis_interp = self._grid.approx.interp.rgi(emis_mesh).eval()
         emis_data = grid[idcsmeshY, idcmeshX]
+        emis_mesh = np.column_stack((y_range[idcsmeshY].ravel(), x_range[idcmeshX].ravel()))
+        emis_interp = self._grid.approx.interp.rgi.eval(emis_mesh).reshape(emis_data.shape)
         percentage_difference = np.abs(1 - emis_interp / emis_data) * 100
 
         # Display check for the user figures
@@ -1,21 +1,633 @@
+import ast
+import copy
+import functools
 import logging
 import re
+import time
 import numpy as np
 from .. import _setup_cfg
+from ..io import InnateError
 
 _logger = logging.getLogger('Innate')
 
+# NumPy functions with a different name in torch
+TORCH_ALIASES = {'power': 'pow', 'absolute': 'abs', 'clip': 'clamp', 'arcsin': 'asin', 'arccos': 'acos',
+                 'arctan': 'atan', 'arctan2': 'atan2', 'arcsinh': 'asinh', 'arccosh': 'acosh', 'arctanh': 'atanh'}
+
+
+class TensorNamespace:
+
+    """Namespace resolving the ``np.<function>`` calls of an expression to the functions of a tensor library."""
+
+    constants = ('pi', 'e', 'inf', 'nan')
+
+    def __init__(self, module, aliases=None):
+        self.module = module
+        self.aliases = {} if aliases is None else aliases
+
+    def __getattr__(self, name):
+
+        if name in self.constants:
+            return getattr(np, name)
+
+        function = getattr(self.module, self.aliases.get(name, name), None)
+        if function is None:
+            raise InnateError(f'The expression function "np.{name}" is not available in {self.module.__name__}')
+
+        return function
+
+
+def torch_library():
+
+    # Torch is imported on request
+    try:
+        import torch
+    except ImportError:
+        return None
+
+    return torch
+
+
+def expression_namespace(library):
+
+    # The tensor libraries are imported on request
+    match library:
+
+        case 'pytensor':
+            try:
+                import pytensor.tensor as tt
+            except ImportError:
+                raise InnateError(f'Need to install PyTensor to translate the expression into a PyTensor graph')
+            return TensorNamespace(tt)
+
+        case 'torch':
+            try:
+                import torch
+            except ImportError:
+                raise InnateError(f'Need to install PyTorch to translate the expression into a torch graph')
+            return TensorNamespace(torch, TORCH_ALIASES)
+
+        case 'numpy':
+            return np
+
+        case _:
+            raise InnateError(f'The tensor library "{library}" is not recognized, please use "pytensor", "torch" or '
+                              f'"numpy"')
+
+
+# Python builtins in the expressions and their element-wise NumPy functions
+BUILTIN_FUNCTIONS = {'abs': 'abs', 'min': 'minimum', 'max': 'maximum', 'round': 'round', 'pow': 'power'}
+
+
+def _elementwise_reduce(function):
+
+    # min(a, b, c) and max(a, b, c) as successive element-wise comparisons
+    def reduce(*args):
+        return functools.reduce(function, args)
+
+    return reduce
+
+
+def expression_globals(library='numpy'):
+
+    """Global names for the evaluation of an expression code: the ``np`` namespace and the builtin functions."""
+
+    namespace = expression_namespace(library)
+    names = {'np': namespace, '__builtins__': {}}
+    for name, function_name in BUILTIN_FUNCTIONS.items():
+        function = getattr(namespace, function_name)
+        names[name] = _elementwise_reduce(function) if name in ('min', 'max') else function
+
+    return names
+
+
+class IndexCoefficients(ast.NodeTransformer):
+
+    """AST transformer replacing the coefficients names in an expression by the items of the coefficients array."""
+
+    def __init__(self, coef_names, array_name='_coeffs'):
+        self.coef_idcs = {name: i for i, name in enumerate(coef_names)}
+        self.array_name = array_name
+
+    def visit_Name(self, node):
+        if node.id in self.coef_idcs:
+            return ast.copy_location(ast.Subscript(value=ast.Name(id=self.array_name, ctx=ast.Load()),
+                                                   slice=ast.Constant(self.coef_idcs[node.id]), ctx=ast.Load()), node)
+        return node
+
+
+def lambda_code(body, argument_names, label):
+
+    """Compile an expression node into the code of a lambda function with the input arguments."""
+
+    arguments = ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in argument_names],
+                              kwonlyargs=[], kw_defaults=[], defaults=[])
+    tree = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=arguments, body=body)))
+
+    return compile(tree, filename=f'<{label}>', mode='eval')
+
+
+def _constant(value):
+    return ast.Constant(value=value)
+
+
+def _is_constant(node, value):
+    return isinstance(node, ast.Constant) and node.value == value
+
+
+def _np_call(function, *args):
+    return ast.Call(func=ast.Attribute(value=ast.Name(id='np', ctx=ast.Load()), attr=function, ctx=ast.Load()),
+                    args=list(args), keywords=[])
+
+
+def _add(left, right):
+    if _is_constant(left, 0):
+        return right
+    if _is_constant(right, 0):
+        return left
+    return ast.BinOp(left=left, op=ast.Add(), right=right)
+
+
+def _sub(left, right):
+    if _is_constant(right, 0):
+        return left
+    if _is_constant(left, 0):
+        return ast.UnaryOp(op=ast.USub(), operand=right)
+    return ast.BinOp(left=left, op=ast.Sub(), right=right)
+
+
+def _mul(left, right):
+    if _is_constant(left, 0) or _is_constant(right, 0):
+        return _constant(0)
+    if _is_constant(left, 1):
+        return right
+    if _is_constant(right, 1):
+        return left
+    return ast.BinOp(left=left, op=ast.Mult(), right=right)
+
+
+def _div(left, right):
+    if _is_constant(left, 0):
+        return _constant(0)
+    if _is_constant(right, 1):
+        return left
+    return ast.BinOp(left=left, op=ast.Div(), right=right)
+
+
+def _pow(left, right):
+    return ast.BinOp(left=left, op=ast.Pow(), right=right)
+
+
+def _power_derivative(base, exponent, name):
+
+    d_base, d_exponent = derivative_tree(base, name), derivative_tree(exponent, name)
+
+    # Constant exponent: v * u**(v-1) * u'
+    if _is_constant(d_exponent, 0):
+        return _mul(_mul(exponent, _pow(base, _sub(exponent, _constant(1)))), d_base)
+
+    # General case: u**v * (v' * log(u) + v * u' / u)
+    return _mul(_pow(base, exponent), _add(_mul(d_exponent, _np_call('log', base)),
+                                           _div(_mul(exponent, d_base), base)))
+
+
+# Derivatives of the single argument NumPy functions as a function of the argument tree
+FUNCTION_DERIVATIVES = {'log': lambda x: _div(_constant(1), x),
+                        'log10': lambda x: _div(_constant(1), _mul(x, _constant(float(np.log(10))))),
+                        'log2': lambda x: _div(_constant(1), _mul(x, _constant(float(np.log(2))))),
+                        'exp': lambda x: _np_call('exp', x),
+                        'sqrt': lambda x: _div(_constant(0.5), _np_call('sqrt', x)),
+                        'sin': lambda x: _np_call('cos', x),
+                        'cos': lambda x: ast.UnaryOp(op=ast.USub(), operand=_np_call('sin', x)),
+                        'tan': lambda x: _div(_constant(1), _pow(_np_call('cos', x), _constant(2))),
+                        'sinh': lambda x: _np_call('cosh', x),
+                        'cosh': lambda x: _np_call('sinh', x),
+                        'tanh': lambda x: _sub(_constant(1), _pow(_np_call('tanh', x), _constant(2))),
+                        'arctan': lambda x: _div(_constant(1), _add(_constant(1), _pow(x, _constant(2)))),
+                        'abs': lambda x: _np_call('sign', x),
+                        'absolute': lambda x: _np_call('sign', x)}
+
+
+def derivative_tree(node, name):
+
+    """
+    Symbolic derivative of an expression syntax tree with respect to one of its names.
+
+    The derivative is built with the same nodes as the input expression: arithmetic operators, numerical constants and
+    the ``np`` functions in ``FUNCTION_DERIVATIVES`` (and the ``abs`` and ``pow`` builtins). The null and unit terms
+    are simplified, so the derivative with respect to a coefficient, which appears linearly in the expression, does not
+    include its name.
+
+    Parameters
+    ----------
+    node : ast.AST
+        The expression node.
+    name : str
+        The variable or coefficient name.
+
+    Returns
+    -------
+    ast.AST
+        The derivative expression node.
+
+    Raises
+    ------
+    InnateError
+        If the expression includes an operation without a derivative rule.
+
+    Examples
+    --------
+    >>> ast.unparse(derivative_tree(ast.parse('a * np.log10(x)', mode='eval').body, 'x'))
+    'a * (1 / (x * 2.302585092994046))'
+
+    """
+
+    match node:
+
+        case ast.Constant():
+            return _constant(0)
+
+        case ast.Name():
+            return _constant(1) if node.id == name else _constant(0)
+
+        case ast.UnaryOp(op=ast.USub()):
+            d_operand = derivative_tree(node.operand, name)
+            return d_operand if _is_constant(d_operand, 0) else ast.UnaryOp(op=ast.USub(), operand=d_operand)
+
+        case ast.UnaryOp(op=ast.UAdd()):
+            return derivative_tree(node.operand, name)
+
+        case ast.BinOp(op=ast.Add()):
+            return _add(derivative_tree(node.left, name), derivative_tree(node.right, name))
+
+        case ast.BinOp(op=ast.Sub()):
+            return _sub(derivative_tree(node.left, name), derivative_tree(node.right, name))
+
+        case ast.BinOp(op=ast.Mult()):
+            return _add(_mul(derivative_tree(node.left, name), node.right),
+                        _mul(node.left, derivative_tree(node.right, name)))
+
+        case ast.BinOp(op=ast.Div()):
+            d_left, d_right = derivative_tree(node.left, name), derivative_tree(node.right, name)
+            if _is_constant(d_right, 0):
+                return _div(d_left, node.right)
+            return _div(_sub(_mul(d_left, node.right), _mul(node.left, d_right)), _pow(node.right, _constant(2)))
+
+        case ast.BinOp(op=ast.Pow()):
+            return _power_derivative(node.left, node.right, name)
+
+        case ast.Call(func=ast.Attribute(value=ast.Name(id='np'), attr='power'), args=[base, exponent]):
+            return _power_derivative(base, exponent, name)
+
+        case ast.Call(func=ast.Attribute(value=ast.Name(id='np'), attr=function), args=[argument]) \
+                if function in FUNCTION_DERIVATIVES:
+            return _mul(FUNCTION_DERIVATIVES[function](argument), derivative_tree(argument, name))
+
+        case ast.Call(func=ast.Name(id='pow'), args=[base, exponent]):
+            return _power_derivative(base, exponent, name)
+
+        case ast.Call(func=ast.Name(id='abs'), args=[argument]):
+            return _mul(FUNCTION_DERIVATIVES['abs'](argument), derivative_tree(argument, name))
+
+        case _:
+            raise InnateError(f'The derivative of "{ast.unparse(node)}" is not available')
+
+
+class ExpressionCode:
+
+    """
+
+    Compiled functions of an expression, which are shared by all the equations with the same expression, variables
+    and coefficients names (see ``compile_expression``).
+
+    Parameters
+    ----------
+    expression : str
+        The normalized expression (see ``normalize_expression``).
+    variable_names : tuple of str
+        The names of the function variables, in the order of the function arguments.
+    coef_names : tuple of str
+        The coefficients names, in the order of the coefficients array.
+
+    Attributes
+    ----------
+    tree : ast.Expression
+        The expression syntax tree.
+    function : function
+        The NumPy function of the variables and the coefficients array, ``function(*variables, coeffs)``.
+    graph_code : code
+        The code of a function of the variables and the individual coefficients for the tensor graphs.
+    unknown_names : list of str
+        The expression names which are not variables, coefficients or functions. The evaluation of an expression with
+        unknown names raises an InnateError.
+
+    """
+
+    def __init__(self, expression, variable_names, coef_names):
+
+        self.expression = expression
+        self.variable_names = tuple(variable_names)
+        self.coef_names = tuple(coef_names)
+        self.tree = ast.parse(expression, mode='eval')
+
+        # The expression names are the variables, the coefficients, the np functions and the builtins
+        allowed = self.variable_names + self.coef_names + ('np',) + tuple(BUILTIN_FUNCTIONS)
+        self.unknown_names = sorted({node.id for node in ast.walk(self.tree) if isinstance(node, ast.Name)}
+                                    - set(allowed))
+
+        # NumPy function with the coefficients as the items of an array argument
+        body = IndexCoefficients(self.coef_names).visit(copy.deepcopy(self.tree.body))
+        self.function = eval(lambda_code(body, self.variable_names + ('_coeffs',), f'eqn: {expression}'),
+                             expression_globals('numpy'))
+        if self.unknown_names:
+            self.function = self._unknown_names_function
+
+        # Function of the variables and the coefficients for the tensor graphs
+        self.graph_code = lambda_code(self.tree.body, self.variable_names + self.coef_names, f'eqn: {expression}')
+        self._graph_functions = {}
+        self._jacobian_functions = None
+
+    def check_names(self):
+
+        """Raise an InnateError if the expression includes names which are not variables, coefficients or functions."""
+
+        if self.unknown_names:
+            raise InnateError(f'The names {self.unknown_names} in the expression "{self.expression}" are not '
+                              f'recognized. The allowed names are the variables {list(self.variable_names)}, the '
+                              f'coefficients {list(self.coef_names)}, the "np.<function>" calls and the '
+                              f'{list(BUILTIN_FUNCTIONS)} functions')
+
+    def _unknown_names_function(self, *args):
+        self.check_names()
+
+    def graph_function(self, library):
+
+        """Function of the variables and the coefficients with the ``np`` calls resolved to a tensor library."""
+
+        self.check_names()
+        function = self._graph_functions.get(library)
+        if function is None:
+            function = eval(self.graph_code, expression_globals(library))
+            self._graph_functions[library] = function
+
+        return function
+
+    def jacobian_functions(self):
+
+        """NumPy functions of the expression derivatives with respect to the coefficients, or None if unavailable."""
+
+        self.check_names()
+        if self._jacobian_functions is None:
+            try:
+                functions = []
+                for name in self.coef_names:
+                    code = lambda_code(derivative_tree(self.tree.body, name), self.variable_names + self.coef_names,
+                                       f'd({self.expression})/d{name}')
+                    functions.append(eval(code, expression_globals('numpy')))
+
+            except InnateError as err:
+                _logger.info(f'{err}: using finite differences for the "{self.expression}" Jacobian')
+                functions = False
+
+            self._jacobian_functions = functions
+
+        return self._jacobian_functions if self._jacobian_functions is not False else None
+
+
+@functools.lru_cache(maxsize=None)
+def normalize_expression(expression):
+
+    """
+    Canonical form of an expression, which is independent of its spacing and redundant parentheses.
+
+    Examples
+    --------
+    >>> normalize_expression('a+b/(temp/10000.0)')
+    'a + b / (temp / 10000.0)'
+
+    """
+
+    return ast.unparse(ast.parse(expression.strip(), mode='eval'))
+
+
+@functools.lru_cache(maxsize=None)
+def compile_expression(expression, variable_names, coef_names):
+
+    """
+    Process-wide cache of the compiled expressions.
+
+    The grids with the same parametrisation, which only differ in the coefficients values, share the same compiled
+    functions, hence each distinct expression is parsed and compiled only once.
+
+    Parameters
+    ----------
+    expression : str
+        The normalized expression (see ``normalize_expression``).
+    variable_names : tuple of str
+        The names of the function variables.
+    coef_names : tuple of str
+        The coefficients names.
+
+    Returns
+    -------
+    ExpressionCode
+        The compiled expression functions.
+
+    """
+
+    return ExpressionCode(expression, variable_names, coef_names)
+
+
+class CompiledEquation:
+
+    """
+
+    Vectorized function of a string expression and its coefficients.
+
+    The expression syntax tree is compiled into a NumPy function of the ``variable_names`` and an array with the
+    coefficients values. The compiled functions are cached by the normalized expression, the variables and the
+    coefficients names (see ``compile_expression``), so the equations with the same expression only differ in their
+    coefficients array. The evaluation of the input arrays is a single vectorized call, which returns a float array
+    with the broadcasted shape of the inputs.
+
+    The same syntax tree is translated into PyTensor or torch graphs with the ``graph`` method, where the ``np``
+    functions are resolved to the tensor library. The coefficients are constants or, optionally, free variables of
+    the graph, hence the expression can be used inside PyMC models or differentiated with respect to its variables
+    and coefficients.
+
+    Parameters
+    ----------
+    expression : str
+        The equation expression, for example, ``'a + b / (temp/10000.0) + c * np.log10(den/10000)'``.
+    coefficients : dict
+        The coefficients names and values.
+    variable_names : list of str
+        The names of the function variables, in the order of the function arguments.
+
+    Examples
+    --------
+    >>> eqn = CompiledEquation('a + b * x', {'a': 1, 'b': 2}, ['x'])
+    >>> eqn(np.array([1.0, 2.0]))
+    array([3., 5.])
+    >>> x = pytensor.tensor.vector('x')
+    >>> eqn.graph(x, library='pytensor')
+
+    """
+
+    def __init__(self, expression, coefficients, variable_names):
+
+        self.expression = expression
+        self.coefficients = dict(coefficients)
+        self.variable_names = list(variable_names)
+        self.coef_names = list(self.coefficients.keys())
+        self.coef_array = np.array([float(value) for value in self.coefficients.values()])
+
+        # Compiled functions shared with the equations of the same expression
+        self.code = compile_expression(normalize_expression(expression), tuple(self.variable_names),
+                                       tuple(self.coef_names))
+
+    def __call__(self, *variable_values):
+
+        arrays = [np.asarray(values, dtype=float) for values in variable_values]
+        result = np.asarray(self.code.function(*arrays, self.coef_array), dtype=float)
+
+        # Expressions independent of some variables are broadcasted to the inputs shape
+        shape = np.broadcast_shapes(*[array.shape for array in arrays], result.shape)
+        if result.shape != shape:
+            result = np.broadcast_to(result, shape).copy()
+
+        return result[()]
+
+    def graph(self, *variables, coefficients=None, library='pytensor'):
+
+        """
+        Translate the expression into a PyTensor or torch graph.
+
+        Parameters
+        ----------
+        *variables : tensors
+            The tensors for the ``variable_names``, in the same order.
+        coefficients : dict, optional
+            Tensors (or values) for some or all the coefficients, for example, free variables of a PyMC model. The
+            remaining coefficients are constants with their configuration values. Default is None.
+        library : str, optional
+            The tensor library: 'pytensor' or 'torch'. Default is 'pytensor'.
+
+        Returns
+        -------
+        graph : tensor
+            The expression graph.
+
+        Examples
+        --------
+        >>> temp, den, a = pytensor.tensor.vector('temp'), pytensor.tensor.vector('den'), pytensor.tensor.scalar('a')
+        >>> emis = grid.approx.reg.eqn.graph(temp, den, coefficients={'a': a})
+        >>> emis_grad = pytensor.grad(emis.sum(), [temp, a])
+
+        """
+
+        if len(variables) != len(self.variable_names):
+            raise InnateError(f'The expression requires {len(self.variable_names)} variables '
+                              f'({", ".join(self.variable_names)}) but {len(variables)} were provided')
+
+        coefficients = self.coefficients if coefficients is None else {**self.coefficients, **coefficients}
+        unknown = set(coefficients) - set(self.coef_names)
+        if len(unknown) > 0:
+            raise InnateError(f'The coefficients {sorted(unknown)} are not in the expression "{self.expression}"')
+
+        function = self.code.graph_function(library)
+
+        # Torch functions require tensor inputs
+        if library == 'torch':
+            import torch
+            variables = [v if torch.is_tensor(v) else torch.as_tensor(np.asarray(v, dtype=float)) for v in variables]
+
+        return function(*variables, *[coefficients[name] for name in self.coef_names])
+
+    def jacobian(self, *variable_values, coefficients=None, finite_differences=False):
+
+        """
+        Evaluate the derivatives of the expression with respect to its coefficients.
+
+        The derivatives are computed from the analytic differentiation of the expression syntax tree (see
+        ``derivative_tree``) and compiled into NumPy functions on the first call. If the expression includes an
+        operation without a derivative rule, the Jacobian is approximated by central finite differences.
+
+        Parameters
+        ----------
+        *variable_values : array-like
+            The values for the ``variable_names``, in the same order.
+        coefficients : dict, optional
+            Values for some or all the coefficients. The remaining coefficients use their current values.
+            Default is None.
+        finite_differences : bool, optional
+            Approximate the derivatives by central finite differences. Default is False.
+
+        Returns
+        -------
+        numpy.ndarray
+            The derivatives array with the broadcasted shape of the inputs and a trailing axis with the
+            ``coef_names`` order.
+
+        Examples
+        --------
+        >>> eqn = CompiledEquation('a + b * x', {'a': 1, 'b': 2}, ['x'])
+        >>> eqn.jacobian(np.array([1.0, 2.0]))
+        array([[1., 1.],
+               [1., 2.]])
+
+        """
+
+        arrays = [np.asarray(values, dtype=float) for values in variable_values]
+        coefficients = self.coefficients if coefficients is None else {**self.coefficients, **coefficients}
+        coef_values = [float(coefficients[name]) for name in self.coef_names]
+        shape = np.broadcast_shapes(*[array.shape for array in arrays])
+        functions = None if finite_differences else self.code.jacobian_functions()
+
+        # Analytic derivatives
+        if functions is not None:
+            columns = [np.asarray(function(*arrays, *coef_values), dtype=float) for function in functions]
+
+        # Finite differences
+        else:
+            columns = []
+            for i, value in enumerate(coef_values):
+                step = np.sqrt(np.finfo(float).eps) * max(abs(value), 1.0)
+                upper, lower = np.array(coef_values), np.array(coef_values)
+                upper[i], lower[i] = value + step, value - step
+                columns.append((np.asarray(self.code.function(*arrays, upper)) -
+                                np.asarray(self.code.function(*arrays, lower))) / (2 * step))
+
+        shape = np.broadcast_shapes(shape, *[column.shape for column in columns])
+
+        return np.stack([np.broadcast_to(column, shape) for column in columns], axis=-1)
+
+    def __repr__(self):
+        return f'CompiledEquation({self.expression!r}, variables={self.variable_names})'
+
 
 def generate_specific_function(expression, coefficients, variable_names):
-    # Define the function to only vary with specified variables
-    def specific_function(*variable_values):
-        local_vars = coefficients.copy()  # Copy the dictionary of fixed variables
-        # Update variable names with values dynamically from the input
-        local_vars.update(dict(zip(variable_names, variable_values)))
-        local_vars['np'] = np  # Ensure np is available for np.log10 and other operations
-        return eval(expression, {}, local_vars)
-    # The number of inputs is now the number of variable names provided
-    return np.frompyfunc(specific_function, len(variable_names), 1)
+
+    """
+    Compile an expression into a vectorized function of the variables and its coefficients.
+
+    Parameters
+    ----------
+    expression : str
+        The equation expression.
+    coefficients : dict
+        The coefficients names and values.
+    variable_names : list of str
+        The names of the function variables, in the order of the function arguments.
+
+    Returns
+    -------
+    eqn : CompiledEquation
+        The function returning the expression float array for the input variables arrays.
+
+    """
+
+    return CompiledEquation(expression, coefficients, variable_names)
 
 
 def extract_coef_names(expression):
@@ -63,8 +675,8 @@ def parse_string_equation(data_label, str_eqn, coeffs_eqn, variable_names):
 
     Returns
     -------
-    eqn : function or None
-        The generated specific function based on the equation and coefficients. Returns None if
+    eqn : CompiledEquation or None
+        The vectorized function based on the equation and coefficients. Returns None if
         the equation or coefficients are missing.
     coeffs_dict : dict or None
         A dictionary of coefficients extracted from `coeffs_eqn`. Returns None if the equation or
@@ -79,7 +691,7 @@ def parse_string_equation(data_label, str_eqn, coeffs_eqn, variable_names):
     --------
     >>> eqn, coeffs_dict = parse_string_equation("example_data", "a*x + b", {"a": 1, "b": 2}, ["x"])
     >>> print(eqn)
-    <function ...>
+    CompiledEquation('a*x + b', variables=['x'])
     >>> print(coeffs_dict)
     {'a': 1, 'b': 2}
 
@@ -103,13 +715,514 @@ def parse_string_equation(data_label, str_eqn, coeffs_eqn, variable_names):
     return eqn, coeffs_dict
 
 
+def fit_coefficients(eqn, variable_values, data, p0=None, max_iter=100, tol=1e-10):
+
+    """
+    Fit the coefficients of a compiled expression to a data set by least squares.
+
+    If the expression is linear in the coefficients (its Jacobian does not depend on them) the solution is a single
+    linear least-squares solve. Otherwise, the coefficients are optimized with the Levenberg-Marquardt algorithm using
+    the analytic Jacobian of the expression (see ``CompiledEquation.jacobian``). The non-finite data entries are
+    excluded from the fit.
+
+    Parameters
+    ----------
+    eqn : CompiledEquation
+        The expression to fit.
+    variable_values : list of array-like
+        The values for the expression ``variable_names``, which are broadcasted to the data shape.
+    data : array-like
+        The data values.
+    p0 : array-like, optional
+        Initial coefficients values in the ``coef_names`` order. Default is the expression coefficients.
+    max_iter : int, optional
+        Maximum number of Levenberg-Marquardt iterations. Default is 100.
+    tol : float, optional
+        Relative tolerance in the coefficients and the residual sum of squares to stop the iterations. Default is
+        1e-10.
+
+    Returns
+    -------
+    coeffs : numpy.ndarray
+        The fitted coefficients in the ``coef_names`` order.
+    info : dict
+        Fit summary with the residual root mean square (``rms``), the maximum absolute residual (``max_residual``),
+        the number of iterations (``n_iter``), the ``linear`` fast path flag, the ``converged`` flag and the
+        ``stalled`` flag, which is True if the iterations stopped because no step reduced the residuals.
+
+    Examples
+    --------
+    >>> eqn = CompiledEquation('a + b * np.log10(x)', {'a': 1.0, 'b': 1.0}, ['x'])
+    >>> coeffs, info = fit_coefficients(eqn, [x_array], y_array)
+
+    """
+
+    # Flat arrays with the valid entries
+    data = np.asarray(data, dtype=float)
+    arrays = [np.broadcast_to(np.asarray(values, dtype=float), data.shape) for values in variable_values]
+    mask = np.isfinite(data)
+    data, arrays = data[mask], [array[mask] for array in arrays]
+
+    names = eqn.coef_names
+    p = np.array([eqn.coefficients[name] for name in names] if p0 is None else p0, dtype=float)
+    if p.size != len(names):
+        raise InnateError(f'The expression "{eqn.expression}" has {len(names)} coefficients ({", ".join(names)}) but '
+                          f'{p.size} initial values were provided')
+
+    model = lambda coeffs: np.broadcast_to(np.asarray(eqn.code.function(*arrays, coeffs), dtype=float), data.shape)
+    jacobian = lambda coeffs: eqn.jacobian(*arrays, coefficients=dict(zip(names, coeffs)))
+
+    # Linear fast path: the Jacobian is the same for two sets of coefficients
+    jac = jacobian(p)
+    linear = np.all(np.isfinite(jac)) and np.array_equal(jac, jacobian(0.5 * p + 1.0))
+    if linear:
+        p = np.linalg.lstsq(jac, data - model(p) + jac @ p, rcond=None)[0]
+        n_iter, converged, stalled = 1, True, False
+
+    # Levenberg-Marquardt
+    else:
+        residual = data - model(p)
+        cost, damping = residual @ residual, 1e-3
+        n_iter, converged, stalled = 0, False, False
+
+        while n_iter < max_iter and not (converged or stalled):
+            n_iter += 1
+            jac = jacobian(p)
+            hessian, gradient = jac.T @ jac, jac.T @ residual
+            scale = np.diag(hessian) + np.finfo(float).tiny
+
+            # Increase the damping until the step reduces the residuals
+            while damping < 1e16:
+                step = np.linalg.lstsq(hessian + damping * np.diag(scale), gradient, rcond=None)[0]
+                p_new = p + step
+                residual_new = data - model(p_new)
+                cost_new = residual_new @ residual_new
+
+                if np.isfinite(cost_new) and cost_new <= cost:
+                    converged = (np.all(np.abs(step) <= tol * (np.abs(p) + tol))) or (cost - cost_new <= tol * cost)
+                    p, residual, cost = p_new, residual_new, cost_new
+                    damping = max(damping / 10, 1e-12)
+                    break
+
+                damping *= 10
+
+            # No step reduces the residuals
+            else:
+                stalled = True
+
+    residual = data - model(p)
+    info = {'rms': float(np.sqrt(np.mean(residual ** 2))), 'max_residual': float(np.max(np.abs(residual))),
+            'n_iter': n_iter, 'linear': bool(linear), 'converged': bool(converged), 'stalled': stalled}
+
+    return p, info
+
+
+def scale_axis(values, x_0, x_f):
+    return (2 * np.asarray(values, dtype=float) - (x_0 + x_f)) / (x_f - x_0)
+
+
+@functools.lru_cache(maxsize=8)
+def polynomial_design_matrix(axes_nodes, degree):
+
+    """
+    Design matrix of a multivariate polynomial at the nodes of a regular grid.
+
+    The matrix is the Kronecker product of the Vandermonde matrices of each axis, where the axes are scaled to
+    [-1, 1], hence its rows follow the C-order of the grid nodes and its columns the C-order of the coefficient tensor.
+    The matrices are cached, so the grids with the same axes share the same design matrix.
+
+    Parameters
+    ----------
+    axes_nodes : tuple of tuple of float
+        The nodes of each axis.
+    degree : tuple of int
+        The polynomial degree of each axis.
+
+    Returns
+    -------
+    numpy.ndarray
+        The ``(n_nodes, n_coeffs)`` design matrix.
+
+    """
+
+    vander_list = [np.polynomial.polynomial.polyvander(scale_axis(nodes, np.min(nodes), np.max(nodes)), deg)
+                   for nodes, deg in zip(axes_nodes, degree)]
+
+    return functools.reduce(np.kron, vander_list)
+
+
+class Polynomial:
+
+    """
+
+    Multivariate polynomial regression of a regular grid.
+
+    The polynomial is stored as a coefficient tensor with ``degree + 1`` entries per axis, where ``coeffs[i, j, ...]``
+    multiplies ``x_0**i * x_1**j ...``. The variables are scaled to [-1, 1] with the grid axes limits to improve the
+    conditioning of the fit. The evaluation is a nested Horner's scheme, vectorized over the points, which starts
+    from the last axis.
+
+    The coefficients are fitted by least squares at the grid nodes, where the design matrix is cached (see
+    ``polynomial_design_matrix``). Several grids with the same axes are fitted in a single ``lstsq`` call with the
+    ``solve`` method.
+
+    Parameters
+    ----------
+    axes_range : list of array-like
+        The nodes of each grid axis.
+    degree : int or list of int, optional
+        The polynomial degree for all the axes or for each axis. Default is 3.
+    coeffs : array-like, optional
+        The coefficient tensor, whose shape defines the degree. Default is None.
+
+    Examples
+    --------
+    >>> poly = Polynomial([temp_range, den_range], degree=(3, 2))
+    >>> poly.fit(emis_grid)
+    >>> poly(12250, 122)
+
+    """
+
+    def __init__(self, axes_range, degree=3, coeffs=None):
+
+        self.axes_nodes = tuple(tuple(float(value) for value in np.ravel(axis)) for axis in axes_range)
+        self.ndim = len(self.axes_nodes)
+        self.x_0 = np.array([min(nodes) for nodes in self.axes_nodes])
+        self.x_f = np.array([max(nodes) for nodes in self.axes_nodes])
+        self.coeffs = None
+
+        if coeffs is not None:
+            self.coeffs = np.asarray(coeffs, dtype=float)
+            if self.coeffs.ndim != self.ndim:
+                raise InnateError(f'The polynomial coefficients tensor has {self.coeffs.ndim} dimensions but the grid '
+                                  f'has {self.ndim} axes')
+            self.degree = tuple(size - 1 for size in self.coeffs.shape)
+
+        else:
+            self.degree = tuple(int(deg) for deg in np.broadcast_to(np.asarray(degree, dtype=int), (self.ndim,)))
+
+    @property
+    def design_matrix(self):
+        return polynomial_design_matrix(self.axes_nodes, self.degree)
+
+    def solve(self, data):
+
+        """
+        Fit the polynomial coefficients to one or several grids with the same axes.
+
+        Parameters
+        ----------
+        data : array-like
+            The grids data, with the axes shape and an optional trailing axis for several grids. The nodes with
+            non-finite data in any grid are excluded.
+
+        Returns
+        -------
+        coeffs : numpy.ndarray
+            The coefficient tensors, with a leading axis for the grids if the data has a trailing axis.
+        residual : numpy.ndarray
+            The ``(n_nodes, n_grids)`` residuals at the grid nodes.
+
+        """
+
+        data = np.asarray(data, dtype=float)
+        shape = tuple(len(nodes) for nodes in self.axes_nodes)
+        if data.shape[:self.ndim] != shape:
+            raise InnateError(f'The data shape {data.shape} is different from the polynomial axes shape {shape}')
+
+        y = data.reshape(np.prod(shape), -1)
+        mask = np.all(np.isfinite(y), axis=1)
+        design = self.design_matrix
+        solution = np.linalg.lstsq(design[mask], y[mask], rcond=None)[0]
+
+        coeffs = solution.T.reshape((-1,) + tuple(deg + 1 for deg in self.degree))
+        residual = y[mask] - design[mask] @ solution
+
+        return (coeffs if data.ndim > self.ndim else coeffs[0]), residual
+
+    def fit(self, data):
+
+        """Fit the polynomial coefficients to the grid data and return the coefficient tensor."""
+
+        self.coeffs = self.solve(data)[0]
+
+        return self.coeffs
+
+    def __call__(self, *variable_values):
+
+        if self.coeffs is None:
+            raise InnateError(f'The polynomial coefficients have not been fitted')
+
+        if len(variable_values) != self.ndim:
+            raise InnateError(f'The polynomial has {self.ndim} variables but {len(variable_values)} input arrays were '
+                              f'provided')
+
+        arrays = [scale_axis(values, self.x_0[i], self.x_f[i]) for i, values in enumerate(variable_values)]
+        shape = np.broadcast_shapes(*[array.shape for array in arrays])
+        arrays = [np.broadcast_to(array, shape).ravel() for array in arrays]
+
+        # Horner's scheme from the last axis with a trailing dimension for the points
+        result = self.coeffs[..., None]
+        for axis in range(self.ndim - 1, -1, -1):
+            value = np.broadcast_to(result[..., -1, :], result.shape[:-2] + (arrays[axis].size,)).copy()
+            for k in range(self.degree[axis] - 1, -1, -1):
+                value *= arrays[axis]
+                value += result[..., k, :]
+            result = value
+
+        return np.broadcast_to(result, (int(np.prod(shape)),)).reshape(shape)[()]
+
+    def __repr__(self):
+        return f'Polynomial(degree={self.degree})'
+
+
+class SirenNetwork:
+
+    """
+
+    Inference of a SIREN neural network regression of a grid.
+
+    The network follows the ``innate.torch.siren.SirenNet`` design: each hidden layer output is
+    ``sin(w0 * (x @ W.T + b))``, with ``w0_initial`` for the first layer, and the last layer is linear. The
+    parameters are a ``SirenNet`` state dictionary (``layers.{i}.weight``, ``layers.{i}.bias``, ``last_layer.weight``
+    and ``last_layer.bias``) with numerical arrays. The optional ``input_offset``, ``input_scale``, ``output_offset``
+    and ``output_scale`` entries normalize the coordinates and the network output, ``y = y_net * output_scale +
+    output_offset`` for ``x_net = (x - input_offset) / input_scale``.
+
+    The coordinates are evaluated in batches with torch, if it is installed, or with a NumPy forward pass otherwise.
+
+    Parameters
+    ----------
+    state : dict
+        The network parameters by name.
+    w0 : float, optional
+        The sine frequency of the hidden layers. Default is the ``w0`` entry of the parameters or 1.
+    w0_initial : float, optional
+        The sine frequency of the first layer. Default is the ``w0_initial`` entry of the parameters or 30.
+    library : str, optional
+        The inference library: 'torch', 'numpy' or 'auto' for torch if it is installed. Default is 'auto'.
+    batch_size : int, optional
+        Number of coordinates per forward pass. Default is 8192.
+
+    Examples
+    --------
+    >>> nn = SirenNetwork.from_torch(model)
+    >>> nn(12250, 122)
+    >>> nn.eval(np.column_stack((temp_array, den_array)))
+
+    """
+
+    def __init__(self, state, w0=None, w0_initial=None, library='auto', batch_size=8192):
+
+        self.w0 = float(state.get('w0', 1.0) if w0 is None else w0)
+        self.w0_initial = float(state.get('w0_initial', 30.0) if w0_initial is None else w0_initial)
+        self.batch_size = int(batch_size)
+
+        # Hidden layers in order and the last layer
+        n_layers = len([key for key in state if key.startswith('layers.') and key.endswith('.weight')])
+        if (n_layers == 0) or ('last_layer.weight' not in state):
+            raise InnateError(f'The network parameters do not include the SirenNet "layers.{{i}}.weight" and '
+                              f'"last_layer.weight" entries')
+
+        layer_names = [f'layers.{i}' for i in range(n_layers)] + ['last_layer']
+        self.weights = [np.asarray(state[f'{name}.weight']) for name in layer_names]
+        self.biases = [None if state.get(f'{name}.bias') is None else np.asarray(state[f'{name}.bias'])
+                       for name in layer_names]
+        self.frequencies = [self.w0_initial] + [self.w0] * (n_layers - 1)
+
+        self.dim_in, self.dim_out = self.weights[0].shape[1], self.weights[-1].shape[0]
+        self.dtype = np.result_type(*self.weights)
+
+        # Normalization
+        self.input_offset = np.asarray(state.get('input_offset', 0.0), dtype=self.dtype)
+        self.input_scale = np.asarray(state.get('input_scale', 1.0), dtype=self.dtype)
+        self.output_offset = np.asarray(state.get('output_offset', 0.0), dtype=self.dtype)
+        self.output_scale = np.asarray(state.get('output_scale', 1.0), dtype=self.dtype)
+
+        # Inference library
+        self.library = library
+        self._torch_params = None
+        if library == 'auto':
+            self.library = 'torch' if torch_library() is not None else 'numpy'
+        elif library == 'torch' and torch_library() is None:
+            raise InnateError(f'Need to install PyTorch to evaluate the neural network with torch')
+        elif library not in ('torch', 'numpy'):
+            raise InnateError(f'The inference library "{library}" is not recognized, please use "torch", "numpy" or '
+                              f'"auto"')
+
+    @classmethod
+    def from_torch(cls, model, **kwargs):
+
+        """Create the network from a trained ``SirenNet`` model."""
+
+        state = {key: value.detach().cpu().numpy() for key, value in model.state_dict().items()}
+        w0_initial = model.layers[0].activation.w0
+        w0 = model.layers[1].activation.w0 if len(model.layers) > 1 else 1.0
+
+        return cls(state, w0=kwargs.pop('w0', w0), w0_initial=kwargs.pop('w0_initial', w0_initial), **kwargs)
+
+    @property
+    def state(self):
+
+        """The network parameters as a ``SirenNet`` state dictionary with the normalization and frequency entries."""
+
+        layer_names = [f'layers.{i}' for i in range(len(self.weights) - 1)] + ['last_layer']
+        state = {}
+        for name, weight, bias in zip(layer_names, self.weights, self.biases):
+            state[f'{name}.weight'] = weight
+            if bias is not None:
+                state[f'{name}.bias'] = bias
+
+        state.update(input_offset=self.input_offset, input_scale=self.input_scale,
+                     output_offset=self.output_offset, output_scale=self.output_scale,
+                     w0=self.w0, w0_initial=self.w0_initial)
+
+        return state
+
+    def _forward_numpy(self, x):
+
+        for weight, bias, w0 in zip(self.weights[:-1], self.biases[:-1], self.frequencies):
+            x = x @ weight.T
+            if bias is not None:
+                x += bias
+            x *= w0
+            np.sin(x, out=x)
+
+        x = x @ self.weights[-1].T
+        if self.biases[-1] is not None:
+            x += self.biases[-1]
+
+        return x
+
+    def _forward_torch(self, x):
+
+        torch = torch_library()
+        if self._torch_params is None:
+            self._torch_params = [(torch.from_numpy(weight), None if bias is None else torch.from_numpy(bias))
+                                  for weight, bias in zip(self.weights, self.biases)]
+
+        with torch.no_grad():
+            x = torch.from_numpy(x)
+            for (weight, bias), w0 in zip(self._torch_params[:-1], self.frequencies):
+                x = torch.sin(w0 * torch.nn.functional.linear(x, weight, bias))
+            x = torch.nn.functional.linear(x, *self._torch_params[-1])
+
+        return x.numpy()
+
+    def eval(self, coords):
+
+        """
+        Evaluate the network at the input coordinates.
+
+        Parameters
+        ----------
+        coords : array-like
+            The ``(n_points, dim_in)`` coordinates.
+
+        Returns
+        -------
+        numpy.ndarray
+            The ``(n_points, dim_out)`` network output.
+
+        """
+
+        coords = np.atleast_2d(np.asarray(coords, dtype=self.dtype))
+        if coords.shape[-1] != self.dim_in:
+            raise InnateError(f'The network requires {self.dim_in} coordinates but the input has {coords.shape[-1]}')
+
+        forward = self._forward_torch if self.library == 'torch' else self._forward_numpy
+        output = np.empty((coords.shape[0], self.dim_out), dtype=self.dtype)
+        for i in range(0, coords.shape[0], self.batch_size):
+            x = (coords[i:i + self.batch_size] - self.input_offset) / self.input_scale
+            output[i:i + self.batch_size] = forward(np.ascontiguousarray(x, dtype=self.dtype))
+
+        output *= self.output_scale
+        output += self.output_offset
+
+        return output
+
+    def __call__(self, *variable_values):
+
+        arrays = [np.asarray(values, dtype=self.dtype) for values in variable_values]
+        shape = np.broadcast_shapes(*[array.shape for array in arrays])
+        output = self.eval(np.column_stack([np.broadcast_to(array, shape).ravel() for array in arrays]))
+
+        return output.reshape(shape if self.dim_out == 1 else shape + (self.dim_out,))[()]
+
+    def __repr__(self):
+        return (f'SirenNetwork(dim_in={self.dim_in}, dim_hidden={self.weights[0].shape[0]}, dim_out={self.dim_out}, '
+                f'num_layers={len(self.weights) - 1}, library={self.library!r})')
+
+
+# Grid axes mesh shared by the fitting processes
+_worker_mesh = None
+
+
+def init_fit_worker(mesh):
+
+    """Store the common axes mesh in a fitting process (see ``fit_eqn_task``)."""
+
+    global _worker_mesh
+    _worker_mesh = mesh
+
+    return
+
+
+def fit_eqn_task(data, expression, coefficients, variable_names, max_iter=100, tol=1e-10, mesh=None):
+
+    """
+    Fit the coefficients of an expression to one grid data array.
+
+    This is the task for the batch fitting of several grids in a process pool, where the axes mesh is shared via
+    ``init_fit_worker`` and only the grid data is sent to the processes.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        The grid data.
+    expression : str
+        The parametrisation expression.
+    coefficients : dict
+        The initial coefficients values.
+    variable_names : list of str
+        The expression variables, that is, the grid axes.
+    max_iter : int, optional
+        Maximum number of Levenberg-Marquardt iterations. Default is 100.
+    tol : float, optional
+        Relative tolerance to stop the iterations. Default is 1e-10.
+    mesh : list of numpy.ndarray, optional
+        The axes mesh. Default is the mesh of the process.
+
+    Returns
+    -------
+    coeffs : numpy.ndarray
+        The fitted coefficients.
+    info : dict
+        The ``fit_coefficients`` summary with the fitting ``time`` in seconds.
+
+    """
+
+    start = time.perf_counter()
+    eqn = generate_specific_function(expression, coefficients, variable_names)
+    coeffs, info = fit_coefficients(eqn, _worker_mesh if mesh is None else mesh, data, max_iter=max_iter, tol=tol)
+    info['time'] = time.perf_counter() - start
+
+    return coeffs, info
+
+
 class Regressor:
 
     def __init__(self, grid, technique_list, data_cfg=None):
 
+        data_cfg = {} if data_cfg is None else data_cfg
+
         self.eqn = None
         self.coeffs = None
         self.techniques = []
+        self._grid = grid
+        self._poly = None
+        self._nn = None
+        self._nn_args = None
 
         # Constrain to regresion techniques
         algorithms = list(set(_setup_cfg['parameter_labels']['reg'].keys()) & set(technique_list))
@@ -124,8 +1237,188 @@ class Regressor:
                                                           data_cfg.get('eqn_coeffs', None),
                                                           data_cfg.get('axes', None))
 
+        # Polynomial regression (coefficients from the configuration or fitted on the first access)
+        if 'poly' in algorithms:
+            self.techniques.append('poly')
+            self._poly = Polynomial(list(grid.axes_range.values()), data_cfg.get('poly_degree', 3),
+                                    coeffs=data_cfg.get('poly_coeffs'))
+
+        # Neural network regression from the network parameters in the configuration
+        if 'nn' in algorithms:
+            state = data_cfg.get('nn_coeffs')
+            if state is not None:
+                self.techniques.append('nn')
+                self._nn_args = (state, data_cfg.get('nn_w0'), data_cfg.get('nn_w0_initial'))
+            else:
+                _logger.warning(f'Data set "{grid.label}" is missing:\nNeural network parameters ("nn_coeffs" key in '
+                                f'dataset configuration).')
+
         return
 
+    @property
+    def nn(self):
+
+        """The neural network regression, which is created (and its parameters read) on the first access."""
+
+        if (self._nn is None) and (self._nn_args is not None):
+            state, w0, w0_initial = self._nn_args
+            self._nn = SirenNetwork(state, w0=w0, w0_initial=w0_initial)
+
+        return self._nn
+
+    @nn.setter
+    def nn(self, network):
+        self._nn = network
+        if (network is not None) and ('nn' not in self.techniques):
+            self.techniques.append('nn')
+
+    @property
+    def poly(self):
+
+        """The polynomial regression, whose coefficients are fitted on the first access if they are not available."""
+
+        if (self._poly is not None) and (self._poly.coeffs is None):
+            self._poly.fit(self._grid.data)
+
+        return self._poly
+
+    @poly.setter
+    def poly(self, polynomial):
+        self._poly = polynomial
+
+    def fit(self, expression=None, p0=None, max_iter=100, tol=1e-10):
+
+        """
+        Fit the coefficients of a parametrisation to the grid data.
+
+        The expression variables are the grid axes, which are evaluated at all the grid nodes in a single vectorized
+        call (see ``fit_coefficients``). The expression and the fitted coefficients are stored in the grid
+        configuration ``eqn`` and ``eqn_coeffs`` entries, which can be saved with ``save_dataset``, and the ``eqn``
+        regression technique is updated.
+
+        Parameters
+        ----------
+        expression : str, optional
+            The parametrisation with the grid axes as variables and single letter coefficients, for example,
+            ``'a + b / (temp/10000.0) + c * np.log10(den/10000)'``. Default is the current ``eqn`` expression.
+        p0 : array-like, optional
+            Initial coefficients values in alphabetical order. Default is the current coefficients for the same
+            expression or ones otherwise.
+        max_iter : int, optional
+            Maximum number of Levenberg-Marquardt iterations for expressions which are not linear in the
+            coefficients. Default is 100.
+        tol : float, optional
+            Relative tolerance to stop the iterations. Default is 1e-10.
+
+        Returns
+        -------
+        info : dict
+            Fit summary with the ``coeffs`` dictionary, the residual root mean square (``rms``), the maximum absolute
+            residual (``max_residual``), the number of iterations (``n_iter``) and the ``linear``, ``converged`` and
+            ``stalled`` flags.
+
+        Examples
+        --------
+        >>> emissivities = DataSet.from_file('emissivity_grids.nc')
+        >>> grid = emissivities['O3_5007A']
+        >>> info = grid.approx.reg.fit('a + b / (temp/10000.0) + c * np.log10(den/10000)')
+        >>> save_dataset('new_grids.nc', {'O3_5007A': grid.data}, common_cfg,
+        ...              {'O3_5007A': {'eqn': grid.cfg['eqn'], 'eqn_coeffs': grid.cfg['eqn_coeffs']}})
+
+        """
+
+        # Fit the coefficients at the grid nodes
+        grid = self._grid
+        expression, coefficients = self.fit_inputs(expression, p0)
+        mesh = np.meshgrid(*[grid.axes_range[axis] for axis in grid.axes], indexing='ij')
+        coeffs, info = fit_eqn_task(grid.data, expression, coefficients, grid.axes, max_iter=max_iter, tol=tol,
+                                    mesh=mesh)
+
+        return self.update_eqn(expression, coeffs, info)
+
+    def fit_inputs(self, expression=None, p0=None):
+
+        """Expression and initial coefficients for the ``fit`` method."""
+
+        # Use the current parametrisation by default
+        if expression is None:
+            if self.eqn is None:
+                raise InnateError(f'Please provide an expression to fit the "{self._grid.label}" grid')
+            expression = self.eqn.expression
+
+        coef_names = extract_coef_names(expression)
+        if p0 is None:
+            same_eqn = (self.eqn is not None) and (self.eqn.expression == expression)
+            p0 = [self.coeffs[name] for name in coef_names] if same_eqn else np.ones(len(coef_names))
+
+        return expression, create_coef_dict(coef_names, p0)
+
+    def update_eqn(self, expression, coeffs, info):
+
+        """
+        Update the ``eqn`` technique and the grid configuration with the fitted coefficients.
+
+        Parameters
+        ----------
+        expression : str
+            The parametrisation expression.
+        coeffs : array-like
+            The fitted coefficients in alphabetical order.
+        info : dict
+            The fit summary, where the ``coeffs`` dictionary is added.
+
+        Returns
+        -------
+        info : dict
+            The fit summary.
+
+        """
+
+        grid = self._grid
+        if info.get('stalled'):
+            _logger.warning(f'The "{grid.label}" parametrisation fitting stalled after {info["n_iter"]} iterations: '
+                            f'no step reduced the residuals')
+        elif not info['converged']:
+            _logger.warning(f'The "{grid.label}" parametrisation fitting did not converge after {info["n_iter"]} '
+                            f'iterations')
+
+        self.coeffs = create_coef_dict(extract_coef_names(expression), [float(value) for value in coeffs])
+        self.eqn = generate_specific_function(expression, self.coeffs, grid.axes)
+        if 'eqn' not in self.techniques:
+            self.techniques.append('eqn')
+
+        grid.cfg['eqn'] = expression
+        grid.cfg['eqn_coeffs'] = list(self.coeffs.values())
+        info['coeffs'] = self.coeffs
+
+        return info
+
+    def update_poly(self, coeffs, info):
+
+        """
+        Update the ``poly`` technique and the grid configuration with the fitted coefficient tensor.
+
+        Parameters
+        ----------
+        coeffs : numpy.ndarray
+            The polynomial coefficient tensor.
+        info : dict
+            The fit summary, where the ``coeffs`` tensor is added.
+
+        Returns
+        -------
+        info : dict
+            The fit summary.
+
+        """
 
+        grid = self._grid
+        self.poly = Polynomial(list(grid.axes_range.values()), coeffs=coeffs)
+        if 'poly' not in self.techniques:
+            self.techniques.append('poly')
 
+        grid.cfg['poly_degree'] = list(self.poly.degree)
+        grid.cfg['poly_coeffs'] = self.poly.coeffs
+        info['coeffs'] = self.poly.coeffs
 
+        return info
@@ -0,0 +1,106 @@
+# Neural regression of all the emission lines of a DataSet with a single multi-output SIREN neural net
+#
+# One SirenNet maps the shared grid axes into all the lines (dim_out = number of lines), hence a single forward pass
+# predicts every line. The axes are scaled to [-1, 1] and each line is standardized independently, so the lines
+# with different emissivity scales contribute equally to the MSE loss.
+
+import numpy as np
+import torch
+
+import innate
+import innate.torch.torch_tools as torch_tools
+from innate.io import InnateError
+from innate.regression.methods import SirenNetwork
+from innate.torch.siren import SirenNet
+from innate.torch.trainer import Trainer
+
+
+def multiline_training_data(dataset, label_list=None):
+    """
+    Normalized coordinates and values of several grids with the same axes for a multi-output network.
+
+    Returns the (n_nodes, n_axes) coordinates scaled to [-1, 1], the (n_nodes, n_lines) values standardized per line
+    and the normalization entries for the SirenNetwork parameters. The nodes with non-finite values are excluded.
+    """
+
+    label_list = list(dataset.data_labels) if label_list is None else list(label_list)
+    grid_0 = dataset[label_list[0]]
+    axes_list = [grid_0.axes_range[axis] for axis in grid_0.axes]
+
+    for label in label_list[1:]:
+        grid = dataset[label]
+        if (tuple(grid.axes) != tuple(grid_0.axes)) or \
+                any(not np.array_equal(grid.axes_range[axis], grid_0.axes_range[axis]) for axis in grid_0.axes):
+            raise InnateError(f'The grid "{label}" axes are different from the "{label_list[0]}" grid axes')
+
+    # Grid nodes in the data C-order
+    mesh = np.meshgrid(*axes_list, indexing='ij')
+    coords = np.column_stack([axis_mesh.ravel() for axis_mesh in mesh])
+    values = np.column_stack([np.asarray(dataset[label].data, dtype=float).ravel() for label in label_list])
+
+    mask = np.all(np.isfinite(values), axis=1)
+    coords, values = coords[mask], values[mask]
+
+    # Axes to [-1, 1] and lines standardization
+    x_0, x_f = coords.min(axis=0), coords.max(axis=0)
+    input_offset, input_scale = (x_0 + x_f) / 2, np.where(x_f > x_0, (x_f - x_0) / 2, 1.0)
+    output_offset, output_scale = values.mean(axis=0), values.std(axis=0)
+    output_scale = np.where(output_scale > 0, output_scale, 1.0)
+
+    normalization = {'input_offset': input_offset, 'input_scale': input_scale,
+                     'output_offset': output_offset, 'output_scale': output_scale}
+
+    return (coords - input_offset) / input_scale, (values - output_offset) / output_scale, normalization
+
+
+def train_multiline(dataset, label_list=None, dim_hidden=256, num_layers=4, w0=1.0, w0_initial=30.0,
+                    num_epoch=500, batch_size=1024, lr=1e-4, weight_decay=1e-5, max_grad_norm=1.0,
+                    scheduler_param=None, device='auto', seed=1234, verbose=True):
+    """
+    Train a single SirenNet with one output per line of the dataset.
+
+    Returns the trained SirenNet, the SirenNetwork for the inference with the normalization (whose outputs are the
+    lines in the label_list order), the label_list and the loss per epoch. The batch_size=None trains with the full
+    batch.
+    """
+
+    # Set reproducible seed first
+    torch_tools.set_seed(seed)
+
+    label_list = list(dataset.data_labels) if label_list is None else list(label_list)
+    coords, values, normalization = multiline_training_data(dataset, label_list)
+
+    # Convert to pytorch tensors (float32) on the computing device
+    device = torch_tools.get_device(device)
+    coords = torch.from_numpy(coords).float().to(device)
+    values = torch.from_numpy(values).float().to(device)
+
+    # Create the neural net: R^{n_axes} --> R^{n_lines}
+    model = SirenNet(dim_in=coords.shape[1], dim_out=values.shape[1], dim_hidden=dim_hidden, num_layers=num_layers,
+                     w0=w0, w0_initial=w0_initial).to(device)
+
+    # Training with the optimizer, gradient clipping and learning rate scheduler (batch_size=None for full batch)
+    trainer = Trainer(model, batch_size=batch_size, max_grad_norm=max_grad_norm, lr=lr, weight_decay=weight_decay,
+                      scheduler_param=scheduler_param, verbose=verbose)
+    loss_history = trainer.fit(coords, values, num_epoch=num_epoch)['loss']
+
+    # Network for the inference with the lines normalization
+    state = {key: value.detach().cpu().numpy() for key, value in model.state_dict().items()}
+    network = SirenNetwork({**state, **normalization}, w0=w0, w0_initial=w0_initial)
+
+    return model, network, label_list, loss_history
+
+
+if __name__ == '__main__':
+
+    data_file = 'examples/data/emissivity_grids.nc'
+    emissivities = innate.DataSet.from_file(data_file)
+
+    model, network, label_list, loss_history = train_multiline(emissivities, dim_hidden=512, num_layers=4)
+
+    # Save the model
+    torch_tools.save_torch_model(modelfile='siren_model_multiline.pth', model=model)
+
+    # One forward pass for all the lines
+    print(network)
+    print(dict(zip(label_list, network(12250, 122))))
@@ -12,12 +12,12 @@ import sys
 sys.path.append("./src/")
 
 import torch
-from torch.utils.data import DataLoader, TensorDataset
 import numpy as np
 
 import innate
 import innate.torch.torch_tools as torch_tools
 from innate.torch.siren import SirenNet
+from innate.torch.trainer import Trainer
 
 
 # -------------------------
@@ -99,10 +99,9 @@ scheduler_param = {
 scheduler = torch.optim.lr_scheduler.CosineAnnealingWarmRestarts(optimizer, **scheduler_param)
 
 # -----------------------------------------------
-# Data loader for minibatching
+# Trainer with minibatches sliced from the device tensors
 
-dataset    = TensorDataset(coords, values)
-dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+trainer = Trainer(model, optimizer=optimizer, scheduler=scheduler, batch_size=batch_size, max_grad_norm=max_grad_norm)
 
 # -----------------------------------------------
 
@@ -111,50 +110,10 @@ load_model = False
 
 # Load the existing model
 if load_model:
-    torch_tools.load_torch_model(modefile  = modelfile,
+    torch_tools.load_torch_model(modelfile = modelfile,
                                  model     = model,
                                  optimizer = optimizer,
                                  scheduler = scheduler)
 
-# We use MSE loss
-lossfunc = torch.nn.MSELoss(reduction='mean')
-
-for epoch in range(1,num_epoch+1):
-    
-    total_loss = 0
-    num_batch  = 0
-    
-    # Minibatch training loop
-    for batch_idx, (inputs, targets) in enumerate(dataloader):
-        
-        optimizer.zero_grad() #!
-        
-        # Compute the model prediction and MSE loss
-        preds = model(inputs)
-        loss  = lossfunc(preds, targets)
-        loss.backward()
-        
-        # Clip gradients by norm
-        torch.nn.utils.clip_grad_norm_(model.parameters(), max_grad_norm)
-
-        optimizer.step()
-        
-        # Save for output
-        total_loss += loss.item()
-        num_batch += 1
-
-    scheduler.step() # Step per epoch
-    
-    total_loss = total_loss / num_batch
-
-    print(f'epoch = {epoch} / {num_epoch} | loss = {total_loss:0.3E} | lr = {scheduler.get_last_lr()[0]:0.3E}')
-    
-    with torch.no_grad():
-        if (epoch % 10) == 0:
-            
-            # Save the model
-            torch_tools.save_torch_model(modelfile = modelfile,
-                                         model     = model,
-                                         optimizer = optimizer,
-                                         scheduler = scheduler)
-
+# Train with the MSE loss and save the model every 10 epochs
+history = trainer.fit(coords, values, num_epoch=num_epoch, checkpoint_file=modelfile, checkpoint_every=10)
@@ -0,0 +1,137 @@
+# Minibatch trainer for the tensors resident on the computing device
+#
+# The coordinates of the grids are small (n_points, n_axes) tensors, which fit on the device. Instead of the
+# TensorDataset + DataLoader per batch collation, the data is shuffled with a single randperm per epoch and the
+# batches are direct slices of the shuffled tensors.
+
+import time
+import torch
+
+import innate.torch.torch_tools as torch_tools
+
+
+def default_optimizer(model, lr, weight_decay):
+
+    # The fused AdamW update is a single kernel for all the parameters, which reduces the per-step overhead of the
+    # small batches. It is not available in the old torch versions and for some devices.
+    try:
+        return torch.optim.AdamW(model.parameters(), lr=lr, weight_decay=weight_decay, fused=True)
+    except (RuntimeError, TypeError, ValueError):
+        return torch.optim.AdamW(model.parameters(), lr=lr, weight_decay=weight_decay)
+
+
+class Trainer:
+    """
+    Train a model on input and target tensors with minibatches or the full batch.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The model to train.
+    optimizer : torch.optim.Optimizer, optional
+        Default is AdamW with the lr and weight_decay, using the fused implementation if available.
+    scheduler : torch.optim.lr_scheduler.LRScheduler, optional
+        Stepped once per epoch. Default is CosineAnnealingWarmRestarts with the scheduler_param.
+    lossfunc : callable, optional
+        Default is the mean squared error.
+    batch_size : int, optional
+        Number of samples per step. If None, or larger than the number of samples, each epoch is a single step with
+        all the samples (full batch). Default is 1024.
+    max_grad_norm : float, optional
+        Clip the gradients norm to this value. If None, the gradients are not clipped. Default is 1.0.
+    lr : float, optional
+        Learning rate for the default optimizer. Default is 1e-4.
+    weight_decay : float, optional
+        Weight decay for the default optimizer. Default is 1e-5.
+    scheduler_param : dict, optional
+        Parameters of the default scheduler. Default is {'T_0': 100, 'eta_min': lr / 10, 'T_mult': 1}.
+    verbose : bool, optional
+        Print the loss, learning rate and samples/second per epoch. Default is True.
+    """
+
+    def __init__(self, model, optimizer=None, scheduler=None, lossfunc=None, batch_size=1024, max_grad_norm=1.0,
+                 lr=1e-4, weight_decay=1e-5, scheduler_param=None, verbose=True):
+
+        self.model = model
+        self.batch_size = batch_size
+        self.max_grad_norm = max_grad_norm
+        self.verbose = verbose
+
+        self.optimizer = default_optimizer(model, lr, weight_decay) if optimizer is None else optimizer
+
+        if scheduler is None:
+            scheduler_param = {'T_0': 100, 'eta_min': lr / 10, 'T_mult': 1} if scheduler_param is None \
+                else scheduler_param
+            scheduler = torch.optim.lr_scheduler.CosineAnnealingWarmRestarts(self.optimizer, **scheduler_param)
+        self.scheduler = scheduler
+
+        self.lossfunc = torch.nn.MSELoss(reduction='mean') if lossfunc is None else lossfunc
+        self.history = {'loss': [], 'lr': [], 'samples_per_second': []}
+
+    def train_epoch(self, inputs, targets):
+        """
+        Train one epoch and return the mean loss of the samples.
+        """
+
+        n_samples = inputs.shape[0]
+        batch_size = n_samples if (self.batch_size is None) else min(self.batch_size, n_samples)
+
+        # One permutation per epoch, the batches are slices of the shuffled tensors
+        if batch_size < n_samples:
+            perm = torch.randperm(n_samples, device=inputs.device)
+            inputs, targets = inputs[perm], targets[perm]
+
+        self.model.train()
+        total_loss = 0.0
+        for i in range(0, n_samples, batch_size):
+
+            batch_inputs, batch_targets = inputs[i:i + batch_size], targets[i:i + batch_size]
+            self.optimizer.zero_grad(set_to_none=True)
+
+            # Compute the model prediction and loss
+            loss = self.lossfunc(self.model(batch_inputs), batch_targets)
+            loss.backward()
+
+            # Clip gradients by norm
+            if self.max_grad_norm is not None:
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
+
+            self.optimizer.step()
+
+            # Accumulate on the device to avoid a synchronization per batch
+            total_loss = total_loss + loss.detach() * batch_inputs.shape[0]
+
+        return float(total_loss) / n_samples
+
+    def fit(self, inputs, targets, num_epoch=500, checkpoint_file=None, checkpoint_every=10):
+        """
+        Train the model for a number of epochs and return the history with the loss, learning rate and
+        samples/second per epoch.
+
+        The model is saved (with the optimizer and the scheduler) every checkpoint_every epochs if a
+        checkpoint_file is provided.
+        """
+
+        for epoch in range(1, num_epoch + 1):
+
+            start = time.perf_counter()
+            loss = self.train_epoch(inputs, targets)
+            if inputs.is_cuda:
+                torch.cuda.synchronize(inputs.device)
+            samples_per_second = inputs.shape[0] / (time.perf_counter() - start)
+
+            self.scheduler.step()  # Step per epoch
+
+            self.history['loss'].append(loss)
+            self.history['lr'].append(self.scheduler.get_last_lr()[0])
+            self.history['samples_per_second'].append(samples_per_second)
+
+            if self.verbose:
+                print(f'epoch = {epoch} / {num_epoch} | loss = {loss:0.3E} | lr = {self.history["lr"][-1]:0.3E} | '
+                      f'{samples_per_second:0.3E} samples/s')
+
+            if (checkpoint_file is not None) and (epoch % checkpoint_every == 0):
+                torch_tools.save_torch_model(modelfile=checkpoint_file, model=self.model,
+                                             optimizer=self.optimizer, scheduler=self.scheduler)
+
+        return self.history
@@ -0,0 +1,581 @@
+import numpy as np
+import pytest
+
+from innate import Grid, DataSet
+from innate.io import InnateError
+
+
+temp_range = np.linspace(9000, 20000, 251)
+den_range = np.linspace(1, 600, 101)
+
+# Planar data to check the interpolation is exact
+data_array = 2.0 + 3e-4 * temp_range[:, None] - 5e-3 * den_range[None, :]
+data_cfg = {'parameter': 'emissivity', 'approximation': ('rgi',), 'axes': ('temp', 'den'),
+            'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101)}
+
+
+def plane(coords):
+    coords = np.atleast_2d(coords)
+    return 2.0 + 3e-4 * coords[:, 0] - 5e-3 * coords[:, 1]
+
+
+@pytest.fixture
+def grid():
+    return Grid('O3_5007A', data_array, data_cfg)
+
+
+def test_rgi_compiled_eval(grid):
+
+    coords = np.array([[12250, 122], [9000, 1], [19999.5, 599.5]])
+    np.testing.assert_allclose(grid.approx.interp.rgi.eval(coords)[:, 0], plane(coords))
+
+    # Symbolic and compiled results match
+    np.testing.assert_allclose(grid.approx.interp.rgi(coords).eval(), grid.approx.interp.rgi.eval(coords))
+
+    # Single point and cached functions
+    np.testing.assert_allclose(grid.approx.interp.rgi.eval((12250, 122)), plane((12250, 122)))
+    assert grid.approx.interp.rgi.compile(2) is grid.approx.interp.rgi.compile(2)
+
+
+def test_rgi_numpy_library(grid):
+
+    grid_np = Grid('O3_5007A', data_array, data_cfg, tensor_library='numpy')
+
+    coords = np.column_stack((np.random.uniform(9000, 20000, 1000), np.random.uniform(1, 600, 1000)))
+    np.testing.assert_allclose(grid_np.approx.interp.rgi(coords)[:, 0], plane(coords))
+    np.testing.assert_allclose(grid_np.approx.interp.rgi(coords), grid.approx.interp.rgi.eval(coords))
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_rgi_uniform_axes(library):
+
+    from innate.interpolation.methods import interpolation_library
+    module = interpolation_library(library)
+
+    # Axes from the configuration ranges are uniform
+    assert module.uniform_axes([temp_range, den_range, np.geomspace(1, 600, 101)]) == [True, True, False]
+
+    coords = np.array([[9000, 1], [12250, 122], [20000, 600], [10000, 300.5], [8000, 700]])
+    search = module.RegularGridInterpolator([temp_range, den_range], data_array[..., None], uniform=[False, False])
+    uniform = module.RegularGridInterpolator([temp_range, den_range], data_array[..., None])
+    np.testing.assert_allclose(uniform.eval(coords), search.eval(coords))
+    np.testing.assert_allclose(uniform.eval(coords)[:, 0], plane(coords))
+
+    # Non-finite coordinates are out of bounds on both the uniform and the searched axes
+    coords_nan = np.array([[np.nan, 122], [12250, 122], [12250, np.nan]])
+    expected = np.array([np.nan, plane(coords_nan[1])[0], np.nan])
+    for fill_value, expected_fill in ((None, expected), (-1.0, np.array([-1.0, expected[1], -1.0]))):
+        for interp_uniform in ([True, True], [False, False]):
+            interp = module.RegularGridInterpolator([temp_range, den_range], data_array[..., None],
+                                                    fill_value=fill_value, uniform=interp_uniform)
+            np.testing.assert_allclose(interp.eval(coords_nan)[:, 0], expected_fill)
+
+    from innate.interpolation.numpy import regular_grid_interp
+    with np.errstate(invalid='ignore'):
+        result = regular_grid_interp([temp_range, den_range], data_array, coords_nan, uniform=[True, True])
+    np.testing.assert_allclose(result, expected)
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_dataset_stack_approximation(library):
+
+    array_dict = {'O3_5007A': data_array, 'H1_6563A': 2 * data_array, 'He1_7065A': data_array ** 2}
+    dataset = DataSet(array_dict, {label: data_cfg for label in array_dict}, {label: None for label in array_dict},
+                      tensor_library=library)
+
+    coords = np.array([[12250, 122], [15000, 300.5]])
+    label_list = ['H1_6563A', 'He1_7065A', 'O3_5007A']
+    result = dataset.stack_approximation('rgi', label_list=label_list).eval(coords)
+
+    assert result.shape == (2, 3)
+    for i, label in enumerate(label_list):
+        np.testing.assert_allclose(result[:, i], dataset[label].approx.interp.rgi.eval(coords)[:, 0])
+
+    # Grids with different axes cannot be stacked
+    cfg = {**data_cfg, 'den_range': (1, 1000, 101)}
+    dataset['O3_5007A'] = Grid('O3_5007A', data_array, cfg, tensor_library=library)
+    with pytest.raises(InnateError):
+        dataset.stack_approximation('rgi', label_list=label_list)
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_near(library):
+
+    cfg = {**data_cfg, 'approximation': ('rgi', 'near')}
+    grid_near = Grid('O3_5007A', data_array, cfg, tensor_library=library)
+    assert 'near' in grid_near.approx.interp.techniques
+
+    # Brute force nearest node (the axes are rescaled to the unit interval)
+    coords = np.column_stack((np.random.uniform(9000, 20000, 200), np.random.uniform(1, 600, 200)))
+    idx_temp = np.abs(coords[:, 0, None] - temp_range).argmin(axis=1)
+    idx_den = np.abs(coords[:, 1, None] - den_range).argmin(axis=1)
+    expected = data_array[idx_temp, idx_den]
+
+    np.testing.assert_allclose(grid_near.approx.interp.near.eval(coords)[:, 0], expected)
+
+    # Irregular axes and scattered nodes
+    from innate.interpolation.methods import interpolation_library
+    from innate.interpolation.spatial import NearestInterpolator
+    search = interpolation_library(library).NearestGridInterpolator([temp_range, den_range], data_array[..., None],
+                                                                    uniform=[False, False])
+    np.testing.assert_allclose(search.eval(coords)[:, 0], expected)
+
+    scattered = NearestInterpolator.from_grid([temp_range, den_range], data_array)
+    np.testing.assert_allclose(scattered(coords), expected)
+
+    # Chunked evaluation in single precision into a preallocated array
+    scattered = NearestInterpolator.from_grid([temp_range, den_range], data_array[..., None], chunk_size=7,
+                                              dtype='float32')
+    out = np.empty((coords.shape[0], 1), dtype=np.float32)
+    assert scattered.evaluate(coords, out=out) is out
+    np.testing.assert_allclose(out[:, 0], expected, rtol=1e-6)
+
+    # Grids with missing nodes use the KD-tree of the finite nodes
+    data_gap = data_array.copy()
+    data_gap[100:140, 20:60] = np.nan
+    grid_gap = Grid('O3_5007A', data_gap, cfg, tensor_library=library)
+    assert isinstance(grid_gap.approx.interp.near, NearestInterpolator)
+    nodes = np.column_stack([axis_mesh.ravel() for axis_mesh in np.meshgrid(temp_range, den_range, indexing='ij')])
+    finite = np.isfinite(data_gap.ravel())
+    scale = np.ptp(nodes[finite], axis=0)
+    idx_node = np.argmin(np.linalg.norm((coords[:, None, :] - nodes[None, finite, :]) / scale, axis=-1), axis=1)
+    near_gap = grid_gap.approx.interp.near.eval(coords)[:, 0]
+    assert np.all(np.isfinite(near_gap))
+    np.testing.assert_allclose(near_gap, data_gap.ravel()[finite][idx_node])
+
+    dataset = DataSet({'gap': data_gap, 'full': data_array}, {'gap': cfg, 'full': cfg}, {'gap': {}, 'full': {}},
+                      tensor_library=library)
+    stacked = dataset.stack_approximation('near', ['gap', 'full'])
+    assert isinstance(stacked, NearestInterpolator)
+    np.testing.assert_allclose(dataset.interpolate(coords, 'near', ['gap', 'full'])[:, 0], near_gap)
+
+
+def test_idw():
+
+    from innate.interpolation.spatial import IDWInterpolator
+
+    cfg = {**data_cfg, 'approximation': ('rgi', 'idw')}
+    grid_idw = Grid('O3_5007A', data_array, cfg)
+
+    # Node values are recovered
+    assert 'idw' in grid_idw.approx.interp.techniques
+    coords = np.column_stack((temp_range[[146, 0]], den_range[[0, 100]]))
+    np.testing.assert_allclose(grid_idw.approx.interp.idw(coords)[:, 0], data_array[[146, 0], [0, 100]])
+
+    # Brute force comparison for scattered nodes evaluated in chunks
+    rng = np.random.default_rng(2)
+    nodes, values = rng.random((500, 3)), rng.random(500)
+    coords = rng.random((50, 3))
+    idw = IDWInterpolator(nodes, values, k=6, power=2, rescale=False, chunk_size=7)
+
+    distances = np.linalg.norm(coords[:, None, :] - nodes[None, :, :], axis=-1)
+    idcs = np.argsort(distances, axis=1)[:, :6]
+    weights = 1 / np.take_along_axis(distances, idcs, axis=1) ** 2
+    expected = (weights * values[idcs]).sum(axis=1) / weights.sum(axis=1)
+
+    np.testing.assert_allclose(idw(coords), expected)
+
+    # Stacked grids
+    dataset = DataSet({'A': data_array, 'B': 2 * data_array}, {'A': cfg, 'B': cfg}, {'A': {}, 'B': {}},
+                      tensor_library='numpy')
+    coords = np.column_stack((temp_range[[146, 0]], den_range[[0, 100]]))
+    np.testing.assert_allclose(dataset.interpolate(coords, 'idw', ['B', 'A']),
+                               np.column_stack((2, 1)) * data_array[[146, 0], [0, 100]][:, None])
+
+
+def test_rdb():
+
+    from innate.interpolation.numpy import LocalRBFInterpolator
+
+    # Linear data is reproduced by the polynomial tail
+    cfg = {**data_cfg, 'approximation': ('rgi', 'rdb')}
+    grid_rdb = Grid('O3_5007A', data_array, cfg, tensor_library='numpy')
+    coords = np.column_stack((np.random.uniform(9000, 20000, 500), np.random.uniform(1, 600, 500)))
+    np.testing.assert_allclose(grid_rdb.approx.interp.rdb(coords)[:, 0], plane(coords))
+
+    # Smooth data is more accurate than the linear interpolation
+    x, y = np.linspace(0, 3, 31), np.linspace(0, 2, 21)
+    values = np.sin(x[:, None]) * np.cos(y[None, :])
+    rdb = LocalRBFInterpolator([x, y], values[..., None], cache_size=16, chunk_size=64)
+    rng = np.random.default_rng(3)
+    coords = np.column_stack((rng.uniform(0, 3, 300), rng.uniform(0, 2, 300)))
+    expected = np.sin(coords[:, 0]) * np.cos(coords[:, 1])
+
+    err_rdb = np.abs(rdb(coords)[:, 0] - expected).max()
+    err_rgi = np.abs(grid_rdb.approx.interp.rgi.__class__([x, y], values[..., None])(coords)[:, 0] - expected).max()
+    assert err_rdb < err_rgi / 3
+    assert rdb.cell_coefficients.cache_info().currsize == 16
+
+    # The interpolation is continuous across the cells edges on both axes
+    x, y = np.linspace(0, 3, 8), np.linspace(0, 2, 8)
+    values = np.sin(3 * x[:, None]) * np.cos(2 * y[None, :])
+    rdb = LocalRBFInterpolator([x, y], values[..., None])
+    for edge in (np.array([[x[3], 0.77]]), np.array([[1.1, y[4]]]), np.array([[x[5], y[2]]])):
+        steps = np.array([[-1e-9, 0], [1e-9, 0], [0, -1e-9], [0, 1e-9]])
+        np.testing.assert_allclose(rdb(edge + steps)[:, 0], rdb(edge)[0, 0], atol=1e-7)
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_spline(library, tmp_path):
+
+    from innate import save_dataset
+
+    # Smooth data on a coarse grid
+    x, y = np.linspace(0, 3, 16), np.linspace(0, 2, 11)
+    values = np.sin(x[:, None]) * np.cos(y[None, :])
+    cfg = {'parameter': 'test', 'approximation': ('rgi', 'spline'), 'axes': ('x', 'y'),
+           'x_range': (0, 3, 16), 'y_range': (0, 2, 11)}
+    grid_spline = Grid('sin_cos', values, cfg, tensor_library=library)
+
+    rng = np.random.default_rng(4)
+    coords = np.column_stack((rng.uniform(0.5, 2.5, 300), rng.uniform(0.3, 1.7, 300)))
+    expected = np.sin(coords[:, 0]) * np.cos(coords[:, 1])
+
+    # The nodes are reproduced and the spline is more accurate than the linear interpolation
+    spline, rgi = grid_spline.approx.interp.spline, grid_spline.approx.interp.rgi
+    nodes = np.column_stack((x[[2, 7, 15]], y[[0, 5, 10]]))
+    np.testing.assert_allclose(spline.eval(nodes)[:, 0], values[[2, 7, 15], [0, 5, 10]], atol=1e-12)
+    err_spline = np.abs(spline.eval(coords)[:, 0] - expected).max()
+    err_rgi = np.abs(rgi.eval(coords)[:, 0] - expected).max()
+    assert err_spline < err_rgi / 10
+
+    # Interpolator without a configuration computes the spline coefficients
+    from innate.interpolation.methods import Interpolator
+    interp = Interpolator(grid_spline, ['spline'], tensor_library=library)
+    np.testing.assert_allclose(interp.spline.eval(coords), spline.eval(coords), atol=1e-12)
+
+    # Coefficients stored in the dataset file
+    fname = tmp_path / 'spline_grid.nc'
+    save_dataset(fname, {'sin_cos': values}, cfg, {'sin_cos': {'description': 'test'}},
+                 approx_dict={'spline': {'sin_cos': spline.coeffs}})
+    dataset = DataSet.from_file(fname, tensor_library=library)
+    np.testing.assert_allclose(dataset['sin_cos'].approx.interp.spline.coeffs, spline.coeffs)
+    np.testing.assert_allclose(dataset['sin_cos'].approx.interp.spline.eval(coords), spline.eval(coords))
+
+
+def test_rgi_value_and_grad(grid):
+
+    import pytensor
+    import pytensor.tensor as tt
+    from innate.interpolation.numpy import regular_grid_value_grad
+
+    x, y = np.linspace(0, 3, 31), np.geomspace(0.1, 2, 21)
+    values = np.stack((np.sin(x[:, None]) * np.cos(y[None, :]), x[:, None] * y[None, :] ** 2), axis=-1)
+    coords = np.column_stack((np.random.uniform(0, 3, 50), np.random.uniform(0.1, 2, 50)))
+
+    # NumPy partial derivatives versus finite differences (within the cells)
+    value, gradient = regular_grid_value_grad([x, y], values, coords)
+    assert gradient.shape == (50, 2, 2)
+    for d, delta in enumerate(np.eye(2) * 1e-7):
+        finite_diff = (regular_grid_value_grad([x, y], values, coords + delta)[0] - value) / 1e-7
+        np.testing.assert_allclose(gradient[:, d, :], finite_diff, rtol=1e-4, atol=1e-5)
+
+    # PyTensor Op gradient versus the autodiff gradient of the graph
+    rgi = grid.approx.interp.rgi.__class__([x, y], values)
+    c = tt.matrix('c')
+    op_value, op_gradient = rgi.value_and_grad(c)
+    function = pytensor.function([c], [op_value, pytensor.grad(op_value.sum(), c)])
+    graph_function = pytensor.function([c], [rgi(c), pytensor.grad(rgi(c).sum(), c)])
+
+    for output, expected in zip(function(coords), graph_function(coords)):
+        np.testing.assert_allclose(output, expected)
+
+
+def test_rgi_chunked_evaluation():
+
+    from innate.interpolation.numpy import RegularGridInterpolator
+
+    rgi = RegularGridInterpolator([temp_range, den_range], data_array[..., None])
+    coords = np.column_stack((np.random.uniform(9000, 20000, 1001), np.random.uniform(1, 600, 1001)))
+    expected = rgi(coords)
+
+    # Memory budget for ~20 coordinates per block written into a preallocated array
+    out = np.empty((1001, 1))
+    result = rgi(coords, out=out, max_memory=20 * 2 * 8 * (4 * 2 + 3 + 4))
+    assert result is out
+    np.testing.assert_allclose(out, expected)
+
+    # Wrong output shape
+    with pytest.raises(InnateError):
+        rgi(coords, out=np.empty(1001))
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_simplex(library):
+
+    from innate.interpolation.methods import interpolation_library
+    module = interpolation_library(library)
+
+    cfg = {**data_cfg, 'approximation': ('rgi', 'simplex')}
+    grid_simplex = Grid('O3_5007A', data_array, cfg, tensor_library=library)
+    coords = np.column_stack((np.random.uniform(9000, 20000, 100), np.random.uniform(1, 600, 100)))
+    np.testing.assert_allclose(grid_simplex.approx.interp.simplex.eval(coords)[:, 0], plane(coords))
+
+    # Linear function on a 5D grid with irregular axes
+    axes = [np.linspace(0, 1, 5), np.geomspace(1, 10, 4), np.linspace(-1, 1, 6), np.linspace(0, 2, 3),
+            np.array([0, 0.1, 0.5, 1])]
+    slopes = np.array([1.0, -2.0, 0.5, 3.0, -1.5])
+    mesh = np.meshgrid(*axes, indexing='ij')
+    values = sum(slope * axis_mesh for slope, axis_mesh in zip(slopes, mesh))[..., None]
+
+    rng = np.random.default_rng(5)
+    coords = np.column_stack([rng.uniform(axis[0], axis[-1], 200) for axis in axes])
+    simplex = module.SimplexGridInterpolator(axes, values)
+    np.testing.assert_allclose(simplex.eval(coords)[:, 0], coords @ slopes)
+
+    # Exact at the grid nodes for non-linear data
+    values = np.sin(sum(mesh))[..., None]
+    idcs = rng.integers(0, [axis.size for axis in axes], size=(50, len(axes)))
+    nodes = np.column_stack([axis[idcs[:, i]] for i, axis in enumerate(axes)])
+    simplex = module.SimplexGridInterpolator(axes, values)
+    np.testing.assert_allclose(simplex.eval(nodes), values[tuple(idcs.T)], atol=1e-12)
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+@pytest.mark.parametrize('ndim', [3, 4])
+def test_point_interpolation_ndim(library, ndim, tmp_path):
+
+    from innate import save_dataset
+
+    # Linear function on a grid with ndim axes
+    axes = ('temp', 'den', 'ext', 'age')[:ndim]
+    ranges = ((9000, 20000, 12), (1, 600, 7), (0, 2, 5), (1, 10, 4))[:ndim]
+    slopes = np.array((3e-4, -5e-3, 0.7, -0.2))[:ndim]
+    mesh = np.meshgrid(*[np.linspace(*limits) for limits in ranges], indexing='ij')
+    values = 2.0 + sum(slope * axis_mesh for slope, axis_mesh in zip(slopes, mesh))
+
+    # The PyTensor spline graph has 4**ndim terms, skipped to limit the compilation time
+    techniques = ('rgi', 'simplex', 'spline') if library == 'numpy' else ('rgi', 'simplex')
+    cfg = {'parameter': 'test', 'approximation': ('near',) + techniques, 'axes': axes,
+           **{f'{dim}_range': limits for dim, limits in zip(axes, ranges)}}
+    fname = tmp_path / f'grid_{ndim}d.nc'
+    save_dataset(fname, {'linear': values}, cfg, {'linear': {'description': 'test'}})
+    grid_nd = DataSet.from_file(fname, tensor_library=library)['linear']
+
+    rng = np.random.default_rng(ndim)
+    coords = np.column_stack([rng.uniform(limits[0], limits[1], 100) for limits in ranges])
+    for technique in techniques:
+        interp = getattr(grid_nd.approx.interp, technique)
+        np.testing.assert_allclose(interp.eval(coords)[:, 0], 2.0 + coords @ slopes, rtol=1e-10)
+
+    nodes = np.column_stack([np.linspace(*limits)[[0, -1]] for limits in ranges])
+    np.testing.assert_allclose(grid_nd.approx.interp.near.eval(nodes)[:, 0], 2.0 + nodes @ slopes)
+
+    # The trailing output dimension is a view of the grid data
+    if library == 'numpy':
+        assert np.shares_memory(grid_nd.approx.interp.rgi.values, grid_nd.data)
+
+    with pytest.raises(InnateError):
+        Grid('linear', values[..., None], cfg, tensor_library=library)
+
+    # Shared grid interpolator builder and the PyTensor dictionary of line interpolators
+    from innate.interpolation.methods import interpolation_coordinates
+    axes_range = [np.linspace(*limits) for limits in ranges]
+    interp = interpolation_coordinates(values, axes_range, tensor_library=library, technique='rgi')
+    np.testing.assert_allclose(interp.eval(coords)[:, 0], 2.0 + coords @ slopes, rtol=1e-10)
+
+    if (library == 'pytensor') and (ndim == 3):
+        from innate.interpolation.pytensor import interpolation_selection
+        interp_dict = interpolation_selection({'linear': values}, *axes_range)
+        np.testing.assert_allclose(interp_dict['linear'](coords).eval()[:, 0], 2.0 + coords @ slopes, rtol=1e-10)
+
+
+def test_parallel_evaluation():
+
+    from innate.interpolation.numpy import INTERPOLATORS, parallel_jobs
+
+    x, y = np.linspace(0, 3, 31), np.geomspace(0.1, 2, 21)
+    values = np.stack((np.sin(x[:, None]) * np.cos(y[None, :]), x[:, None] * y[None, :] ** 2), axis=-1)
+    rng = np.random.default_rng(7)
+    coords = np.column_stack((rng.uniform(0, 3, 5001), rng.uniform(0.1, 2, 5001)))
+
+    # Same results in parallel threads, with blocks and preallocated outputs
+    for technique, interp_class in INTERPOLATORS.items():
+        interp = interp_class([x, y], values)
+        expected = interp.evaluate(coords)
+        np.testing.assert_allclose(interp.evaluate(coords, n_jobs=4), expected, rtol=1e-12)
+        out = np.empty_like(expected)
+        interp.evaluate(coords, out=out, n_jobs=-1)
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+    rgi = INTERPOLATORS['rgi']([x, y], values, n_jobs=3, max_memory=1e4)
+    np.testing.assert_allclose(rgi.evaluate(coords), INTERPOLATORS['rgi']([x, y], values)(coords))
+
+    assert parallel_jobs(None) == 1 and parallel_jobs(-1) >= 1
+    with pytest.raises(InnateError):
+        parallel_jobs(0)
+
+    # Dataset interface
+    dataset = DataSet({'A': values[..., 0], 'B': values[..., 1]},
+                      {'A': {'parameter': 'a', 'axes': ('x', 'y'), 'x_range': (0, 3, 31), 'y_range': (0.1, 2, 21)},
+                       'B': {'parameter': 'b', 'axes': ('x', 'y'), 'x_range': (0, 3, 31), 'y_range': (0.1, 2, 21)}},
+                      {'A': {'approximation': ('rgi',)}, 'B': {'approximation': ('rgi',)}}, tensor_library='numpy')
+    coords_linear = np.column_stack((rng.uniform(0, 3, 100), rng.uniform(0.1, 2, 100)))
+    flux = dataset.interpolate(coords_linear, label_list=['B', 'A'], n_jobs=2)
+    np.testing.assert_allclose(flux, dataset.stack_approximation('rgi', ['B', 'A'], 'numpy').eval(coords_linear))
+
+
+@pytest.mark.parametrize('library', ['numpy', 'pytensor'])
+def test_float32_precision(library, tmp_path):
+
+    from innate import save_dataset
+
+    x, y = np.linspace(0, 3, 31), np.linspace(0.1, 2, 21)
+    values = np.sin(x[:, None]) * np.cos(y[None, :])
+    cfg = {'parameter': 'test', 'approximation': ('rgi', 'near', 'idw', 'rdb', 'spline', 'simplex'),
+           'axes': ('x', 'y'), 'x_range': (0, 3, 31), 'y_range': (0.1, 2, 21)}
+    fname = tmp_path / 'precision_grid.nc'
+    save_dataset(fname, {'sin_cos': values}, cfg, {'sin_cos': {'description': 'test'}})
+
+    grid_64 = DataSet.from_file(fname, tensor_library=library)['sin_cos']
+    grid_32 = DataSet.from_file(fname, tensor_library=library, dtype='float32')['sin_cos']
+    assert grid_32.data.dtype == np.float32 and grid_32.data.nbytes == grid_64.data.nbytes // 2
+
+    # Single precision outputs within the float32 resolution of the float64 interpolation
+    rng = np.random.default_rng(3)
+    coords = np.column_stack((rng.uniform(0, 3, 200), rng.uniform(0.1, 2, 200)))
+    for technique in grid_32.approx.interp.techniques:
+        if hasattr(getattr(grid_32.approx.interp, technique), 'uniform'):
+            assert list(getattr(grid_32.approx.interp, technique).uniform) == [True, True], technique
+        flux_32 = getattr(grid_32.approx.interp, technique).eval(coords)
+        flux_64 = getattr(grid_64.approx.interp, technique).eval(coords)
+        assert flux_32.dtype == np.float32, technique
+        np.testing.assert_allclose(flux_32, flux_64, atol=5e-6, err_msg=technique)
+
+    # The single precision axes keep the affine cell lookup
+    interp_32 = grid_32.approx.interp.rgi
+    assert list(interp_32.uniform) == [True, True]
+
+    if library == 'pytensor':
+        graph = grid_32.approx.interp.rgi(coords.astype(np.float32))
+        assert graph.dtype == 'float32'
+        value, gradient = grid_32.approx.interp.rgi.value_and_grad(coords.astype(np.float32))
+        assert value.dtype == 'float32' and gradient.dtype == 'float32'
+
+
+@pytest.mark.parametrize('fill_value', [None, np.nan])
+def test_rgi_op_c_implementation(fill_value):
+
+    import pytensor
+    import pytensor.tensor as tt
+    from pytensor.compile.mode import Mode
+    from innate.interpolation.numpy import regular_grid_value_grad
+    from innate.interpolation.pytensor import RegularGridInterpOp
+
+    x, y = np.linspace(0, 3, 31), np.geomspace(0.1, 2, 21)
+    values = np.stack((np.sin(x[:, None]) * np.cos(y[None, :]), x[:, None] * y[None, :] ** 2), axis=-1)
+    rng = np.random.default_rng(11)
+    coords = np.column_stack((rng.uniform(-0.2, 3.2, 300), rng.uniform(0.05, 2.1, 300)))
+    expected_value, expected_gradient = regular_grid_value_grad([x, y], values, coords, fill_value=fill_value)
+
+    # C and Python implementations
+    c = tt.matrix('c')
+    value, gradient = RegularGridInterpOp([x, y], values, fill_value=fill_value)(c)
+    for linker in ('c', 'py'):
+        function = pytensor.function([c], [value, gradient], mode=Mode(linker=linker, optimizer='fast_run'))
+        output_value, output_gradient = function(coords)
+        np.testing.assert_allclose(output_value, expected_value, atol=1e-12)
+        np.testing.assert_allclose(output_gradient, expected_gradient, atol=1e-12)
+
+    # Single precision
+    value_32, gradient_32 = RegularGridInterpOp([x, y], values, fill_value=fill_value, dtype='float32')(c)
+    function = pytensor.function([c], [value_32, gradient_32], mode=Mode(linker='c', optimizer='fast_run'))
+    output_value, output_gradient = function(coords.astype(np.float32))
+    assert output_value.dtype == np.float32
+    np.testing.assert_allclose(output_value, expected_value, atol=1e-5)
+
+
+def test_rgi_op_c_code_and_pullback(monkeypatch):
+
+    import warnings
+    import pytensor
+    import pytensor.tensor as tt
+    from pytensor.compile.mode import Mode
+    from innate.interpolation.pytensor import RegularGridInterpOp
+
+    x, y = np.linspace(0, 3, 31), np.geomspace(0.1, 2, 21)
+    values = np.sin(x[:, None]) * np.cos(y[None, :])
+    coords = np.column_stack((np.random.uniform(0, 3, 100), np.random.uniform(0.1, 2, 100)))
+
+    # The gradient graph uses the pullback interface without deprecation warnings
+    c = tt.matrix('c')
+    op = RegularGridInterpOp([x, y], values)
+    value = op(c)[0]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        gradient = pytensor.grad(tt.sum(value ** 2), c)
+
+    function_py = pytensor.function([c], [value, gradient], mode=Mode(linker='py', optimizer='fast_run'))
+    function_c = pytensor.function([c], [value, gradient], mode=Mode(linker='c', optimizer='fast_run'))
+    expected = function_py(coords)
+
+    # The C linker does not call the Python implementation
+    def perform(*args, **kwargs):
+        raise AssertionError('RegularGridInterpOp.perform called with the C linker')
+
+    monkeypatch.setattr(RegularGridInterpOp, 'perform', perform)
+    for output, output_py in zip(function_c(coords), expected):
+        np.testing.assert_allclose(output, output_py, atol=1e-12)
+    function_py = pytensor.function([c], [value, gradient], mode=Mode(linker='py', optimizer='fast_run'))
+    with pytest.raises(AssertionError):
+        function_py(coords)
+
+
+def test_rgi_op_c_mode_verify_grad(monkeypatch):
+
+    import pytensor
+    from innate.interpolation.pytensor import RegularGridInterpOp, RegularGridInterpolator, c_mode
+
+    x, y = np.linspace(0, 3, 31), np.geomspace(0.1, 2, 21)
+    values = np.stack((np.sin(x[:, None]) * np.cos(y[None, :]), x[:, None] * y[None, :] ** 2), axis=-1)
+    rng = np.random.default_rng(5)
+    coords = np.column_stack((rng.uniform(0.1, 2.9, 20), rng.uniform(0.15, 1.9, 20)))
+    expected = RegularGridInterpolator([x, y], values).eval(coords)
+
+    # The C mode does not call the Python implementation
+    def perform(*args, **kwargs):
+        raise AssertionError('RegularGridInterpOp.perform called with the C mode')
+
+    monkeypatch.setattr(RegularGridInterpOp, 'perform', perform)
+
+    mode = c_mode()
+    assert mode.linker.c_thunks
+    pytensor.gradient.verify_grad(lambda c: RegularGridInterpOp([x, y], values)(c)[0], [coords], rng=rng,
+                                  mode=mode)
+
+    # The compiled functions of the interpolator use the C mode
+    interp = RegularGridInterpolator([x, y], values, op=True)
+    np.testing.assert_allclose(interp.eval(coords), expected, atol=1e-12)
+
+
+def test_rgi_op_stacked_dataset():
+
+    import pytensor
+    import pytensor.tensor as tt
+    from pytensor.compile.mode import Mode
+
+    x, y = np.linspace(0, 3, 31), np.linspace(0.1, 2, 21)
+    grids = {f'line_{i}': np.sin((i + 1) * x[:, None]) * np.cos(y[None, :]) for i in range(5)}
+    common_cfg = {label: {'parameter': 'test', 'axes': ('x', 'y'), 'x_range': (0, 3, 31), 'y_range': (0.1, 2, 21)}
+                  for label in grids}
+    local_cfg = {label: {'approximation': ('rgi',)} for label in grids}
+    dataset = DataSet(grids, common_cfg, local_cfg)
+
+    label_list = sorted(grids)
+    lines_op = dataset.stack_approximation('rgi', label_list, op=True)
+    lines_graph = dataset.stack_approximation('rgi', label_list)
+
+    # A single node for all the grids, with the graph results and gradients
+    c = tt.matrix('c')
+    mode = Mode(linker='cvm', optimizer='fast_run')
+    logp_op, logp_graph = tt.sum(lines_op(c) ** 2), tt.sum(lines_graph(c) ** 2)
+    function_op = pytensor.function([c], [lines_op(c), pytensor.grad(logp_op, c)], mode=mode)
+    function_graph = pytensor.function([c], [lines_graph(c), pytensor.grad(logp_graph, c)], mode=mode)
+    n_interp_nodes = sum(node.op.__class__.__name__ == 'RegularGridInterpOp'
+                         for node in function_op.maker.fgraph.toposort())
+    assert n_interp_nodes == 1
+
+    coords = np.column_stack((np.random.uniform(0, 3, 100), np.random.uniform(0.1, 2, 100)))
+    for output, expected in zip(function_op(coords), function_graph(coords)):
+        np.testing.assert_allclose(output, expected, atol=1e-12)
+    np.testing.assert_allclose(lines_op.eval(coords), lines_graph.eval(coords), atol=1e-12)
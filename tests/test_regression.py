@@ -0,0 +1,474 @@
+import numpy as np
+import pytest
+
+from innate import Grid
+from innate.io import InnateError
+from innate.regression.methods import generate_specific_function
+
+
+temp_range = np.linspace(9000, 20000, 251)
+den_range = np.linspace(1, 600, 101)
+
+# Emissivity-like parametrisation
+eqn_expression = 'a + b / (temp/10000.0) + c * np.log10(den/10000)'
+eqn_coeffs = (1.2, 0.4, -0.03)
+
+
+def eqn_model(temp, den, a=1.2, b=0.4, c=-0.03):
+    return a + b / (temp / 10000.0) + c * np.log10(den / 10000)
+
+
+data_array = eqn_model(temp_range[:, None], den_range[None, :])
+data_cfg = {'parameter': 'emissivity', 'approximation': ('rgi', 'eqn'), 'axes': ('temp', 'den'),
+            'temp_range': (9000, 20000, 251), 'den_range': (1, 600, 101),
+            'eqn': eqn_expression, 'eqn_coeffs': eqn_coeffs}
+
+
+@pytest.fixture
+def grid():
+    return Grid('O3_5007A', data_array, data_cfg, tensor_library='numpy')
+
+
+def test_eqn_vectorized(grid):
+
+    eqn = grid.approx.reg.eqn
+    temp_mesh, den_mesh = np.meshgrid(temp_range, den_range, indexing='ij')
+
+    # Whole grid in a single call with a float output
+    result = eqn(temp_mesh, den_mesh)
+    assert result.dtype == np.float64 and result.shape == data_array.shape
+    np.testing.assert_allclose(result, data_array)
+
+    # Scalars and broadcasting
+    assert np.isclose(eqn(12250, 122), eqn_model(12250, 122))
+    np.testing.assert_allclose(eqn(temp_range[:, None], den_range[None, :]), data_array)
+
+    # Constant expressions take the shape of the inputs
+    constant = generate_specific_function('a', {'a': 2.0}, ['temp', 'den'])
+    np.testing.assert_allclose(constant(temp_mesh, den_mesh), np.full(temp_mesh.shape, 2.0))
+
+
+def test_eqn_pytensor_graph(grid):
+
+    import pytensor
+    import pytensor.tensor as tt
+
+    eqn = grid.approx.reg.eqn
+    temp, den, a = tt.vector('temp'), tt.vector('den'), tt.scalar('a')
+    temp_values, den_values = np.array([9500.0, 12250.0, 18000.0]), np.array([5.0, 122.0, 550.0])
+
+    # Constant coefficients
+    emis = eqn.graph(temp, den)
+    function = pytensor.function([temp, den], [emis, *pytensor.grad(emis.sum(), [temp, den])])
+    value, d_temp, d_den = function(temp_values, den_values)
+    np.testing.assert_allclose(value, eqn(temp_values, den_values))
+    np.testing.assert_allclose(d_temp, -0.4 * 10000.0 / temp_values ** 2)
+    np.testing.assert_allclose(d_den, -0.03 / (den_values * np.log(10)))
+
+    # Free coefficient
+    emis = eqn.graph(temp, den, coefficients={'a': a})
+    function = pytensor.function([temp, den, a], [emis, pytensor.grad(emis.sum(), a)])
+    value, d_a = function(temp_values, den_values, 2.0)
+    np.testing.assert_allclose(value, eqn_model(temp_values, den_values, a=2.0))
+    assert np.isclose(d_a, temp_values.size)
+
+    with pytest.raises(InnateError):
+        eqn.graph(temp)
+    with pytest.raises(InnateError):
+        eqn.graph(temp, den, coefficients={'z': a})
+
+
+def test_eqn_torch_graph(grid):
+
+    torch = pytest.importorskip('torch')
+
+    eqn = grid.approx.reg.eqn
+    temp = torch.tensor([9500.0, 12250.0, 18000.0], dtype=torch.float64, requires_grad=True)
+    den = torch.tensor([5.0, 122.0, 550.0], dtype=torch.float64)
+    b = torch.tensor(0.4, dtype=torch.float64, requires_grad=True)
+
+    emis = eqn.graph(temp, den, coefficients={'b': b}, library='torch')
+    emis.sum().backward()
+    temp_values = temp.detach().numpy()
+    np.testing.assert_allclose(emis.detach().numpy(), eqn(temp_values, den.numpy()))
+    np.testing.assert_allclose(temp.grad.numpy(), -0.4 * 10000.0 / temp_values ** 2)
+    assert np.isclose(b.grad.item(), np.sum(10000.0 / temp_values))
+
+
+def test_eqn_fit(grid, tmp_path):
+
+    from innate import save_dataset, DataSet
+
+    # Linear in the coefficients: single least-squares solve
+    info = grid.approx.reg.fit(p0=[0.0, 0.0, 0.0])
+    assert info['linear'] and info['rms'] < 1e-12
+    np.testing.assert_allclose(list(info['coeffs'].values()), eqn_coeffs)
+    np.testing.assert_allclose(grid.cfg['eqn_coeffs'], eqn_coeffs)
+
+    # Non-linear expression with the analytic Jacobian
+    power_law = 'a * (temp/10000.0)**b * np.exp(c * den/1000)'
+    data = 1.5 * (temp_range[:, None] / 10000.0) ** -0.8 * np.exp(0.2 * den_range[None, :] / 1000)
+    cfg = {**data_cfg, 'approximation': ('rgi',)}
+    grid_power = Grid('H1_6563A', data, cfg, tensor_library='numpy')
+    info = grid_power.approx.reg.fit(power_law)
+    assert not info['linear'] and info['converged']
+    np.testing.assert_allclose([info['coeffs'][key] for key in 'abc'], (1.5, -0.8, 0.2), rtol=1e-8)
+    assert 'eqn' in grid_power.approx.reg.techniques
+    assert np.isclose(grid_power.approx.reg.eqn(12250, 122), 1.5 * 1.225 ** -0.8 * np.exp(0.2 * 0.122))
+
+    # The fitted parametrisation is stored in the dataset file
+    fname = tmp_path / 'fit_grid.nc'
+    common_cfg = {key: value for key, value in cfg.items() if key not in ('eqn', 'eqn_coeffs')}
+    local_cfg = {'H1_6563A': {'eqn': grid_power.cfg['eqn'], 'eqn_coeffs': grid_power.cfg['eqn_coeffs'],
+                              'approximation': ('rgi', 'eqn')}}
+    save_dataset(fname, {'H1_6563A': data}, common_cfg, local_cfg)
+    dataset = DataSet.from_file(fname, tensor_library='numpy')
+    assert np.isclose(dataset['H1_6563A'].approx.reg.eqn(12250, 122), grid_power.approx.reg.eqn(12250, 122))
+
+    with pytest.raises(InnateError):
+        Grid('H1_6563A', data, cfg, tensor_library='numpy').approx.reg.fit()
+
+
+def test_derivative_tree():
+
+    from innate.regression.methods import CompiledEquation
+
+    eqn = CompiledEquation('a * np.sqrt(x) + np.power(x, b) * np.sin(c * x) - np.log(x) / c',
+                           {'a': 0.5, 'b': 1.3, 'c': 2.0}, ['x'])
+    x = np.linspace(0.5, 3.0, 7)
+    np.testing.assert_allclose(eqn.jacobian(x), eqn.jacobian(x, finite_differences=True), rtol=1e-6)
+
+
+def test_eqn_builtins():
+
+    from innate.regression.methods import compile_expression, CompiledEquation
+
+    x = np.linspace(-2.0, 2.0, 9)
+    function = compile_expression('a*abs(x)+b', ('x',), ('a', 'b')).function
+    np.testing.assert_allclose(function(x, np.array([2.0, 1.0])), 2.0 * np.abs(x) + 1.0)
+
+    eqn = generate_specific_function('a*abs(x) + max(x, b, 0.5) - min(x, 0) + round(pow(x, 2))', {'a': 2.0, 'b': 1.0},
+                                     ['x'])
+    np.testing.assert_allclose(eqn(x), 2.0 * np.abs(x) + np.maximum(np.maximum(x, 1.0), 0.5) - np.minimum(x, 0) +
+                               np.round(x ** 2))
+    np.testing.assert_allclose(eqn.jacobian(x), eqn.jacobian(x, finite_differences=True), atol=1e-6)
+
+    # abs has a symbolic derivative
+    eqn_abs = CompiledEquation('a*abs(x)+b', {'a': 2.0, 'b': 1.0}, ['x'])
+    assert eqn_abs.code.jacobian_functions() is not None
+    np.testing.assert_allclose(eqn_abs.jacobian(x), np.column_stack([np.abs(x), np.ones_like(x)]))
+
+    # The graph function resolves the builtins to the tensor library
+    import pytensor
+    import pytensor.tensor as tt
+    x_tt = tt.dvector('x')
+    graph_function = pytensor.function([x_tt], eqn_abs.graph(x_tt))
+    np.testing.assert_allclose(graph_function(x), 2.0 * np.abs(x) + 1.0)
+
+    # Other names are rejected with the allowed names
+    eqn_sum = generate_specific_function('a*sum(x)', {'a': 2.0}, ['x'])
+    with pytest.raises(InnateError, match='allowed names'):
+        eqn_sum(x)
+
+
+def test_eqn_fit_stalled():
+
+    from innate.regression.methods import CompiledEquation, fit_coefficients
+
+    # The data is below the minimum of the expression at its kink, where no step reduces the residuals
+    eqn = CompiledEquation('max(a, 3 - 2 * a) * x', {'a': 1.0}, ['x'])
+    x = np.linspace(1, 2, 20)
+    coeffs, info = fit_coefficients(eqn, [x], 0.5 * x)
+    assert info['stalled'] and not info['converged']
+    np.testing.assert_allclose(coeffs, 1.0)
+
+    # The fits which reduce the residuals are not stalled
+    coeffs, info = fit_coefficients(eqn, [x], 1.5 * x, p0=[1.2])
+    assert info['converged'] and not info['stalled']
+
+
+def test_dataset_batch_fit():
+
+    from innate import DataSet
+
+    # Three lines with the same parametrisation
+    coeffs_dict = {'O3_5007A': (1.2, 0.4, -0.03), 'H1_6563A': (2.0, -0.5, 0.01), 'He1_5876A': (0.3, 0.9, 0.2)}
+    array_dict = {label: eqn_model(temp_range[:, None], den_range[None, :], *coeffs)
+                  for label, coeffs in coeffs_dict.items()}
+    cfg = {key: value for key, value in data_cfg.items() if key not in ('eqn', 'eqn_coeffs')}
+    common_cfg = {label: cfg for label in coeffs_dict}
+    local_cfg = {label: {} for label in coeffs_dict}
+
+    for n_jobs in (1, 2):
+        dataset = DataSet(array_dict, common_cfg, local_cfg, tensor_library='numpy')
+        fit_dict = dataset.fit('eqn', eqn_expression, n_jobs=n_jobs)
+        for label, coeffs in coeffs_dict.items():
+            assert fit_dict[label]['rms'] < 1e-12 and fit_dict[label]['time'] > 0
+            np.testing.assert_allclose(dataset[label].cfg['eqn_coeffs'], coeffs, atol=1e-12)
+            assert np.isclose(dataset[label].approx.reg.eqn(12250, 122), eqn_model(12250, 122, *coeffs))
+
+    with pytest.raises(InnateError):
+        dataset.fit('nn')
+
+
+def test_eqn_compile_cache():
+
+    from innate.regression.methods import compile_expression
+
+    # Same formula with different spacing and coefficients shares the compiled functions
+    eqn_1 = generate_specific_function(eqn_expression, dict(zip('abc', eqn_coeffs)), ('temp', 'den'))
+    n_compiled = compile_expression.cache_info().currsize
+    eqn_2 = generate_specific_function('a+b/(temp/10000.0)+c*np.log10(den/10000)', dict(zip('abc', (2.0, -0.5, 0.01))),
+                                       ('temp', 'den'))
+    assert eqn_1.code is eqn_2.code
+    assert compile_expression.cache_info().currsize == n_compiled
+    assert np.isclose(eqn_1(12250, 122), eqn_model(12250, 122))
+    assert np.isclose(eqn_2(12250, 122), eqn_model(12250, 122, 2.0, -0.5, 0.01))
+
+    # Different variables are compiled separately
+    eqn_3 = generate_specific_function(eqn_expression, dict(zip('abc', eqn_coeffs)), ('den', 'temp'))
+    assert eqn_3.code is not eqn_1.code
+    assert np.isclose(eqn_3(122, 12250), eqn_model(12250, 122))
+
+
+def test_poly(tmp_path):
+
+    from innate import save_dataset, DataSet
+    from innate.regression.methods import Polynomial
+
+    # Cubic in temperature and quadratic in density
+    def poly_model(temp, den, shift=0.0):
+        t, d = temp / 10000.0, den / 100.0
+        return 1.0 + shift + 0.3 * t - 0.2 * t ** 3 + 0.05 * d * t - 0.01 * d ** 2
+
+    rng = np.random.default_rng(3)
+    temp, den = rng.uniform(9000, 20000, 200), rng.uniform(1, 600, 200)
+    cfg = {**data_cfg, 'approximation': ('rgi', 'poly'), 'poly_degree': (3, 2)}
+    data = poly_model(temp_range[:, None], den_range[None, :])
+
+    # Exact for a polynomial of the same degree (fitted on the first access)
+    grid_poly = Grid('O3_5007A', data, cfg, tensor_library='numpy')
+    assert grid_poly.approx.reg._poly.coeffs is None
+    poly = grid_poly.approx.reg.poly
+    assert 'poly' in grid_poly.approx.reg.techniques and poly.coeffs.shape == (4, 3)
+    np.testing.assert_allclose(poly(temp, den), poly_model(temp, den), atol=1e-12)
+    np.testing.assert_allclose(poly(temp_range[:, None], den_range[None, :]), data, atol=1e-12)
+    assert np.isclose(poly(12250, 122), poly_model(12250, 122))
+
+    # Horner's scheme versus the power sum of the coefficient tensor
+    scaled = [(2 * x - (axis[0] + axis[-1])) / (axis[-1] - axis[0]) for x, axis in ((temp, temp_range),
+                                                                                   (den, den_range))]
+    power_sum = sum(poly.coeffs[i, j] * scaled[0] ** i * scaled[1] ** j for i in range(4) for j in range(3))
+    np.testing.assert_allclose(poly(temp, den), power_sum, atol=1e-12)
+
+    # Batched fit of the dataset
+    labels = ('O3_5007A', 'H1_6563A', 'He1_5876A')
+    array_dict = {label: poly_model(temp_range[:, None], den_range[None, :], shift=i)
+                  for i, label in enumerate(labels)}
+    dataset = DataSet(array_dict, {label: cfg for label in labels}, {label: {} for label in labels},
+                      tensor_library='numpy')
+    fit_dict = dataset.fit('poly', degree=(4, 2))
+    for i, label in enumerate(labels):
+        assert fit_dict[label]['rms'] < 1e-12 and fit_dict[label]['batch_time'] == fit_dict[labels[0]]['batch_time']
+        assert dataset[label].approx.reg.poly.degree == (4, 2)
+        np.testing.assert_allclose(dataset[label].approx.reg.poly(temp, den), poly_model(temp, den, shift=i),
+                                   atol=1e-12)
+    np.testing.assert_allclose(fit_dict['H1_6563A']['coeffs'], Polynomial([temp_range, den_range], (4, 2)).solve(
+        array_dict['H1_6563A'])[0], atol=1e-12)
+
+    # Default degree from the grids configuration, with a batch per degree
+    local_cfg = {'O3_5007A': {'poly_degree': (4, 3)}, 'H1_6563A': {}, 'He1_5876A': {}}
+    dataset_cfg = DataSet(array_dict, {label: cfg for label in labels}, local_cfg, tensor_library='numpy')
+    assert all(dataset_cfg[label].approx.reg._poly.coeffs is None for label in labels)
+    fit_cfg = dataset_cfg.fit('poly')
+    assert set(fit_cfg) == set(labels)
+    assert [dataset_cfg[label].approx.reg.poly.degree for label in labels] == [(4, 3), (3, 2), (3, 2)]
+    assert fit_cfg['H1_6563A']['batch_time'] == fit_cfg['He1_5876A']['batch_time']
+
+    # The number of inputs must match the polynomial variables
+    with pytest.raises(InnateError):
+        dataset['H1_6563A'].approx.reg.poly(temp)
+
+    # Coefficients stored in the dataset file
+    fname = tmp_path / 'poly_grid.nc'
+    save_dataset(fname, array_dict, cfg, {label: {'description': 'test'} for label in labels},
+                 approx_dict={'poly': {label: dataset[label].cfg['poly_coeffs'] for label in labels}})
+    dataset_file = DataSet.from_file(fname, tensor_library='numpy')
+    assert dataset_file['He1_5876A'].approx.reg.poly.degree == (4, 2)
+    np.testing.assert_allclose(dataset_file['He1_5876A'].approx.reg.poly(temp, den), poly_model(temp, den, shift=2),
+                               atol=1e-12)
+
+    with pytest.raises(InnateError):
+        Polynomial([temp_range, den_range], 2)(12250, 122)
+
+
+def siren_state(dim_in=2, dim_hidden=16, dim_out=1, num_layers=3, seed=4):
+
+    # Random SirenNet parameters
+    rng = np.random.default_rng(seed)
+    state = {}
+    for i in range(num_layers):
+        state[f'layers.{i}.weight'] = rng.uniform(-0.5, 0.5, (dim_hidden, dim_in if i == 0 else dim_hidden))
+        state[f'layers.{i}.bias'] = rng.uniform(-0.5, 0.5, dim_hidden)
+    state['last_layer.weight'] = rng.uniform(-0.5, 0.5, (dim_out, dim_hidden))
+    state['last_layer.bias'] = rng.uniform(-0.5, 0.5, dim_out)
+
+    return state
+
+
+def siren_forward(x, state, w0=1.0, w0_initial=30.0, num_layers=3):
+
+    for i in range(num_layers):
+        x = np.sin((w0_initial if i == 0 else w0) * (x @ state[f'layers.{i}.weight'].T + state[f'layers.{i}.bias']))
+
+    return x @ state['last_layer.weight'].T + state['last_layer.bias']
+
+
+def test_nn_numpy_inference():
+
+    from innate.regression.methods import SirenNetwork
+
+    # Network with normalized coordinates
+    state = siren_state()
+    state.update(input_offset=np.array([14500.0, 300.0]), input_scale=np.array([5500.0, 300.0]),
+                 output_offset=1.5, output_scale=0.25)
+    cfg = {**data_cfg, 'approximation': ('rgi', 'nn'), 'nn_coeffs': state, 'nn_w0': 2.0, 'nn_w0_initial': 15.0}
+    grid_nn = Grid('O3_5007A', data_array, cfg, tensor_library='numpy')
+    nn = grid_nn.approx.reg.nn
+    nn.library = 'numpy'
+    assert 'nn' in grid_nn.approx.reg.techniques and (nn.dim_in, nn.dim_out) == (2, 1)
+
+    rng = np.random.default_rng(5)
+    coords = np.column_stack((rng.uniform(9000, 20000, 1000), rng.uniform(1, 600, 1000)))
+    x_net = (coords - state['input_offset']) / state['input_scale']
+    expected = siren_forward(x_net, state, w0=2.0, w0_initial=15.0) * 0.25 + 1.5
+
+    np.testing.assert_allclose(nn.eval(coords), expected, atol=1e-12)
+    np.testing.assert_allclose(nn(coords[:, 0], coords[:, 1]), expected[:, 0], atol=1e-12)
+    assert np.isclose(nn(*coords[10]), expected[10, 0])
+
+    # Batched evaluation and multiple outputs
+    state_multi = siren_state(dim_out=3)
+    nn_batch = SirenNetwork(state_multi, library='numpy', batch_size=7)
+    np.testing.assert_allclose(nn_batch.eval(coords), siren_forward(coords, state_multi), atol=1e-12)
+    assert nn_batch(coords[:5, 0], coords[:5, 1]).shape == (5, 3)
+
+    # Missing parameters
+    with pytest.raises(InnateError):
+        SirenNetwork({'layers.0.weight': state['layers.0.weight']})
+
+
+def test_nn_torch_inference():
+
+    torch = pytest.importorskip('torch')
+    from innate.regression.methods import SirenNetwork
+
+    state = siren_state()
+    rng = np.random.default_rng(6)
+    coords = rng.uniform(-1, 1, (500, 2))
+
+    nn_torch = SirenNetwork(state, library='torch', batch_size=128)
+    nn_numpy = SirenNetwork(state, library='numpy')
+    np.testing.assert_allclose(nn_torch.eval(coords), nn_numpy.eval(coords), atol=1e-10)
+
+    # Parameters from a SirenNet model
+    from innate.torch.siren import SirenNet
+    torch.manual_seed(0)
+    model = SirenNet(dim_in=2, dim_hidden=16, dim_out=1, num_layers=3, w0=2.0, w0_initial=20.0)
+    nn_model = SirenNetwork.from_torch(model, library='numpy')
+    assert (nn_model.w0, nn_model.w0_initial) == (2.0, 20.0)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(coords).float()).numpy()
+    np.testing.assert_allclose(nn_model.eval(coords), expected, atol=1e-5)
+
+
+def test_nn_weights_in_dataset_file(tmp_path):
+
+    from innate import save_dataset, DataSet
+    from innate.io import LazyGroup
+    from innate.regression.methods import SirenNetwork
+
+    # Networks for two grids
+    labels = ('O3_5007A', 'H1_6563A')
+    networks = {label: SirenNetwork(siren_state(seed=i), w0=1.5, w0_initial=20.0, library='numpy')
+                for i, label in enumerate(labels)}
+    cfg = {key: value for key, value in data_cfg.items() if key not in ('eqn', 'eqn_coeffs')}
+    cfg['approximation'] = ('rgi', 'nn')
+
+    fname = tmp_path / 'nn_grids.nc'
+    save_dataset(fname, {label: data_array for label in labels}, cfg, {label: {'description': 'test'} for label in labels},
+                 approx_dict={'nn': {label: network.state for label, network in networks.items()}})
+
+    # The parameters are read on the first access to the network
+    dataset = DataSet.from_file(fname, tensor_library='numpy')
+    reg = dataset['H1_6563A'].approx.reg
+    assert 'nn' in reg.techniques
+    assert isinstance(reg._nn_args[0], LazyGroup) and reg._nn_args[0]._data is None
+
+    nn = reg.nn
+    assert reg._nn_args[0]._data is not None
+    assert (nn.w0, nn.w0_initial, len(nn.weights)) == (1.5, 20.0, 4)
+    coords = np.column_stack((np.linspace(-1, 1, 50), np.linspace(1, -1, 50)))
+    for label in labels:
+        np.testing.assert_allclose(dataset[label].approx.reg.nn.eval(coords), networks[label].eval(coords),
+                                   atol=1e-12)
+
+
+def multiline_dataset():
+
+    from innate import DataSet
+
+    # Three lines with different scales
+    labels = ('O3_5007A', 'H1_6563A', 'He1_5876A')
+    array_dict = {label: (10.0 ** i) * eqn_model(temp_range[:, None], den_range[None, :], a=1.2 + i)
+                  for i, label in enumerate(labels)}
+    cfg = {key: value for key, value in data_cfg.items() if key not in ('eqn', 'eqn_coeffs')}
+
+    return DataSet(array_dict, {label: cfg for label in labels}, {label: {} for label in labels},
+                   tensor_library='numpy'), labels
+
+
+def test_multiline_siren():
+
+    pytest.importorskip('torch')
+    pytest.importorskip('einops')
+    from innate.torch.siren_train_multiline import multiline_training_data, train_multiline
+
+    dataset, labels = multiline_dataset()
+
+    # Nodes in the grid order with the axes in [-1, 1] and standardized lines
+    coords, values, normalization = multiline_training_data(dataset, labels)
+    assert coords.shape == (temp_range.size * den_range.size, 2) and values.shape == (coords.shape[0], 3)
+    np.testing.assert_allclose(coords.min(axis=0), -1)
+    np.testing.assert_allclose(coords.max(axis=0), 1)
+    np.testing.assert_allclose(values.mean(axis=0), 0, atol=1e-10)
+    np.testing.assert_allclose(values.std(axis=0), 1)
+    np.testing.assert_allclose(values[:, 1] * normalization['output_scale'][1] + normalization['output_offset'][1],
+                               dataset['H1_6563A'].data.ravel())
+
+    # One network for all the lines
+    model, network, label_list, loss_history = train_multiline(dataset, labels, dim_hidden=32, num_layers=2,
+                                                               num_epoch=5, batch_size=2048, lr=1e-3, verbose=False)
+    assert label_list == list(labels) and len(loss_history) == 5
+    assert network.dim_out == 3 and loss_history[-1] < loss_history[0]
+    assert network(12250, 122).shape == (3,)
+
+
+def test_torch_trainer():
+
+    torch = pytest.importorskip('torch')
+    from innate.torch.trainer import Trainer
+
+    # Linear regression
+    torch.manual_seed(0)
+    inputs = torch.rand(1000, 2) * 2 - 1
+    targets = inputs @ torch.tensor([[0.5], [-1.5]]) + 0.3
+
+    for batch_size in (64, None):
+        model = torch.nn.Linear(2, 1)
+        trainer = Trainer(model, batch_size=batch_size, lr=5e-2, weight_decay=0.0, max_grad_norm=10.0,
+                          verbose=False)
+        history = trainer.fit(inputs, targets, num_epoch=50)
+        assert len(history['loss']) == len(history['lr']) == len(history['samples_per_second']) == 50
+        assert history['loss'][-1] < 5e-2 * history['loss'][0]
+        assert min(history['samples_per_second']) > 0